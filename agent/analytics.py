@@ -0,0 +1,200 @@
+import json
+from collections import Counter
+from datetime import datetime
+
+from agent.scam_classifier import ScamClassifier
+
+CONFIDENCE_BINS = 10
+# Time buckets are truncated to the hour ("2026-02-05T15")
+TIME_BUCKET_CHARS = 13
+
+UNCATEGORIZED = "uncategorized"
+# The dashboard's generator labels, in ScamClassifier's scam types: the
+# one vocabulary by_category counts, whether an entry is live or loaded
+CATEGORY_ALIASES = {
+    "bank": "bank_scam",
+    "payment": "bank_scam",  # UPI/card/wallet messages, which the classifier files under bank_scam
+    "prize": "prize_scam",
+    "investment": "investment_scam",
+    "job": "job_scam",
+    "otp": "otp_scam",
+}
+
+
+# ------------------------ Analytics Store ------------------------
+class AnalyticsStore:
+    """
+    Message history plus running aggregates for the dashboard.
+
+    add() updates every counter in O(1), so totals, rates, breakdowns
+    and histograms never rescan the history. page() slices one page of
+    history for rendering, newest first, so a tab shows page_size items
+    whatever the history length.
+
+    Categories are ScamClassifier scam types. A known alias is mapped
+    onto one, and a scam with no recognised category is classified from
+    its message; anything not flagged as a scam is uncategorized.
+    """
+
+    def __init__(self, classifier: ScamClassifier = None):
+        self.classifier = classifier or ScamClassifier()
+        self.clear()
+
+    def clear(self):
+        self.history = []
+        self.total = 0
+        self.scams = 0
+        self.confidence_sum = 0.0
+        self.confidence_histogram = [0] * CONFIDENCE_BINS
+        # Same bands as the dashboard: high > 0.8 >= medium >= 0.5 > low
+        self.confidence_bands = {"high": 0, "medium": 0, "low": 0}
+        self.by_category = Counter()
+        self.by_stage = Counter()
+        self.by_style = Counter()
+        self.by_hour = Counter()
+        self.scams_by_hour = Counter()
+
+    def __len__(self):
+        return self.total
+
+    def add(self, message: str, fraud_result: dict, category: str = None, stage: str = None,
+            style: str = None, timestamp: str = None, reply: str = None):
+        is_scam = bool(fraud_result.get("is_scam"))
+        confidence = float(fraud_result.get("confidence", 0) or 0)
+        timestamp = timestamp or datetime.now().isoformat()
+        category = self.category_of(message, is_scam, category)
+
+        self.history.append({
+            "message": message,
+            "is_scam": is_scam,
+            "confidence": confidence,
+            "category": category,
+            "stage": stage,
+            "style": style,
+            "timestamp": timestamp,
+            "reply": reply,
+        })
+
+        self.total += 1
+        self.scams += is_scam
+        self.confidence_sum += confidence
+        self.confidence_histogram[min(int(confidence * CONFIDENCE_BINS), CONFIDENCE_BINS - 1)] += 1
+        if confidence > 0.8:
+            self.confidence_bands["high"] += 1
+        elif confidence >= 0.5:
+            self.confidence_bands["medium"] += 1
+        else:
+            self.confidence_bands["low"] += 1
+
+        self.by_category[category] += 1
+        if stage:
+            self.by_stage[stage] += 1
+        if style:
+            self.by_style[style] += 1
+        hour = timestamp[:TIME_BUCKET_CHARS]
+        self.by_hour[hour] += 1
+        self.scams_by_hour[hour] += is_scam
+
+    def category_of(self, message: str, is_scam: bool, category: str = None) -> str:
+        if not is_scam:
+            return UNCATEGORIZED
+        category = CATEGORY_ALIASES.get(category, category)
+        if category not in ScamClassifier.patterns:
+            category = self.classifier.classify(message)
+        return category
+
+    # ------------------------ Aggregates ------------------------
+    @property
+    def safe(self) -> int:
+        return self.total - self.scams
+
+    @property
+    def avg_confidence(self) -> float:
+        return self.confidence_sum / self.total if self.total else 0.0
+
+    @property
+    def detection_rate(self) -> float:
+        return self.scams / self.total if self.total else 0.0
+
+    def hourly(self):
+        """[(hour, messages, scams)] in time order."""
+        return [(hour, self.by_hour[hour], self.scams_by_hour[hour]) for hour in sorted(self.by_hour)]
+
+    # ------------------------ Pagination ------------------------
+    def page_count(self, page_size: int) -> int:
+        return max(1, -(-self.total // page_size))
+
+    def page(self, page: int, page_size: int = 50, newest_first: bool = True):
+        """[(number, item)] for one 1-based page; number is the item's 1-based position in the history."""
+        if newest_first:
+            stop = self.total - (page - 1) * page_size
+            start = max(0, stop - page_size)
+            return [(i + 1, self.history[i]) for i in range(stop - 1, start - 1, -1)]
+        start = (page - 1) * page_size
+        return [(i + 1, item) for i, item in enumerate(self.history[start:start + page_size], start)]
+
+    # ------------------------ Loading Logs ------------------------
+    def load_jsonl(self, path: str, classifier: ScamClassifier = None) -> int:
+        """
+        Streams a scam_flow_logs.json-style JSONL file into the store and
+        returns the number of records added. Records carry no category, so
+        scams are categorised with the keyword classifier.
+        """
+        classifier = classifier or self.classifier
+        added = 0
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                message = record.get("scammer_message") or ""
+                fraud_result = record.get("fraud_result") or {}
+                category = classifier.classify(message) if fraud_result.get("is_scam") else None
+                self.add(
+                    message,
+                    fraud_result,
+                    category=category,
+                    stage=record.get("stage"),
+                    style=record.get("scammer_style"),
+                    timestamp=record.get("timestamp"),
+                    reply=record.get("honeypot_reply"),
+                )
+                added += 1
+        return added
+
+    def load_compacted(self, archive_dir: str = None, start_date: str = None, end_date: str = None,
+                       classifier: ScamClassifier = None) -> int:
+        """
+        Loads flow logs compacted by agent.log_compaction (needs pyarrow),
+        reading only the columns the dashboard uses and only the date
+        partitions in [start_date, end_date].
+        """
+        from agent.log_compaction import LOG_ARCHIVE_DIR, query_logs
+
+        classifier = classifier or self.classifier
+        table = query_logs(
+            "flow",
+            columns=["timestamp", "scammer_message", "is_scam", "confidence",
+                     "stage", "scammer_style", "honeypot_reply"],
+            start_date=start_date,
+            end_date=end_date,
+            archive_dir=archive_dir or LOG_ARCHIVE_DIR,
+        )
+        for batch in table.to_batches():
+            for row in batch.to_pylist():
+                message = row["scammer_message"] or ""
+                timestamp = row["timestamp"]
+                self.add(
+                    message,
+                    {"is_scam": row["is_scam"], "confidence": row["confidence"]},
+                    category=classifier.classify(message) if row["is_scam"] else None,
+                    stage=row["stage"],
+                    style=row["scammer_style"],
+                    timestamp=timestamp.isoformat() if timestamp else None,
+                    reply=row["honeypot_reply"],
+                )
+        return table.num_rows
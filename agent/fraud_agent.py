@@ -1,17 +1,205 @@
-import joblib
+import json
 import os
+import re
+
 import numpy as np
 
-BASE_DIR = os.getcwd()
-MODEL_PATH = os.path.join(BASE_DIR, "models", "fraud_model.pkl")
-VECTORIZER_PATH = os.path.join(BASE_DIR, "models", "vectorizer.pkl")
+from agent.keyword_matcher import KeywordMatcher
+from agent.metrics import metrics
+from agent.model_registry import registry as default_registry
+from agent.scoring import LinearScorer, DEFAULT_THRESHOLD
+
+MODEL_FILE = "fraud_model.pkl"
+VECTORIZER_FILE = "vectorizer.pkl"
+MODEL_PATH = default_registry.path(MODEL_FILE)
+VECTORIZER_PATH = default_registry.path(VECTORIZER_FILE)
+
+COMPACT_DIR = "compact"
+COMPACT_FORMAT = "compact-tfidf"
+COMPACT_VERSION = 1
+
+HASHING_DIR = "hashing"
+HASHING_FORMAT = "hashing-tfidf"
+HASHING_VERSION = 1
+
+# "pickle" loads the sklearn artifacts, "compact" the memory-mapped export,
+# "hashing" the vocabulary-free hashing model
+MODEL_FORMAT = os.getenv("FRAUD_MODEL_FORMAT", "pickle")
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+# ------------------------ Compact Model ------------------------
+class CompactFraudModel:
+    """
+    TF-IDF + logistic regression model loaded from the compact export
+    written by scripts/train_model.py (models/compact/):
+
+      terms.npy    sorted vocabulary (fixed-width unicode)
+      idf.npy      IDF weight per term, in the same order
+      coef.npy     model coefficient per term, in the same order
+      config.json  tokenizer settings, stop words and intercept
+
+    The arrays are memory-mapped read-only, so loading is near-instant
+    and forked workers share the same pages. Scoring needs neither
+    sklearn nor a Python dict vocabulary.
+    """
+
+    def __init__(self, terms, idf, coef, config: dict):
+        self.terms = terms
+        self.idf = idf
+        self.coef = coef
+        self.intercept = float(config["intercept"])
+        self.config = config
+
+        self.lowercase = config["lowercase"]
+        self.token_pattern = re.compile(config["token_pattern"])
+        self.stop_words = frozenset(config["stop_words"])
+        self.min_n, self.max_n = config["ngram_range"]
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        with open(os.path.join(path, "config.json"), encoding="utf-8") as f:
+            config = json.load(f)
+        if config.get("format") != COMPACT_FORMAT or config.get("version") != COMPACT_VERSION:
+            raise ValueError(f"Unsupported compact model artifact in {path}")
+
+        mmap_mode = "r" if mmap else None
+        arrays = [
+            np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in ("terms", "idf", "coef")
+        ]
+        return cls(*arrays, config)
+
+    def analyze(self, message: str) -> list:
+        """Same n-grams as the exported TfidfVectorizer's word analyzer."""
+        if self.lowercase:
+            message = message.lower()
+        tokens = [t for t in self.token_pattern.findall(message) if t not in self.stop_words]
+
+        ngrams = list(tokens) if self.min_n == 1 else []
+        for n in range(max(self.min_n, 2), min(self.max_n, len(tokens)) + 1):
+            ngrams += [" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)]
+        return ngrams
+
+    def decision_function(self, messages) -> np.ndarray:
+        doc_ids = []
+        ngrams = []
+        for doc_id, message in enumerate(messages):
+            grams = self.analyze(message)
+            ngrams += grams
+            doc_ids += [doc_id] * len(grams)
+
+        decisions = np.full(len(messages), self.intercept)
+        if not ngrams:
+            return decisions
+
+        # One vectorized vocabulary lookup for the whole chunk
+        n_terms = len(self.terms)
+        positions = np.searchsorted(self.terms, np.array(ngrams))
+        positions = np.minimum(positions, n_terms - 1)
+        known = self.terms[positions] == np.array(ngrams)
+        if not known.any():
+            return decisions
+
+        # Term counts per (document, term)
+        keys = np.array(doc_ids, dtype=np.int64)[known] * n_terms + positions[known]
+        keys, counts = np.unique(keys, return_counts=True)
+        docs, term_ids = np.divmod(keys, n_terms)
+
+        # l2-normalized tf-idf dotted with the coefficients
+        weights = counts * self.idf[term_ids]
+        norms = np.sqrt(np.bincount(docs, weights ** 2, minlength=len(messages)))
+        dots = np.bincount(docs, weights * self.coef[term_ids], minlength=len(messages))
+        has_terms = norms > 0
+        decisions[has_terms] += dots[has_terms] / norms[has_terms]
+        return decisions
+
+
+# ------------------------ Hashing Model ------------------------
+class HashingFraudModel:
+    """
+    Vocabulary-free TF-IDF + logistic regression model written by
+    `scripts/train_model.py --features hashing` (models/hashing/):
+
+      idf.npy      IDF weight per hash bucket
+      coef.npy     model coefficient per hash bucket
+      config.json  HashingVectorizer settings and intercept
+
+    Tokens are hashed straight to columns by a stateless HashingVectorizer,
+    so there is no vocabulary to look up or keep in each worker.
+    """
+
+    def __init__(self, idf, coef, config: dict):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.idf = idf
+        self.coef = coef
+        self.intercept = float(config["intercept"])
+        self.config = config
+        self.vectorizer = HashingVectorizer(
+            n_features=config["n_features"],
+            lowercase=config["lowercase"],
+            token_pattern=config["token_pattern"],
+            ngram_range=tuple(config["ngram_range"]),
+            stop_words=config["stop_words"] or None,
+            alternate_sign=False,
+            norm=None,
+        )
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        with open(os.path.join(path, "config.json"), encoding="utf-8") as f:
+            config = json.load(f)
+        if config.get("format") != HASHING_FORMAT or config.get("version") != HASHING_VERSION:
+            raise ValueError(f"Unsupported hashing model artifact in {path}")
+
+        mmap_mode = "r" if mmap else None
+        idf = np.load(os.path.join(path, "idf.npy"), mmap_mode=mmap_mode)
+        coef = np.load(os.path.join(path, "coef.npy"), mmap_mode=mmap_mode)
+        return cls(idf, coef, config)
+
+    def decision_function(self, messages) -> np.ndarray:
+        counts = self.vectorizer.transform(messages).tocsr()
+        n_docs = counts.shape[0]
+        rows = np.repeat(np.arange(n_docs), np.diff(counts.indptr))
+
+        # l2-normalized tf-idf dotted with the coefficients
+        weights = counts.data * self.idf[counts.indices]
+        norms = np.sqrt(np.bincount(rows, weights ** 2, minlength=n_docs))
+        dots = np.bincount(rows, weights * self.coef[counts.indices], minlength=n_docs)
+
+        decisions = np.full(n_docs, self.intercept)
+        has_terms = norms > 0
+        decisions[has_terms] += dots[has_terms] / norms[has_terms]
+        return decisions
 
 
 class FraudDetectionAgent:
-    def __init__(self):
-        # Load trained model and vectorizer
-        self.model = joblib.load(MODEL_PATH)
-        self.vectorizer = joblib.load(VECTORIZER_PATH)
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, registry=None,
+                 model_format: str = MODEL_FORMAT):
+        # Trained artifacts, loaded once per process and shared
+        registry = registry or default_registry
+        self.model_format = model_format
+
+        if model_format in ("compact", "hashing"):
+            self.model = None
+            self.vectorizer = None
+            if model_format == "compact":
+                self.compact_model = registry.get(COMPACT_DIR, loader=CompactFraudModel.load)
+            else:
+                self.compact_model = registry.get(HASHING_DIR, loader=HashingFraudModel.load)
+            self.scorer = LinearScorer(
+                self.compact_model.coef, self.compact_model.intercept, threshold=threshold
+            )
+        elif model_format == "pickle":
+            self.model = registry.get(MODEL_FILE)
+            self.vectorizer = registry.get(VECTORIZER_FILE)
+            self.compact_model = None
+            # Single-pass scorer: label and probability from one decision value
+            self.scorer = LinearScorer.from_model(self.model, threshold=threshold)
+        else:
+            raise ValueError(f"Unknown model format: {model_format}")
         print("🤖 Fraud Detection Agent initialized")
 
         # High-risk scam keywords for boosting
@@ -19,6 +207,10 @@ class FraudDetectionAgent:
             "otp", "transfer", "upi", "bank", "account", "payment",
             "lottery", "reward", "verify", "blocked", "processing fee"
         ]
+        # Substring matching keeps the boost identical to the trained behaviour
+        self.keyword_matcher = KeywordMatcher(
+            {"high_risk": self.high_risk_keywords}, word_boundary=False
+        )
 
     def analyze(self, message: str):
         """
@@ -26,33 +218,65 @@ class FraudDetectionAgent:
         Uses ML model probability and keyword-based boosting.
         Confidence is capped at 0.95 for realism.
         """
-        # Transform message
-        vector = self.vectorizer.transform([message])
+        return self._analyze_chunk([message])[0]
+
+    def analyze_many(self, messages, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Analyze an iterable of messages in chunks.
+        Yields the same result dicts as analyze(), in input order, while
+        only holding one chunk of vectors in memory at a time.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
 
-        # Base ML prediction and probability
-        prediction = self.model.predict(vector)[0]  # 0 or 1
-        probability = self.model.predict_proba(vector)[0][1]  # probability of scam
+        chunk = []
+        for message in messages:
+            chunk.append(message)
+            if len(chunk) >= chunk_size:
+                yield from self._analyze_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self._analyze_chunk(chunk)
 
-        # Count high-risk keywords in message
-        matches = sum(k in message.lower() for k in self.high_risk_keywords)
+    def _decisions(self, messages):
+        if self.compact_model is not None:
+            # Compact models vectorize and take the dot product in one pass
+            with metrics.timer("vectorize"):
+                return self.compact_model.decision_function(messages)
+        # Transform the whole chunk at once
+        with metrics.timer("vectorize"):
+            vectors = self.vectorizer.transform(messages)
+        with metrics.timer("predict"):
+            return self.scorer.decision_function(vectors)
+
+    def _analyze_chunk(self, messages):
+        # Base ML prediction (0 or 1) and probability of scam
+        predictions, probabilities = self.scorer.score_decisions(self._decisions(messages))
+
+        # Count high-risk keywords in each message
+        with metrics.timer("keyword_boost"):
+            matches = np.array([
+                len(self.keyword_matcher.scan(message).get("high_risk", ()))
+                for message in messages
+            ])
 
         # ----- Keyword-based boosting -----
-        if matches > 0:
-            # Each keyword boosts probability by 0.1
-            # Max probability capped at 0.95
-            boost = 0.1 * matches
-            probability = min(probability + boost, 0.95)
-
-            # If 2 or more keywords, ensure prediction = scam
-            if matches >= 2:
-                prediction = 1
-
-        # Build result dictionary
-        result = {
-            "message": message,
-            "is_scam": bool(prediction),
-            "confidence": round(float(probability), 3),
-            "decision": "ENGAGE_SCAMMER" if prediction == 1 else "IGNORE"
-        }
-
-        return result
+        # Each keyword boosts probability by 0.1, capped at 0.95
+        boosted = np.minimum(probabilities + 0.1 * matches, 0.95)
+        probabilities = np.where(matches > 0, boosted, probabilities)
+
+        # If 2 or more keywords, ensure prediction = scam
+        predictions = np.where(matches >= 2, 1, predictions)
+        metrics.inc("messages_scored", len(messages))
+        metrics.inc("scams_detected", int(np.count_nonzero(predictions)))
+
+        # Build result dictionaries
+        return [
+            {
+                "message": message,
+                "is_scam": bool(prediction),
+                "confidence": round(float(probability), 3),
+                "decision": "ENGAGE_SCAMMER" if prediction == 1 else "IGNORE"
+            }
+            for message, prediction, probability in zip(messages, predictions, probabilities)
+        ]
@@ -0,0 +1,259 @@
+import os
+import re
+import sqlite3
+import threading
+from urllib.parse import urlsplit
+
+INDICATOR_DB = os.getenv("HONEYPOT_INDICATOR_DB", "indicators.db")
+
+# Indicator types worth correlating across conversations. Generic digit
+# runs are too noisy, and card numbers shouldn't be stored at all.
+INDEXED_TYPES = ("upi", "domain", "phone", "email", "ifsc", "bank_account", "crypto_wallet")
+
+_NON_DIGITS = re.compile(r"\D")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS indicators (
+    id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    value TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (type, value)
+);
+CREATE TABLE IF NOT EXISTS sightings (
+    indicator_id INTEGER NOT NULL REFERENCES indicators(id),
+    conversation_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sightings_by_indicator ON sightings (indicator_id);
+CREATE INDEX IF NOT EXISTS sightings_by_conversation ON sightings (conversation_id);
+"""
+# One sighting per indicator per logged turn, so re-indexing a log (a
+# backfill re-run, or one over turns the agent already indexed) adds
+# nothing. Created by _dedupe_sightings(), since an older database may
+# hold duplicates.
+UNIQUE_SIGHTINGS = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS sightings_unique "
+    "ON sightings (indicator_id, conversation_id, timestamp)"
+)
+
+
+def normalize(indicator_type: str, value: str):
+    """
+    Canonical (type, value) for an extracted indicator, or None if the
+    type isn't indexed. URLs are indexed by their domain, so every link
+    on the same phishing host lands on one entry.
+    """
+    if indicator_type == "url":
+        host = urlsplit(value if "://" in value else f"http://{value}").hostname
+        if not host:
+            return None
+        indicator_type, value = "domain", host
+    if indicator_type not in INDEXED_TYPES:
+        return None
+    if indicator_type == "domain":
+        value = value.lower().rstrip(".")
+        if value.startswith("www."):
+            value = value[4:]
+    elif indicator_type == "phone":
+        digits = _NON_DIGITS.sub("", value)
+        # +91 98765 43210, 098765 43210 and 9876543210 are the same number
+        value = digits[-10:] if len(digits) > 10 and digits.startswith(("91", "0")) else digits
+    elif indicator_type == "ifsc":
+        value = value.upper()
+    elif indicator_type in ("upi", "email"):
+        value = value.lower()
+    return indicator_type, value
+
+
+# ------------------------ Indicator Index ------------------------
+class IndicatorIndex:
+    """
+    SQLite index of every indicator seen, with the conversations and
+    timestamps it appeared in.
+
+    Known (type, value) keys are kept in memory with their row ids, so
+    seen() for a known indicator is a hash lookup and repeat sightings
+    update by primary key. Other processes may write the same database
+    (the dashboard, a backfill), so a cache miss is checked against the
+    database, and inserts tolerate a row another writer just added.
+    Writes are one transaction per logged turn (or per batch in
+    add_many()). A turn already recorded is ignored, and hits counts
+    only sightings actually added, so indexing the same log twice
+    changes nothing. The database runs in WAL mode, so readers such as
+    analyst queries or the dashboard don't block the agent.
+    """
+
+    def __init__(self, path: str = INDICATOR_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._dedupe_sightings()
+        self._known = {
+            (indicator_type, value): indicator_id
+            for indicator_id, indicator_type, value in self._conn.execute("SELECT id, type, value FROM indicators")
+        }
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM indicators").fetchone()[0]
+
+    def _dedupe_sightings(self):
+        """Databases from before sightings were unique: drop repeated sightings, recount hits, add the index."""
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'sightings_unique'"
+        ).fetchone()
+        if exists:
+            return
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM sightings WHERE rowid NOT IN ("
+                "SELECT min(rowid) FROM sightings GROUP BY indicator_id, conversation_id, timestamp)"
+            )
+            self._conn.execute(
+                "UPDATE indicators SET hits = (SELECT COUNT(*) FROM sightings WHERE indicator_id = indicators.id)"
+            )
+            self._conn.execute(UNIQUE_SIGHTINGS)
+
+    def _indicator_id(self, key):
+        """Row id of a (type, value) key, from the cache or else the database; None if unknown."""
+        if key is None:
+            return None
+        indicator_id = self._known.get(key)
+        if indicator_id is None:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT id FROM indicators WHERE type = ? AND value = ?", key
+                ).fetchone()
+            if row is not None:
+                indicator_id = self._known[key] = row[0]
+        return indicator_id
+
+    def seen(self, indicator_type: str, value: str) -> bool:
+        return self._indicator_id(normalize(indicator_type, value)) is not None
+
+    def add(self, indicators, conversation_id: str, timestamp: str):
+        """Record the indicators of one logged turn; returns the keys seen for the first time."""
+        return self.add_many([(indicators, conversation_id, timestamp)])
+
+    def add_many(self, turns):
+        """add() for an iterable of (indicators, conversation_id, timestamp) in one transaction."""
+        new = []
+        updates = []
+        with self._lock, self._conn:
+            for indicators, conversation_id, timestamp in turns:
+                keys = {normalize(i.type, i.value) for i in indicators}
+                keys.discard(None)
+                for key in keys:
+                    indicator_id = self._known.get(key)
+                    if indicator_id is None:
+                        # Another process may have added it since we last looked
+                        cursor = self._conn.execute(
+                            "INSERT OR IGNORE INTO indicators (type, value, first_seen, last_seen, hits) "
+                            "VALUES (?, ?, ?, ?, 0)",
+                            (*key, timestamp, timestamp),
+                        )
+                        if cursor.rowcount:
+                            indicator_id = cursor.lastrowid
+                            new.append(key)
+                        else:
+                            indicator_id = self._conn.execute(
+                                "SELECT id FROM indicators WHERE type = ? AND value = ?", key
+                            ).fetchone()[0]
+                        self._known[key] = indicator_id
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO sightings (indicator_id, conversation_id, timestamp) VALUES (?, ?, ?)",
+                        (indicator_id, conversation_id, timestamp),
+                    )
+                    if cursor.rowcount:
+                        updates.append((timestamp, timestamp, indicator_id))
+            self._conn.executemany(
+                "UPDATE indicators SET hits = hits + 1, first_seen = min(first_seen, ?), "
+                "last_seen = max(last_seen, ?) WHERE id = ?",
+                updates,
+            )
+        return new
+
+    # ------------------------ Queries ------------------------
+    def lookup(self, indicator_type: str, value: str, limit: int = 100):
+        """Summary and most recent sightings of one indicator, or None if never seen."""
+        key = normalize(indicator_type, value)
+        indicator_id = self._indicator_id(key)
+        if indicator_id is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT first_seen, last_seen, hits FROM indicators WHERE id = ?", (indicator_id,)
+            ).fetchone()
+            sightings = self._conn.execute(
+                "SELECT conversation_id, timestamp FROM sightings WHERE indicator_id = ? "
+                "ORDER BY timestamp DESC LIMIT ?",
+                (indicator_id, limit),
+            ).fetchall()
+            conversations = self._conn.execute(
+                "SELECT COUNT(DISTINCT conversation_id) FROM sightings WHERE indicator_id = ?", (indicator_id,)
+            ).fetchone()[0]
+        return {
+            "type": key[0],
+            "value": key[1],
+            "first_seen": row[0],
+            "last_seen": row[1],
+            "hits": row[2],
+            "conversations": conversations,
+            "sightings": [{"conversation_id": c, "timestamp": t} for c, t in sightings],
+        }
+
+    def repeat_indicators(self, min_conversations: int = 2, indicator_type: str = None, limit: int = 100):
+        """Indicators that turned up in at least min_conversations conversations, most widespread first."""
+        query = (
+            "SELECT i.type, i.value, i.hits, i.first_seen, i.last_seen, "
+            "COUNT(DISTINCT s.conversation_id) AS conversations "
+            "FROM indicators i JOIN sightings s ON s.indicator_id = i.id "
+            + ("WHERE i.type = ? " if indicator_type else "")
+            + "GROUP BY i.id HAVING conversations >= ? ORDER BY conversations DESC, i.hits DESC LIMIT ?"
+        )
+        params = ((indicator_type,) if indicator_type else ()) + (min_conversations, limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        keys = ("type", "value", "hits", "first_seen", "last_seen", "conversations")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def related_conversations(self, conversation_id: str):
+        """Other conversations sharing at least one indicator with this one, with the shared indicators."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT other.conversation_id, i.type, i.value "
+                "FROM sightings mine "
+                "JOIN sightings other ON other.indicator_id = mine.indicator_id "
+                "JOIN indicators i ON i.id = mine.indicator_id "
+                "WHERE mine.conversation_id = ? AND other.conversation_id != ?",
+                (conversation_id, conversation_id),
+            ).fetchall()
+        related = {}
+        for other, indicator_type, value in rows:
+            related.setdefault(other, []).append((indicator_type, value))
+        return related
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ------------------------ Shared Indexes ------------------------
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(path: str = INDICATOR_DB) -> IndicatorIndex:
+    """One index (and SQLite connection) per database file per process."""
+    key = os.path.abspath(path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = IndicatorIndex(path)
+        return index
@@ -0,0 +1,119 @@
+import re
+from collections import namedtuple
+
+# ------------------------ Scam Indicator Extraction ------------------------
+# One compiled alternation with a named group per indicator type, so a
+# message is scanned once no matter how many types we look for. At each
+# position the first alternative that matches wins, so more specific
+# types come before looser ones (URL before bare domain, phone/card
+# before generic digit runs).
+#
+# The leading lookbehind only lets matches start at a token boundary,
+# and each family of types sits behind a cheap check of the token:
+# addresses and domains need an @ or a dot in it, IFSC codes and
+# wallets start with one of a few characters (and wallets are long),
+# digit-led types start with a digit or +. Most tokens are rejected
+# without trying any alternative in full.
+
+Indicator = namedtuple("Indicator", ["type", "value", "start", "end"])
+
+INDICATOR_TYPES = (
+    "url", "email", "upi", "domain", "ifsc", "crypto_wallet",
+    "phone", "card", "bank_account", "number",
+)
+
+# Common TLDs only, so prose like "e.g" or "no.1" isn't taken for a domain
+_TLDS = (
+    "com|in|net|org|info|biz|co|io|xyz|top|online|site|app|live|club|"
+    "shop|store|link|click|me|ly|tk|ru|cn|uk|us|gov|edu"
+)
+
+INDICATOR_PATTERN = re.compile(
+    r"(?<![\w@+-])(?=[\w.+-])(?:"
+    r"(?P<url>(?:https?://|www\.)[^\s<>\"']+)"
+    # Addresses and domains both need an @ or a dot in the token
+    r"|(?=[\w+-]*[@.])(?:"
+    # user@handle is a UPI ID, user@host.tld an email; told apart in _classify()
+    r"(?P<address>[\w.+-]+@[a-z0-9-]+(?:\.[a-z0-9-]+)*\b)"
+    rf"|(?P<domain>(?<!\.)(?:[a-z0-9][a-z0-9-]*\.)+(?:{_TLDS})\b(?![.-]\w)))"
+    r"|(?-i:(?=[A-Z013Tb]))(?:"
+    r"(?P<ifsc>(?-i:[A-Z]{4}0[A-Z0-9]{6}\b))"
+    # Every wallet format is at least 14 characters long
+    r"|(?=\w{14})(?P<crypto_wallet>(?-i:(?:0x[0-9a-fA-F]{40}"
+    r"|bc1[ac-hj-np-z02-9]{11,71}"
+    r"|(?=[1-9]*[a-km-zA-HJ-NP-Z])[13][a-km-zA-HJ-NP-Z1-9]{25,34}"
+    r"|T[1-9A-HJ-NP-Za-km-z]{33})\b)))"
+    r"|(?=[\d+])(?:"
+    r"(?P<phone>(?:\+\d{1,3}[\s-]?|0?)[6-9]\d{4}[\s-]?\d{5}(?!\d))"
+    r"|(?P<card>\d{4}(?:[ -]?\d{4}){2}[ -]?\d{1,7}(?![\d-]))"
+    r"|(?P<bank_account>\d{9,18}(?!\d))"
+    r"|(?P<number>\d{4,}(?!\d))))",
+    re.IGNORECASE,
+)
+
+_EMAIL_HOST = re.compile(r"\.[a-z]{2,}$", re.IGNORECASE)
+_URL_TRAILING = ".,;:!?)]}'\""
+_NON_DIGITS = re.compile(r"\D")
+
+
+def _luhn_ok(digits: str) -> bool:
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        d = ord(ch) - 48
+        if i % 2:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
+def _classify(kind: str, value: str, start: int, end: int):
+    """Post-match fixups that a regex can't express on its own."""
+    if kind == "address":
+        host = value[value.index("@") + 1:]
+        return ("email" if _EMAIL_HOST.search(host) else "upi"), value, start, end
+    if kind == "url":
+        stripped = value.rstrip(_URL_TRAILING)
+        return kind, stripped, start, start + len(stripped)
+    if kind == "card":
+        digits = _NON_DIGITS.sub("", value)
+        if 13 <= len(digits) <= 19 and _luhn_ok(digits):
+            return kind, value, start, end
+        # Not a plausible card: a plain digit run is an account number,
+        # a grouped one is only reported as a number
+        if digits == value and 9 <= len(digits) <= 18:
+            return "bank_account", value, start, end
+        return "number", value, start, end
+    return kind, value, start, end
+
+
+def extract_indicators(text: str, types=None) -> list:
+    """
+    All scam indicators in text as Indicator(type, value, start, end),
+    in order of appearance, de-duplicated by (type, value) keeping the
+    first span. types limits the result to a subset of INDICATOR_TYPES.
+    """
+    seen = set()
+    found = []
+    for match in INDICATOR_PATTERN.finditer(text):
+        kind, value, start, end = _classify(
+            match.lastgroup, match.group(), match.start(), match.end()
+        )
+        if types is not None and kind not in types:
+            continue
+        key = (kind, value.lower())
+        if key in seen:
+            continue
+        seen.add(key)
+        found.append(Indicator(kind, value, start, end))
+    return found
+
+
+def group_indicators(indicators, names: dict = None) -> dict:
+    """{type: [values]} (or {names[type]: [values]}), leaving out empty types."""
+    grouped = {}
+    for indicator in indicators:
+        key = names.get(indicator.type, indicator.type) if names else indicator.type
+        grouped.setdefault(key, []).append(indicator.value)
+    return grouped
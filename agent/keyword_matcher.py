@@ -0,0 +1,120 @@
+import re
+
+# Keywords up to this long must match as whole words (or plurals: "jobs",
+# "otps"); longer ones also match inflections ("payments", "urgently")
+WHOLE_WORD_CHARS = 3
+
+
+class KeywordMatcher:
+    """
+    Finds keywords from several categories in one pass over a message.
+    All keywords are compiled into a single alternation regex; the text is
+    lowercased once and scanned once, and hits are returned per category.
+
+    With word_boundary=True a keyword must start a word ("id" does not
+    match inside "paid"), and short keywords (up to WHOLE_WORD_CHARS)
+    must also end one, bar a plural "s", so "id" doesn't match "idea"
+    while "payment" still matches "payments". With word_boundary=False it behaves like
+    the plain `keyword in text.lower()` substring check.
+    """
+
+    def __init__(self, categories: dict, word_boundary: bool = True):
+        self.word_boundary = word_boundary
+        self.categories = {
+            name: tuple(k.lower() for k in keywords)
+            for name, keywords in categories.items()
+        }
+
+        # Which categories each keyword belongs to
+        self._owners = {}
+        for name, keywords in self.categories.items():
+            for keyword in keywords:
+                self._owners.setdefault(keyword, [])
+                if name not in self._owners[keyword]:
+                    self._owners[keyword].append(name)
+
+        # Longest first, so the alternation prefers "processing fee" over "fee"
+        keywords = sorted(self._owners, key=len, reverse=True)
+
+        # Shorter keywords that are always present when a longer one matches;
+        # the scan only reports the first alternative at each position
+        self._implied = {}
+        for keyword in keywords:
+            implied = tuple(o for o in keywords if o != keyword and self._contains(keyword, o))
+            if implied:
+                self._implied[keyword] = implied
+
+        self._pattern = None
+        if keywords:
+            alternation = "|".join(self._keyword_pattern(k) for k in keywords)
+            if word_boundary:
+                alternation = rf"\b(?:{alternation})"
+            if word_boundary and all(re.fullmatch(r"\w+", k) for k in keywords):
+                # Single words starting at a word boundary cannot overlap, so a plain scan finds them all
+                self._pattern = re.compile(rf"({alternation})")
+            else:
+                # Zero-width lookahead so overlapping matches are all found
+                self._pattern = re.compile(rf"(?=({alternation}))")
+
+    def _keyword_pattern(self, keyword: str) -> str:
+        pattern = re.escape(keyword)
+        if self.word_boundary and len(keyword) <= WHOLE_WORD_CHARS:
+            pattern += r"(?=s?\b)"
+        return pattern
+
+    def _contains(self, text: str, keyword: str) -> bool:
+        if self.word_boundary:
+            return re.search(rf"\b{self._keyword_pattern(keyword)}", text) is not None
+        return keyword in text
+
+    def keywords_in(self, text: str) -> set:
+        """Return the set of distinct keywords present in the text."""
+        if self._pattern is None or not text:
+            return set()
+        found = set(self._pattern.findall(text.lower()))
+        if self._implied:
+            for keyword in found.intersection(self._implied):
+                found.update(self._implied[keyword])
+        return found
+
+    def scan(self, text: str) -> dict:
+        """
+        Return {category: [keywords found]} for every category with at
+        least one hit. Categories without hits are left out.
+        """
+        hits = {}
+        for keyword in self.keywords_in(text):
+            for name in self._owners[keyword]:
+                hits.setdefault(name, []).append(keyword)
+        return hits
+
+
+class MatcherGroup:
+    """
+    Runs several KeywordMatchers as one scan.
+    scan() returns {group: {category: [keywords]}}, so each consumer
+    gets the same hits it would get from its own matcher.
+    """
+
+    def __init__(self, **matchers):
+        modes = {m.word_boundary for m in matchers.values()}
+        if len(modes) > 1:
+            raise ValueError("All matchers in a group must use the same word_boundary mode")
+
+        self.groups = tuple(matchers)
+        self._matcher = KeywordMatcher(
+            {
+                (group, name): keywords
+                for group, matcher in matchers.items()
+                for name, keywords in matcher.categories.items()
+            },
+            word_boundary=modes.pop() if modes else True
+        )
+
+    def scan(self, text: str) -> dict:
+        hits = {group: {} for group in self.groups}
+        owners = self._matcher._owners
+        for keyword in self._matcher.keywords_in(text):
+            for group, name in owners[keyword]:
+                hits[group].setdefault(name, []).append(keyword)
+        return hits
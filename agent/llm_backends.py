@@ -0,0 +1,264 @@
+import asyncio
+import os
+import threading
+import time
+import weakref
+
+try:
+    from llama_cpp import Llama
+    LLAMA_CPP_AVAILABLE = True
+except ImportError:
+    Llama = None
+    LLAMA_CPP_AVAILABLE = False
+
+from agent.llm_client import LLM_MAX_TOKENS, GroqClient, background_loop
+from agent.metrics import Histogram, metrics
+
+# groq | openai (any OpenAI-compatible server) | llamacpp (in-process GGUF)
+LLM_BACKEND = os.getenv("HONEYPOT_LLM_BACKEND", "groq")
+
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+GROQ_URL = os.getenv("GROQ_URL", "https://api.groq.com/openai/v1/chat/completions")
+GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
+GROQ_CONCURRENCY = int(os.getenv("GROQ_CONCURRENCY", "64"))
+
+# e.g. llama.cpp's llama-server, vLLM or Ollama on this machine
+OPENAI_API_KEY = os.getenv("HONEYPOT_OPENAI_API_KEY", "none")
+OPENAI_URL = os.getenv("HONEYPOT_OPENAI_URL", "http://127.0.0.1:8080/v1/chat/completions")
+OPENAI_MODEL = os.getenv("HONEYPOT_OPENAI_MODEL", "local")
+OPENAI_CONCURRENCY = int(os.getenv("HONEYPOT_OPENAI_CONCURRENCY", "8"))
+
+# A small quantized chat model, e.g. qwen2.5-0.5b-instruct-q4_k_m.gguf
+LLAMA_MODEL_PATH = os.getenv("HONEYPOT_LLAMA_MODEL_PATH", "models/honeypot-chat.gguf")
+LLAMA_CONTEXT = int(os.getenv("HONEYPOT_LLAMA_CONTEXT", "2048"))
+LLAMA_THREADS = int(os.getenv("HONEYPOT_LLAMA_THREADS", "0")) or None  # None = llama.cpp's default
+
+# Multi-prompt /v1/completions endpoint used when batching is on
+LLM_BATCH_URL = os.getenv("HONEYPOT_LLM_BATCH_URL")
+# Warm the backend at startup: 1 always, 0 never. Unset, only backends
+# with something worth loading (llamacpp's model weights) warm up
+LLM_WARMUP = os.getenv("HONEYPOT_LLM_WARMUP")
+
+# Account limits the shared dispatcher enforces, per minute; 0 = unlimited.
+# Set, these override every backend's own defaults
+LLM_RPM = os.getenv("HONEYPOT_LLM_RPM")
+LLM_TPM = os.getenv("HONEYPOT_LLM_TPM")
+# Groq's free tier for llama-3.1-8b-instant
+GROQ_RPM = 30
+GROQ_TPM = 6000
+
+WARMUP_PROMPT = "Reply with one word: hello"
+
+
+# ------------------------ Backend Interface ------------------------
+class LLMBackend:
+    """
+    One way of producing completions, with the GroqClient call shape.
+
+    Subclasses implement _complete() (and optionally warm_up()). The base
+    class caps in-flight calls at max_concurrency, so a slow or small
+    backend queues work instead of being swamped, and records every call
+    in a per-backend latency histogram (also exported as the
+    llm_backend_<name> metric). Like GroqClient's connection pools, the
+    concurrency cap is per event loop.
+
+    rpm/tpm are the account limits the dispatcher should enforce for this
+    backend (0 = unlimited); local backends have none.
+    """
+
+    name = "backend"
+    default_rpm = 0
+    default_tpm = 0
+    warm_up_by_default = False
+
+    def __init__(self, max_concurrency: int = 8):
+        self.max_concurrency = max_concurrency
+        self.rpm = float(LLM_RPM) if LLM_RPM is not None else self.default_rpm
+        self.tpm = float(LLM_TPM) if LLM_TPM is not None else self.default_tpm
+        self.latency = Histogram()
+        self.errors = 0
+        self.warmed = False
+        self.warming = None  # set by warm_up_in_background()
+        self._semaphores = weakref.WeakKeyDictionary()  # asyncio primitives are per event loop
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def _tracked(self, call):
+        async with self._semaphore():
+            start = time.perf_counter()
+            try:
+                return await call()
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                self.latency.observe(elapsed)
+                metrics.observe(f"llm_backend_{self.name}", elapsed)
+
+    async def complete(self, prompt: str, temperature: float = 0.7) -> str:
+        return await self._tracked(lambda: self._complete(prompt, temperature))
+
+    async def _complete(self, prompt: str, temperature: float) -> str:
+        raise NotImplementedError
+
+    async def warm_up(self) -> float:
+        """Pays the one-time costs up front; returns the seconds it took."""
+        start = time.perf_counter()
+        await self.complete(WARMUP_PROMPT, temperature=0.0)
+        self.warmed = True
+        return time.perf_counter() - start
+
+    async def complete_batch(self, prompts: list, temperature: float = 0.7) -> list:
+        """For LLMBatcher; backends without a batch endpoint run the prompts concurrently."""
+        return await asyncio.gather(*(self.complete(p, temperature) for p in prompts), return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "errors": self.errors, "warmed": self.warmed, **self.latency.summary()}
+
+    async def aclose(self):
+        pass
+
+
+# ------------------------ Remote Backends ------------------------
+class OpenAICompatibleBackend(LLMBackend):
+    """Any /v1/chat/completions server, through the pooled GroqClient."""
+
+    name = "openai"
+
+    def __init__(self, api_key: str = OPENAI_API_KEY, url: str = OPENAI_URL, model: str = OPENAI_MODEL,
+                 max_concurrency: int = OPENAI_CONCURRENCY, batch_url: str = LLM_BATCH_URL, **client_options):
+        super().__init__(max_concurrency)
+        self.client = GroqClient(api_key, url, model, batch_url=batch_url, **client_options)
+
+    async def _complete(self, prompt: str, temperature: float) -> str:
+        return await self.client.complete(prompt, temperature)
+
+    async def stream_complete(self, prompt: str, temperature: float = 0.7, until=None) -> str:
+        return await self._tracked(lambda: self.client.stream_complete(prompt, temperature, until))
+
+    async def warm_up(self) -> float:
+        """Opens a connection on this loop; nothing is generated, so nothing is billed."""
+        start = time.perf_counter()
+        status = await self.client.connect()
+        if status in (401, 403):
+            raise RuntimeError(f"{self.name} rejected the API key (HTTP {status})")
+        self.warmed = True
+        return time.perf_counter() - start
+
+    async def complete_batch(self, prompts: list, temperature: float = 0.7) -> list:
+        if not self.client.batch_url:
+            # N separate requests: each takes its own slot and latency sample
+            return await super().complete_batch(prompts, temperature)
+        # A batch is one request to the server, so it takes one slot
+        return await self._tracked(lambda: self.client.complete_batch(prompts, temperature))
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+class GroqBackend(OpenAICompatibleBackend):
+    name = "groq"
+    default_rpm = GROQ_RPM
+    default_tpm = GROQ_TPM
+
+    def __init__(self, api_key: str = GROQ_API_KEY, url: str = GROQ_URL, model: str = GROQ_MODEL,
+                 max_concurrency: int = GROQ_CONCURRENCY, **options):
+        super().__init__(api_key, url, model, max_concurrency, **options)
+
+    async def warm_up(self) -> float:
+        if not self.client.api_key:
+            raise RuntimeError("GROQ_API_KEY is not set")
+        return await super().warm_up()
+
+
+# ------------------------ In-Process CPU Backend ------------------------
+class LlamaCppBackend(LLMBackend):
+    """
+    A GGUF model run in-process by llama-cpp-python (optional dependency:
+    pip install llama-cpp-python). No network in the path, so latency
+    depends only on this machine. Generation runs in a worker thread; one
+    Llama instance isn't thread-safe, hence the default concurrency of 1.
+    The model is loaded on first use, or by warm_up().
+    """
+
+    name = "llamacpp"
+    warm_up_by_default = True  # loading the weights is the slow part of the first call
+
+    def __init__(self, model_path: str = LLAMA_MODEL_PATH, n_ctx: int = LLAMA_CONTEXT,
+                 n_threads: int = LLAMA_THREADS, max_tokens: int = LLM_MAX_TOKENS, max_concurrency: int = 1):
+        super().__init__(max_concurrency)
+        self.model_path = model_path
+        self.n_ctx = n_ctx
+        self.n_threads = n_threads
+        self.max_tokens = max_tokens
+        self._llm = None
+        # Calls can come from more than one event loop; the model takes one at a time
+        self._lock = threading.Lock()
+
+    def _model(self):
+        if self._llm is None:
+            if not LLAMA_CPP_AVAILABLE:
+                raise ImportError("The llamacpp backend needs llama-cpp-python: pip install llama-cpp-python")
+            if not os.path.exists(self.model_path):
+                raise FileNotFoundError(f"GGUF model not found: {self.model_path}")
+            print(f"🦙 Loading {self.model_path}")
+            self._llm = Llama(model_path=self.model_path, n_ctx=self.n_ctx, n_threads=self.n_threads,
+                              verbose=False)
+        return self._llm
+
+    def _generate(self, prompt: str, temperature: float) -> str:
+        with self._lock:
+            result = self._model().create_chat_completion(
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=self.max_tokens,
+            )
+        return result["choices"][0]["message"]["content"].strip()
+
+    async def _complete(self, prompt: str, temperature: float) -> str:
+        return await asyncio.to_thread(self._generate, prompt, temperature)
+
+
+BACKENDS = {
+    "groq": GroqBackend,
+    "openai": OpenAICompatibleBackend,
+    "llamacpp": LlamaCppBackend,
+}
+
+
+def create_backend(name: str = LLM_BACKEND, **options) -> LLMBackend:
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown LLM backend {name!r}, expected one of {', '.join(BACKENDS)}") from None
+    return backend_class(**options)
+
+
+def wants_warm_up(backend: LLMBackend) -> bool:
+    return backend.warm_up_by_default if LLM_WARMUP is None else LLM_WARMUP != "0"
+
+
+def warm_up_in_background(backend: LLMBackend):
+    """
+    Starts warm_up() on the shared background loop without waiting for
+    it. Once per backend. Connections it opens serve sync callers, whose
+    requests run on that loop; a model it loads serves every loop.
+    """
+    if backend.warming is not None:
+        return backend.warming
+
+    async def run():
+        try:
+            seconds = await backend.warm_up()
+            print(f"🔥 LLM backend {backend.name} warm in {seconds:.2f}s")
+        except Exception as e:
+            print(f"⚠️ LLM backend {backend.name} warm-up failed: {e}")
+
+    backend.warming = asyncio.run_coroutine_threadsafe(run(), background_loop())
+    return backend.warming
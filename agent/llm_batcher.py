@@ -0,0 +1,100 @@
+import asyncio
+import os
+import time
+import weakref
+
+from agent.metrics import metrics
+
+# How long the first prompt of a batch waits for company; 0 disables batching
+LLM_BATCH_WINDOW = float(os.getenv("HONEYPOT_LLM_BATCH_WINDOW", "0"))
+LLM_MAX_BATCH = int(os.getenv("HONEYPOT_LLM_MAX_BATCH", "16"))
+
+
+class _PendingBatch:
+    __slots__ = ("prompts", "futures", "enqueued", "timer")
+
+    def __init__(self):
+        self.prompts = []
+        self.futures = []
+        self.enqueued = []
+        self.timer = None
+
+
+# ------------------------ Micro-Batcher ------------------------
+class LLMBatcher:
+    """
+    Collects prompts from concurrent conversations and sends them to the
+    client's complete_batch() together, with the same complete() call as
+    a single client.
+
+    A batch is sent `window` seconds after its first prompt arrives, or
+    as soon as it holds max_batch prompts. Prompts are grouped by
+    temperature, and each event loop batches separately (like GroqClient's
+    pools). Metrics: llm_batch_wait is the queueing delay each prompt
+    paid; the llm_batches / llm_batched_prompts counters give the mean
+    batch size.
+    """
+
+    def __init__(self, client, window: float = LLM_BATCH_WINDOW, max_batch: int = LLM_MAX_BATCH):
+        self.client = client
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = weakref.WeakKeyDictionary()  # loop -> {temperature: _PendingBatch}
+        # The event loop only keeps weak references to tasks; a batch in flight must not be collected
+        self._tasks = set()
+
+    async def complete(self, prompt: str, temperature: float = 0.7) -> str:
+        if not self.window:
+            return await self.client.complete(prompt, temperature)
+
+        loop = asyncio.get_running_loop()
+        batches = self._pending.setdefault(loop, {})
+        batch = batches.get(temperature)
+        if batch is None:
+            batch = batches[temperature] = _PendingBatch()
+            batch.timer = loop.call_later(self.window, self._flush, loop, temperature)
+
+        future = loop.create_future()
+        batch.prompts.append(prompt)
+        batch.futures.append(future)
+        batch.enqueued.append(time.perf_counter())
+        if len(batch.prompts) >= self.max_batch:
+            batch.timer.cancel()
+            self._flush(loop, temperature)
+        return await future
+
+    def _flush(self, loop, temperature):
+        batch = self._pending.get(loop, {}).pop(temperature, None)
+        if batch is not None:
+            task = loop.create_task(self._send(batch, temperature))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: _PendingBatch, temperature: float):
+        sent = time.perf_counter()
+        for enqueued in batch.enqueued:
+            metrics.observe("llm_batch_wait", sent - enqueued)
+        metrics.inc("llm_batches")
+        metrics.inc("llm_batched_prompts", len(batch.prompts))
+
+        try:
+            replies = await self.client.complete_batch(batch.prompts, temperature)
+        except Exception as e:
+            replies = [e] * len(batch.prompts)
+        for future, reply in zip(batch.futures, replies):
+            if future.done():
+                continue  # the waiting conversation was cancelled
+            if isinstance(reply, BaseException):
+                future.set_exception(reply)
+            else:
+                future.set_result(reply)
+
+    async def aclose(self):
+        """Sends whatever this loop still has queued and waits for its batches before closing the client."""
+        loop = asyncio.get_running_loop()
+        for temperature, batch in list(self._pending.get(loop, {}).items()):
+            batch.timer.cancel()
+            self._flush(loop, temperature)
+        tasks = [task for task in self._tasks if task.get_loop() is loop]
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.client.aclose()
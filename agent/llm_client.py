@@ -0,0 +1,217 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import weakref
+
+import httpx
+
+try:
+    import h2  # noqa: F401 - only needed for httpx's HTTP/2 support
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from agent.metrics import metrics
+
+# Replies are cut to two sentences anyway; this bounds what we pay for
+LLM_MAX_TOKENS = int(os.getenv("HONEYPOT_LLM_MAX_TOKENS", "96"))
+
+
+# ------------------------ Errors ------------------------
+class LLMError(Exception):
+    """
+    A failed completion. status is the HTTP status (None for timeouts and
+    connection errors) and retry_after the server's requested wait in
+    seconds, if it sent one.
+    """
+
+    def __init__(self, message: str, status: int = None, retry_after: float = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status is None or self.status == 429 or self.status >= 500
+
+
+def _retry_after(headers) -> float:
+    value = headers.get("retry-after")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None  # an HTTP date; rare enough to fall back to backoff
+
+
+# ------------------------ Pooled Chat Client ------------------------
+class GroqClient:
+    """
+    Async chat-completions client with a pooled, keep-alive connection.
+    httpx clients are bound to the event loop that created them, so one
+    pooled client is kept per running loop and reused by every call on it.
+    """
+
+    def __init__(self, api_key: str, url: str, model: str, timeout: float = 25.0,
+                 max_connections: int = 100, max_keepalive: int = 20, max_tokens: int = LLM_MAX_TOKENS,
+                 batch_url: str = None):
+        self.api_key = api_key
+        self.url = url
+        self.model = model
+        self.timeout = timeout
+        self.max_tokens = max_tokens
+        # Optional OpenAI-compatible /v1/completions endpoint that takes a
+        # list of prompts (vLLM, llama.cpp server); Groq itself has none
+        self.batch_url = batch_url
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+        )
+        self._clients = weakref.WeakKeyDictionary()
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=self.limits,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+            )
+            self._clients[loop] = client
+        return client
+
+    def _request(self, prompt: str, temperature: float, stream: bool = False) -> dict:
+        data = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": self.max_tokens,
+        }
+        if stream:
+            data["stream"] = True
+        return data
+
+    async def complete(self, prompt: str, temperature: float = 0.7) -> str:
+        data = self._request(prompt, temperature)
+        try:
+            resp = await self._client().post(self.url, json=data)
+        except httpx.TransportError as e:
+            raise LLMError(f"{type(e).__name__}: {e}") from e
+        if resp.status_code >= 400:
+            raise LLMError(
+                f"HTTP {resp.status_code} from {self.url}",
+                status=resp.status_code,
+                retry_after=_retry_after(resp.headers),
+            )
+        return resp.json()["choices"][0]["message"]["content"].strip()
+
+    async def complete_batch(self, prompts: list, temperature: float = 0.7) -> list:
+        """
+        One reply per prompt, in order; a failed prompt's slot holds its
+        exception. Without a batch_url the prompts go out as concurrent
+        single requests.
+        """
+        if not self.batch_url:
+            return await asyncio.gather(*(self.complete(p, temperature) for p in prompts), return_exceptions=True)
+
+        data = {
+            "model": self.model,
+            "prompt": list(prompts),
+            "temperature": temperature,
+            "max_tokens": self.max_tokens,
+        }
+        try:
+            resp = await self._client().post(self.batch_url, json=data)
+        except httpx.TransportError as e:
+            raise LLMError(f"{type(e).__name__}: {e}") from e
+        if resp.status_code >= 400:
+            raise LLMError(
+                f"HTTP {resp.status_code} from {self.batch_url}",
+                status=resp.status_code,
+                retry_after=_retry_after(resp.headers),
+            )
+        replies = [LLMError("No completion for this prompt")] * len(prompts)
+        for choice in resp.json()["choices"]:
+            replies[choice["index"]] = choice["text"].strip()
+        return replies
+
+    async def stream_complete(self, prompt: str, temperature: float = 0.7, until=None) -> str:
+        """
+        Streams the completion (SSE) and returns the text received. until,
+        if given, is called with the text so far after every delta; once
+        it returns True the stream is closed, which stops generation.
+        """
+        data = self._request(prompt, temperature, stream=True)
+        parts = []
+        start = time.perf_counter()
+        try:
+            async with self._client().stream("POST", self.url, json=data) as resp:
+                if resp.status_code >= 400:
+                    raise LLMError(
+                        f"HTTP {resp.status_code} from {self.url}",
+                        status=resp.status_code,
+                        retry_after=_retry_after(resp.headers),
+                    )
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    payload = line[5:].strip()
+                    if payload == "[DONE]":
+                        break
+                    delta = json.loads(payload)["choices"][0]["delta"].get("content")
+                    if not delta:
+                        continue
+                    if not parts:
+                        metrics.observe("llm_first_token", time.perf_counter() - start)
+                    parts.append(delta)
+                    if until is not None and until("".join(parts)):
+                        metrics.inc("llm_stream_cutoffs")
+                        break  # leaving the block closes the connection
+        except httpx.TransportError as e:
+            raise LLMError(f"{type(e).__name__}: {e}") from e
+        return "".join(parts).strip()
+
+    async def connect(self) -> int:
+        """
+        Opens a pooled connection on this loop without generating anything
+        (GET <base>/models, which isn't billed); returns the HTTP status.
+        """
+        url = self.url.rsplit("/chat/completions", 1)[0] + "/models"
+        try:
+            resp = await self._client().get(url)
+        except httpx.TransportError as e:
+            raise LLMError(f"{type(e).__name__}: {e}") from e
+        return resp.status_code
+
+    async def aclose(self):
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+# ------------------------ Background Event Loop ------------------------
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def background_loop() -> asyncio.AbstractEventLoop:
+    """Process-wide event loop on a daemon thread, used by sync wrappers."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="llm-client-loop", daemon=True
+            ).start()
+    return _loop
+
+
+def run_sync(coro):
+    """Run a coroutine on the background loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, background_loop()).result()
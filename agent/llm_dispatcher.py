@@ -0,0 +1,255 @@
+import asyncio
+import os
+import random
+import threading
+import time
+
+from agent.llm_client import LLMError
+from agent.metrics import metrics
+from agent.prompt_template import estimate_tokens
+
+LLM_MAX_RETRIES = int(os.getenv("HONEYPOT_LLM_MAX_RETRIES", "3"))
+# Send a second, identical request if the first hasn't answered by then; 0 disables
+LLM_HEDGE_AFTER = float(os.getenv("HONEYPOT_LLM_HEDGE_AFTER", "0"))
+BREAKER_FAILURES = int(os.getenv("HONEYPOT_LLM_BREAKER_FAILURES", "5"))
+BREAKER_RESET = float(os.getenv("HONEYPOT_LLM_BREAKER_RESET", "30"))
+
+# Replies are one or two sentences; reserved up front against the TPM budget
+COMPLETION_TOKENS_ESTIMATE = 60
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 20.0
+
+FALLBACK_REPLIES = (
+    "I’m confused about this, can you explain again?",
+    "Sorry, my phone is acting up. Who did you say you are?",
+    "Wait, I need to find my glasses. Which company is this?",
+    "I don’t understand, can you tell me again slowly?",
+    "My son usually handles this. What is this about exactly?",
+    "Hold on, someone is at the door. Can you repeat that?",
+)
+
+
+class FallbackReply(str):
+    """A locally generated reply, returned instead of an LLM completion."""
+
+
+def local_fallback(prompt: str) -> FallbackReply:
+    return FallbackReply(random.choice(FALLBACK_REPLIES))
+
+
+# ------------------------ Token Bucket ------------------------
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` per second up to `capacity`.
+
+    reserve() takes tokens immediately, letting the balance go negative,
+    and returns how long the caller must wait for them; waiters are
+    served in reservation order without holding a lock while they sleep.
+    pause() empties the bucket for a while, e.g. after a 429.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float = 1) -> float:
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self.rate)
+
+    def try_take(self, amount: float = 1) -> bool:
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < amount:
+                return False
+            self._tokens -= amount
+            return True
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+# ------------------------ Circuit Breaker ------------------------
+class CircuitBreaker:
+    """
+    Opens after `failures` consecutive failed calls and stays open for
+    `reset_timeout` seconds. Then one trial call is let through
+    (half-open): success closes the breaker, failure reopens it, and a
+    trial that ends with neither (cancelled) lets the next call try.
+    """
+
+    def __init__(self, failures: int = BREAKER_FAILURES, reset_timeout: float = BREAKER_RESET):
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                return True
+            return False  # open, or a half-open trial is already in flight
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._consecutive = 0
+
+    def abandon(self):
+        """The call ended without an outcome; a half-open trial goes back to open, due again."""
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive += 1
+            if self.state == "half_open" or self._consecutive >= self.failures:
+                if self.state != "open":
+                    metrics.inc("llm_breaker_opened")
+                    print(f"⚡ LLM circuit open for {self.reset_timeout:.0f}s")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+# ------------------------ Dispatcher ------------------------
+class LLMDispatcher:
+    """
+    Shared front for an LLM client, with the same complete() call.
+
+    Every request reserves one request and its estimated tokens from the
+    RPM/TPM buckets (account limits; 0 disables one, and the backends
+    carry their own, see LLMBackend.rpm) and waits its turn. Retryable failures (429, 5xx,
+    timeouts) are retried with full-jitter backoff, or after retry-after
+    when the server sends one; a 429 also pauses the buckets so other
+    conversations back off too. With hedge_after, a slow request gets an
+    identical second request if the request budget allows, and the first
+    answer wins. When the breaker is open, or retries run out, the local
+    fallback answers instead.
+    """
+
+    def __init__(self, client, rpm: float = 0, tpm: float = 0,
+                 max_retries: int = LLM_MAX_RETRIES, hedge_after: float = LLM_HEDGE_AFTER,
+                 breaker: CircuitBreaker = None, fallback=local_fallback):
+        self.client = client
+        # Limits are per minute, so up to a minute's worth may go at once
+        self.requests = TokenBucket(rpm / 60, rpm) if rpm else None
+        self.tokens = TokenBucket(tpm / 60, tpm) if tpm else None
+        self.max_retries = max_retries
+        self.hedge_after = hedge_after
+        self.breaker = breaker or CircuitBreaker()
+        self.fallback = fallback
+
+    async def complete(self, prompt: str, temperature: float = 0.7) -> str:
+        return await self._dispatch(prompt, lambda: self.client.complete(prompt, temperature))
+
+    async def stream_complete(self, prompt: str, temperature: float = 0.7, until=None) -> str:
+        """complete() over the client's streaming call, if it has one."""
+        if not hasattr(self.client, "stream_complete"):
+            return await self.complete(prompt, temperature)
+        return await self._dispatch(prompt, lambda: self.client.stream_complete(prompt, temperature, until))
+
+    async def _dispatch(self, prompt: str, call) -> str:
+        if not self.breaker.allow():
+            metrics.inc("llm_fallbacks")
+            return self.fallback(prompt)
+
+        try:
+            reply = await self._attempts(prompt, call)
+        except BaseException:
+            # Cancelled (caller gone, timeout): no verdict on the LLM either way
+            self.breaker.abandon()
+            raise
+        if reply is None:
+            self.breaker.record_failure()
+            metrics.inc("llm_fallbacks")
+            return self.fallback(prompt)
+        self.breaker.record_success()
+        return reply
+
+    async def _attempts(self, prompt: str, call):
+        """The call with retries; None once they run out or the error isn't retryable."""
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(estimate_tokens(prompt) + COMPLETION_TOKENS_ESTIMATE)
+            try:
+                reply = await self._call(call)
+            except LLMError as e:
+                if e.status == 429:
+                    metrics.inc("llm_rate_limited")
+                    self._pause(e.retry_after)
+                if not e.retryable or attempt == self.max_retries:
+                    print(f"[LLM ERROR] {e}")
+                    break
+                metrics.inc("llm_retries")
+                await asyncio.sleep(self._backoff(attempt, e.retry_after))
+            except Exception as e:
+                print(f"[LLM ERROR] {e}")
+                break
+            else:
+                return reply
+        return None
+
+    async def _acquire(self, tokens: int):
+        wait = max(
+            self.requests.reserve(1) if self.requests else 0.0,
+            self.tokens.reserve(tokens) if self.tokens else 0.0,
+        )
+        if wait:
+            metrics.observe("llm_queue_wait", wait)
+            await asyncio.sleep(wait)
+
+    def _pause(self, retry_after: float):
+        for bucket in (self.requests, self.tokens):
+            if bucket and retry_after:
+                bucket.pause(retry_after)
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: float = None) -> float:
+        if retry_after is not None:
+            return retry_after + random.uniform(0, RETRY_BASE_DELAY)
+        return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+    async def _call(self, call) -> str:
+        if not self.hedge_after:
+            return await call()
+
+        primary = asyncio.ensure_future(call())
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_after)
+        if done or (self.requests and not self.requests.try_take(1)):
+            return await primary
+
+        metrics.inc("llm_hedges")
+        hedge = asyncio.ensure_future(call())
+        pending = {primary, hedge}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def aclose(self):
+        await self.client.aclose()
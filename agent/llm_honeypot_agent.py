@@ -1,57 +1,266 @@
 import requests
-import time
+import asyncio
 import random
 import re
-import json
 from datetime import datetime
 from langdetect import detect, LangDetectException
 import os
 
-from agent.memory.conversation_memory import ConversationMemory
+from agent.indicator_index import IndicatorIndex, get_index
+from agent.indicators import extract_indicators, group_indicators
+from agent.keyword_matcher import KeywordMatcher, MatcherGroup
+from agent.llm_backends import LLMBackend, create_backend, wants_warm_up, warm_up_in_background
+from agent.llm_batcher import LLM_BATCH_WINDOW, LLMBatcher
+from agent.llm_client import run_sync
+from agent.llm_dispatcher import FallbackReply, LLMDispatcher
+from agent.local_replies import LocalReplyEngine, ReplyPolicy, check_phrases
+from agent.log_files import HONEYPOT_LOG_FILE
+from agent.log_sink import JsonlLogSink, get_sink
+from agent.metrics import metrics
 from agent.persona import get_persona
+from agent.prompt_template import CHARS_PER_TOKEN, PromptTemplate, estimate_tokens
+from agent.reply_cache import REPLY_CACHE_ENABLED, ReplyCache, fingerprint
 from agent.scam_classifier import ScamClassifier
-
-# ------------------------ GROQ API CONFIG ------------------------
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
-GROQ_MODEL = "llama-3.1-8b-instant"  # You can change to another Groq model if desired
+from agent.session_manager import SESSION_SPILL_DIR, SessionManager, ConversationState, DEFAULT_CONVERSATION_ID
+
+# ------------------------ LLM BACKEND ------------------------
+# Chosen with HONEYPOT_LLM_BACKEND (groq, openai, llamacpp); see agent/llm_backends.py.
+# Shared by every agent in the process, so they all reuse one connection pool
+llm_backend = create_backend()
+# Every conversation in the process shares one rate limit (the backend's
+# account limits), retry policy and circuit breaker, and with
+# HONEYPOT_LLM_BATCH_WINDOW set, one batcher
+llm_dispatcher = LLMDispatcher(
+    LLMBatcher(llm_backend) if LLM_BATCH_WINDOW else llm_backend,
+    rpm=llm_backend.rpm,
+    tpm=llm_backend.tpm,
+)
+
+# Seconds to wait before answering, so replies don't arrive inhumanly fast
+HUMANIZE_DELAY = (0.4, 0.9)
 
 MOCK_SCAMMER_API = "http://localhost:5000/mock_scammer"  # Example API
 
+# ------------------------ Prompt ------------------------
+# Upper bound on the estimated prompt size; older turns are dropped from
+# the RECENT CONVERSATION section to fit
+MAX_PROMPT_TOKENS = int(os.getenv("HONEYPOT_MAX_PROMPT_TOKENS", "600"))
+PROMPT_MEMORY_TURNS = 6
+
+SYSTEM_PROMPT_TEMPLATE = """You are a real human scam victim talking to a scammer.
+ABSOLUTE RULES:
+- Never share OTP, passwords, numbers, or banking info
+- Never agree to send information
+- Never mention AI or automation
+
+ACTIVE STRATEGY: {strategy}
+
+Ask exactly ONE verification question: "{trap}"
+
+STATE:
+Stage: {stage}
+Emotion: {emotion}
+Scammer style: {scammer_style}
+Frustration: {frustration}
+
+PERSONA:
+{persona}
+
+RECENT CONVERSATION:
+{memory}
+
+OUTPUT RULES:
+- 1–2 short sentences
+- Natural human tone
+- End with a question
+
+Victim:"""
+
+STRATEGIES = ("delay", "emotional", "confusion", "verification", "fake_compliance")
+STAGE_TRAPS = {
+    "otp": ("Can you confirm your employee ID?", "Why does my bank say never to give out codes?"),
+    "payment": ("Which branch are you calling from?", "Can I verify this with my bank first?"),
+    "trust": ("Should I note your full name?", "Do you have an official reference number?"),
+    "initial": ("What is your official work number?", "Can I confirm this with customer service?"),
+}
+EMOTIONAL_STATES = {
+    "otp": "panicked and scared",
+    "payment": "worried and confused",
+    "trust": "uncertain but cooperative",
+    "initial": "mildly confused",
+}
+
+# One compiled template per persona, with the persona section baked in
+_prompt_templates = {}
+
+
+def get_prompt_template(persona_prompt: str) -> PromptTemplate:
+    template = _prompt_templates.get(persona_prompt)
+    if template is None:
+        template = _prompt_templates[persona_prompt] = PromptTemplate(
+            SYSTEM_PROMPT_TEMPLATE, persona=persona_prompt
+        )
+    return template
+
+# Stream completions and stop reading once the reply is settled
+LLM_STREAM = os.getenv("HONEYPOT_LLM_STREAM", "1") != "0"
+
+# ------------------------ Compiled Patterns ------------------------
+REDACT_NUMBERS = re.compile(r"\b\d{4,}\b")
+REDACT_EMAILS = re.compile(r"\S+@\S+")
+SENTENCE_SPLIT = re.compile(r"[.!?]")
+
+# scam_attempts keys per indicator type; upi_ids, links and numbers are
+# the keys older log lines already use
+SCAM_DATA_KEYS = {
+    "upi": "upi_ids",
+    "url": "links",
+    "domain": "domains",
+    "email": "emails",
+    "phone": "phone_numbers",
+    "ifsc": "ifsc_codes",
+    "bank_account": "bank_accounts",
+    "card": "card_numbers",
+    "crypto_wallet": "crypto_wallets",
+    "number": "numbers",
+}
+
+# ------------------------ Keyword Tables ------------------------
+# Stages are checked in order; the first one with a hit wins
+STAGE_KEYWORDS = {
+    "otp": ["otp"],
+    "payment": ["upi", "bank", "account", "payment", "transfer"],
+    "trust": ["verify", "confirm", "id", "official"],
+}
+SCORE_KEYWORDS = {
+    "high_value": ["otp", "upi", "transfer", "payment", "bank", "account"],
+}
+# Matched as substrings on purpose: "sending" or "shared" must trip it too
+FIREWALL_KEYWORDS = {
+    "banned": ["otp", "send", "share", "transfer", "here is"],
+}
+
+STAGE_MATCHER = KeywordMatcher(STAGE_KEYWORDS)
+SCORE_MATCHER = KeywordMatcher(SCORE_KEYWORDS)
+FIREWALL_MATCHER = KeywordMatcher(FIREWALL_KEYWORDS, word_boundary=False)
+
+# Local replies are a reaction plus a trap; neither may trip the firewall
+check_phrases(FIREWALL_MATCHER, [trap for traps in STAGE_TRAPS.values() for trap in traps])
+
+
+def reply_settled(text: str) -> bool:
+    """
+    True once more LLM output can't change the sanitized reply: two
+    sentences are complete (_sanitize_reply keeps only those), or the
+    firewall already trips on what has arrived.
+    """
+    parts = SENTENCE_SPLIT.split(text)
+    complete = sum(1 for part in parts[:-1] if part.strip())
+    return complete >= 2 or bool(FIREWALL_MATCHER.scan(text))
+
+class HoneypotReply(str):
+    """
+    A reply, with the conversation's stage, style and score as they were
+    right after the turn that produced it. Read these rather than the live
+    session: the next turn of the conversation may already be running.
+    """
+
+    def __new__(cls, reply: str, state: ConversationState):
+        self = super().__new__(cls, reply)
+        self.conversation_id = state.conversation_id
+        self.stage = state.stage
+        self.scammer_style = state.scammer_style
+        self.conversation_score = state.conversation_score
+        return self
+
 # ------------------------ Scammer Profiler ------------------------
 class ScammerProfiler:
-    def profile(self, text: str) -> str:
-        text = text.lower()
-        if any(w in text for w in ["urgent", "immediately", "now", "otp", "closed"]):
-            return "aggressive"
-        if any(w in text for w in ["sir", "dear", "official", "customer"]):
-            return "authority"
-        if any(w in text for w in ["install", "app", "download", "link"]):
-            return "technical"
+    # Styles are checked in order; the first one with a hit wins
+    styles = {
+        "aggressive": ["urgent", "immediately", "now", "otp", "closed"],
+        "authority": ["sir", "dear", "official", "customer"],
+        "technical": ["install", "app", "download", "link"],
+    }
+
+    matcher = KeywordMatcher(styles)
+
+    def profile(self, text: str, hits: dict = None) -> str:
+        if hits is None:
+            hits = self.matcher.scan(text)
+        for style in self.styles:
+            if style in hits:
+                return style
         return "friendly"
 
+# Every keyword table applied to an incoming scammer message, scanned once
+MESSAGE_MATCHER = MatcherGroup(
+    scam_type=ScamClassifier.matcher,
+    style=ScammerProfiler.matcher,
+    stage=STAGE_MATCHER,
+    score=SCORE_MATCHER,
+)
+
 # ------------------------ Elite Autonomous Honeypot ------------------------
 class LLMHoneypotAgent:
-    def __init__(self):
-        self.stage = "initial"
-        self.memory = ConversationMemory(max_memory=12)
+    def __init__(self, llm_client: LLMBackend = None, humanize_delay=HUMANIZE_DELAY,
+                 sessions: SessionManager = None, log_sink: JsonlLogSink = None,
+                 indicator_index: IndicatorIndex = None, reply_cache: ReplyCache = None,
+                 reply_policy: ReplyPolicy = None, stream: bool = LLM_STREAM):
+        if llm_client is None:
+            llm_client = llm_dispatcher
+            if wants_warm_up(llm_backend):
+                warm_up_in_background(llm_backend)
+        self.llm_client = llm_client
+        self.humanize_delay = humanize_delay
+        self.stream = stream and hasattr(self.llm_client, "stream_complete")
+        self.log_sink = log_sink or get_sink(HONEYPOT_LOG_FILE)
+        # Every logged indicator, for "have we seen this before" across conversations
+        self.indicator_index = indicator_index if indicator_index is not None else get_index()
+        # Replies to repeated scripts; None takes the default, False disables caching
+        if reply_cache is None and REPLY_CACHE_ENABLED:
+            reply_cache = ReplyCache()
+        self.reply_cache = reply_cache if reply_cache is not False else None
+        # Easy turns are answered in-process; so is any turn the LLM can't answer
+        self.reply_policy = reply_policy if reply_policy is not None else ReplyPolicy()
+        self.local_replies = LocalReplyEngine()
+
+        # Per-conversation state lives in the session manager
+        if sessions is None:
+            sessions = SessionManager(spill_dir=SESSION_SPILL_DIR or None, max_memory=12)
+        self.sessions = sessions
+        self.state = self.sessions.get(DEFAULT_CONVERSATION_ID)
+
         self.classifier = ScamClassifier()
+        self.profiler = ScammerProfiler()
 
-        self.persona_name = None
-        self.persona_prompt = None
+    # State of the most recently handled conversation, for single-conversation callers
+    @property
+    def stage(self):
+        return self.state.stage
 
-        self.profiler = ScammerProfiler()
-        self.scammer_style = "unknown"
-        self.conversation_score = 0
-
-        self.dynamic_memory = {
-            "otp_requests": 0,
-            "payment_requests": 0,
-            "trust_attempts": 0,
-            "last_traps_used": [],
-            "scammer_style_history": [],
-            "frustration_level": 0
-        }
+    @property
+    def memory(self):
+        return self.state.memory
+
+    @property
+    def persona_name(self):
+        return self.state.persona_name
+
+    @property
+    def persona_prompt(self):
+        return self.state.persona_prompt
+
+    @property
+    def scammer_style(self):
+        return self.state.scammer_style
+
+    @property
+    def conversation_score(self):
+        return self.state.conversation_score
+
+    @property
+    def dynamic_memory(self):
+        return self.state.dynamic_memory
 
     # ------------------------ Language Detection ------------------------
     def _detect_language(self, text: str) -> str:
@@ -63,179 +272,220 @@ class LLMHoneypotAgent:
             return "en"
 
     # ------------------------ Stage Detection ------------------------
-    def _update_stage(self, msg: str):
-        msg_lower = msg.lower()
-        if "otp" in msg_lower:
-            self.stage = "otp"
-            self.dynamic_memory["otp_requests"] += 1
-        elif any(k in msg_lower for k in ["upi", "bank", "account", "payment", "transfer"]):
-            self.stage = "payment"
-            self.dynamic_memory["payment_requests"] += 1
-        elif any(k in msg_lower for k in ["verify", "confirm", "id", "official"]):
-            self.stage = "trust"
-            self.dynamic_memory["trust_attempts"] += 1
+    def _update_stage(self, state: ConversationState, msg: str, hits: dict = None):
+        if hits is None:
+            hits = STAGE_MATCHER.scan(msg)
+        if "otp" in hits:
+            state.stage = "otp"
+            state.dynamic_memory["otp_requests"] += 1
+        elif "payment" in hits:
+            state.stage = "payment"
+            state.dynamic_memory["payment_requests"] += 1
+        elif "trust" in hits:
+            state.stage = "trust"
+            state.dynamic_memory["trust_attempts"] += 1
 
     # ------------------------ Score Update ------------------------
-    def _update_score(self, message: str):
-        keywords = ["otp", "upi", "transfer", "payment", "bank", "account"]
-        self.conversation_score += 2 if any(k in message.lower() for k in keywords) else 1
+    def _update_score(self, state: ConversationState, message: str, hits: dict = None):
+        if hits is None:
+            hits = SCORE_MATCHER.scan(message)
+        state.conversation_score += 2 if "high_value" in hits else 1
 
     # ------------------------ Generate Bait / Trap Question ------------------------
-    def _generate_bait_hint(self):
-        stage_traps = {
-            "otp": ["Can you confirm your employee ID?", "Why does my bank warn against sharing OTP?"],
-            "payment": ["Which branch are you calling from?", "Can I verify this with my bank first?"],
-            "trust": ["Should I note your full name?", "Do you have an official reference number?"],
-            "initial": ["What is your official work number?", "Can I confirm this with customer service?"]
-        }
-        traps = stage_traps.get(self.stage, stage_traps["initial"])
-        available = [t for t in traps if t not in self.dynamic_memory["last_traps_used"]]
-        if not available:
-            self.dynamic_memory["last_traps_used"] = []
-            available = traps
-        chosen = random.choice(available)
-        self.dynamic_memory["last_traps_used"].append(chosen)
+    def _generate_bait_hint(self, state: ConversationState):
+        traps = STAGE_TRAPS.get(state.stage, STAGE_TRAPS["initial"])
+        used = state.dynamic_memory["last_traps_used"]
+        # Random starting point, first unused trap from there
+        start = random.randrange(len(traps))
+        for offset in range(len(traps)):
+            chosen = traps[(start + offset) % len(traps)]
+            if chosen not in used:
+                break
+        else:
+            used.clear()
+            chosen = traps[start]
+        used.append(chosen)
         return chosen
 
     # ------------------------ Emotional State ------------------------
-    def _get_emotional_state(self):
-        states = {
-            "otp": "panicked and scared",
-            "payment": "worried and confused",
-            "trust": "uncertain but cooperative",
-            "initial": "mildly confused"
-        }
-        return states.get(self.stage, "confused")
+    def _get_emotional_state(self, state: ConversationState):
+        return EMOTIONAL_STATES.get(state.stage, "confused")
 
     # ------------------------ Build System Prompt ------------------------
-    def _build_system_prompt(self):
-        trap = self._generate_bait_hint()
-        memory_summary = self.memory.render(last_n=6)
-        strategy = random.choice(["delay", "emotional", "confusion", "verification", "fake_compliance"])
-        return f"""You are a real human scam victim talking to a scammer.
-ABSOLUTE RULES:
-- Never share OTP, passwords, numbers, or banking info
-- Never agree to send information
-- Never mention AI or automation
-
-ACTIVE STRATEGY: {strategy}
-
-Ask exactly ONE verification question: "{trap}"
-
-STATE:
-Stage: {self.stage}
-Emotion: {self._get_emotional_state()}
-Scammer style: {self.scammer_style}
-Frustration: {self.dynamic_memory['frustration_level']}
-
-PERSONA:
-{self.persona_prompt}
-
-RECENT CONVERSATION:
-{memory_summary}
-
-OUTPUT RULES:
-- 1–2 short sentences
-- Natural human tone
-- End with a question
-
-Victim:"""
+    def _build_system_prompt(self, state: ConversationState, trap: str = None):
+        template = get_prompt_template(state.persona_prompt)
+        fields = {
+            "strategy": random.choice(STRATEGIES),
+            "trap": trap if trap is not None else self._generate_bait_hint(state),
+            "stage": state.stage,
+            "emotion": self._get_emotional_state(state),
+            "scammer_style": state.scammer_style,
+            "frustration": state.dynamic_memory["frustration_level"],
+        }
+        # The conversation gets whatever the rest of the prompt leaves of
+        # the budget: the newest turns that fit, plus the rolling summary
+        # of older ones if there is room
+        fixed_chars = template.length(**fields)
+        memory = state.memory.render(
+            last_n=PROMPT_MEMORY_TURNS,
+            max_chars=max(0, MAX_PROMPT_TOKENS * CHARS_PER_TOKEN - fixed_chars),
+            include_summary=True,
+        )
+        return template.render(memory=memory, **fields)
 
     # ------------------------ Safety Firewall ------------------------
     def _behavior_firewall(self, text: str):
-        banned = ["otp", "send", "share", "transfer", "here is"]
-        if any(b in text.lower() for b in banned):
+        if FIREWALL_MATCHER.scan(text):
             return "I’m nervous about this, can you confirm your identity first?"
         return text
 
     # ------------------------ Sanitize Reply ------------------------
     def _sanitize_reply(self, text: str):
         text = text.strip()
-        text = re.sub(r"\b\d{4,}\b", "[REDACTED]", text)
-        text = re.sub(r"\S+@\S+", "[REDACTED]", text)
-        sentences = [s.strip() for s in re.split(r"[.!?]", text) if s.strip()]
+        text = REDACT_NUMBERS.sub("[REDACTED]", text)
+        text = REDACT_EMAILS.sub("[REDACTED]", text)
+        sentences = [s.strip() for s in SENTENCE_SPLIT.split(text) if s.strip()]
         clean = " ".join(sentences[:2])
         if not clean.endswith("?"):
             clean += "?"
         return clean
 
     # ------------------------ Extract Potential Scam Info ------------------------
-    def _extract_scam_data(self, text: str):
-        data = {}
-        upi_match = re.findall(r"\b[\w.-]+@[\w]+\b", text)
-        if upi_match:
-            data["upi_ids"] = upi_match
-        links = re.findall(r"(https?://\S+)", text)
-        if links:
-            data["links"] = links
-        numbers = re.findall(r"\b\d{4,}\b", text)
-        if numbers:
-            data["numbers"] = numbers
-        return data
+    def _extract_scam_data(self, text: str, indicators: list = None):
+        # Single pass over the text for every indicator type
+        if indicators is None:
+            indicators = extract_indicators(text)
+        return group_indicators(indicators, SCAM_DATA_KEYS)
 
     # ------------------------ Main Reply Engine ------------------------
-    def reply(self, scammer_message: str):
-        if self.persona_name is None:
-            scam_type = self.classifier.classify(scammer_message)
-            self.persona_name, self.persona_prompt = get_persona(scam_type)
-            print(f"[Persona selected: {self.persona_name}]")
-
-        self.scammer_style = self.profiler.profile(scammer_message)
-        self._update_stage(scammer_message)
-        self._update_score(scammer_message)
-
-        self.memory.add("scammer", scammer_message)
-        prompt = self._build_system_prompt()
+    def reply(self, scammer_message: str, conversation_id: str = DEFAULT_CONVERSATION_ID):
+        # Sync callers share the background event loop and its connection pool
+        return run_sync(self.areply(scammer_message, conversation_id))
+
+    async def areply(self, scammer_message: str, conversation_id: str = DEFAULT_CONVERSATION_ID):
+        # Returns a HoneypotReply: the reply text plus the state it left behind.
+        # Turns of the same conversation run one at a time; different
+        # conversations run concurrently on their own state
+        async with self.sessions.session(conversation_id) as state:
+            self.state = state
+            reply = await self._turn(state, scammer_message)
+        metrics.inc("replies")
+
+        # Non-blocking: other conversations keep running while this one waits
+        if self.humanize_delay:
+            await asyncio.sleep(random.uniform(*self.humanize_delay))
+        return reply
 
-        # ------------------------ GROQ API CALL ------------------------
+    async def _turn(self, state: ConversationState, scammer_message: str):
+        # One keyword scan shared by the classifier, profiler, stage and score
+        with metrics.timer("classify"):
+            hits = MESSAGE_MATCHER.scan(scammer_message)
+
+            if state.persona_name is None:
+                scam_type = self.classifier.classify(scammer_message, hits=hits["scam_type"])
+                state.persona_name, state.persona_prompt = get_persona(scam_type)
+                print(f"[Persona selected: {state.persona_name}]")
+
+            state.scammer_style = self.profiler.profile(scammer_message, hits=hits["style"])
+            self._update_stage(state, scammer_message, hits=hits["stage"])
+            self._update_score(state, scammer_message, hits=hits["score"])
+
+        state.memory.add("scammer", scammer_message)
+        with metrics.timer("extract"):
+            indicators = extract_indicators(scammer_message)
+            scam_data = self._extract_scam_data(scammer_message, indicators)
+
+        # The trap is part of the cache key, so it's picked before the prompt
+        trap = self._generate_bait_hint(state)
+        if self.reply_policy.use_llm(state, scammer_message, hits):
+            cache_key = None
+            reply = None
+            if self.reply_cache is not None:
+                cache_key = fingerprint(state.persona_name, state.stage, state.scammer_style,
+                                        scammer_message, trap, indicators)
+                reply = self.reply_cache.get(cache_key)
+            if reply is None:
+                reply = await self._llm_reply(state, trap, cache_key)
+            else:
+                self.reply_policy.llm_done(False)
+        else:
+            reply = self._local_reply(state, trap)
+
+        state.memory.add("victim", reply)
+        self._log_interaction_json(state, scammer_message, reply, scam_data, indicators)
+
+        print(f"[Score: {state.conversation_score} | Style: {state.scammer_style} | Stage: {state.stage}]")
+        # Snapshot while the session is still held
+        return HoneypotReply(reply, state)
+
+    async def _llm_reply(self, state: ConversationState, trap: str, cache_key: str = None):
+        with metrics.timer("prompt_build"):
+            prompt = self._build_system_prompt(state, trap)
+        prompt_tokens = estimate_tokens(prompt)
+        state.prompt_tokens += prompt_tokens
+        metrics.inc("prompt_tokens", prompt_tokens)
+
+        # ------------------------ LLM CALL ------------------------
         try:
-            headers = {
-                "Authorization": f"Bearer {GROQ_API_KEY}",
-                "Content-Type": "application/json",
-            }
-            data = {
-                "model": GROQ_MODEL,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.7
-            }
-            resp = requests.post(
-                GROQ_URL,
-                headers=headers,
-                json=data,
-                timeout=25,
-            )
-            resp.raise_for_status()
-            raw_reply = resp.json()["choices"][0]["message"]["content"].strip()
+            with metrics.timer("llm_call"):
+                if self.stream:
+                    raw_reply = await self.llm_client.stream_complete(prompt, temperature=0.7, until=reply_settled)
+                else:
+                    raw_reply = await self.llm_client.complete(prompt, temperature=0.7)
+            from_llm = not isinstance(raw_reply, FallbackReply)
+            if from_llm:
+                completion_tokens = estimate_tokens(raw_reply)
+                state.completion_tokens += completion_tokens
+                metrics.inc("completion_tokens", completion_tokens)
         except Exception as e:
-            print(f"[Groq ERROR] {e}")
-            raw_reply = "I’m confused about this, can you explain again?"
-
-        reply = raw_reply if raw_reply else "I’m confused about this, can you explain again?"
-        reply = self._sanitize_reply(reply)
-        reply = self._behavior_firewall(reply)
-
-        self.memory.add("victim", reply)
-        scam_data = self._extract_scam_data(scammer_message)
-        self._log_interaction_json(scammer_message, reply, scam_data)
-
-        time.sleep(random.uniform(0.4, 0.9))
-        print(f"[Score: {self.conversation_score} | Style: {self.scammer_style} | Stage: {self.stage}]")
+            print(f"[LLM ERROR] {e}")
+            metrics.inc("llm_errors")
+            raw_reply = None
+            from_llm = False
+
+        self.reply_policy.llm_done(bool(raw_reply and from_llm))
+        if not (raw_reply and from_llm):
+            return self._local_reply(state, trap)
+        with metrics.timer("sanitize"):
+            reply = self._sanitize_reply(raw_reply)
+            reply = self._behavior_firewall(reply)
+        if cache_key is not None:
+            self.reply_cache.put(cache_key, reply)
         return reply
 
+    def _local_reply(self, state: ConversationState, trap: str):
+        with metrics.timer("local_reply"):
+            reply = self.local_replies.generate(state.persona_name, state.stage, state.scammer_style, trap)
+            reply = self._sanitize_reply(reply)
+            return self._behavior_firewall(reply)
+
     # ------------------------ JSON Logging ------------------------
-    def _log_interaction_json(self, scammer: str, honeypot: str, scam_data: dict):
+    def _log_interaction_json(self, state: ConversationState, scammer: str, honeypot: str,
+                              scam_data: dict, indicators: list = None):
+        timestamp = datetime.now().isoformat()
         data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
+            "conversation_id": state.conversation_id,
             "scammer_message": scammer,
             "honeypot_reply": honeypot,
-            "stage": self.stage,
-            "score": self.conversation_score,
-            "frustration_level": self.dynamic_memory["frustration_level"],
-            "scammer_style": self.scammer_style,
-            "scam_attempts": scam_data
+            "stage": state.stage,
+            "score": state.conversation_score,
+            "frustration_level": state.dynamic_memory["frustration_level"],
+            "scammer_style": state.scammer_style,
+            "scam_attempts": scam_data,
+            "prompt_tokens": state.prompt_tokens,
+            "completion_tokens": state.completion_tokens,
         }
-        with open("honeypot_logs.json", "a", encoding="utf-8") as f:
-            f.write(json.dumps(data) + "\n")
+        with metrics.timer("log_write"):
+            self.log_sink.write(data)
+        if indicators:
+            # The index is best effort; a failed write mustn't cost the turn its reply
+            try:
+                with metrics.timer("indicator_index"):
+                    self.indicator_index.add(indicators, state.conversation_id, timestamp)
+            except Exception as e:
+                print(f"[INDEX ERROR] {e}")
+                metrics.inc("indicator_index_errors")
 
 # ------------------------ Run Agent (Autonomous with Mock API) ------------------------
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+import os
+import random
+
+from agent.metrics import metrics
+
+# Share of turns the LLM answers. Hard turns get it first, easy turns fill
+# whatever share they leave; 1 sends every turn, 0 none.
+LLM_REPLY_RATIO = float(os.getenv("HONEYPOT_LLM_REPLY_RATIO", "0.4"))
+# Scammer messages longer than this carry enough detail to need a real reply
+HARD_MESSAGE_CHARS = 240
+
+# Reactions are single sentences: the trap question is the second one.
+# None of them may contain a firewall keyword (otp, send, share, ...);
+# check_phrases() enforces it when the agent module loads.
+STAGE_REACTIONS = {
+    "otp": (
+        "Oh no, this is making me very nervous.",
+        "Please wait, I am getting scared now.",
+        "My bank told me to be careful with codes like this.",
+        "I don’t understand why you need a code from me.",
+    ),
+    "payment": (
+        "I am worried, I don’t want to lose my money.",
+        "Wait, why does this involve my account?",
+        "My savings are all I have, so I must be careful.",
+        "I am not sure about any payment yet.",
+    ),
+    "trust": (
+        "I want to believe you, but I need to be sure.",
+        "Okay, I am listening, but this is new to me.",
+        "I get so many calls like this these days.",
+        "Alright, but I would like to check first.",
+    ),
+    "initial": (
+        "Sorry, I don’t understand what this is about.",
+        "Hello, who is this exactly?",
+        "I am a bit confused by this message.",
+        "This is unexpected, I was not told anything.",
+    ),
+}
+PERSONA_REACTIONS = {
+    "elderly_person": (
+        "Oh dear, I am not good with these bank things.",
+        "Let me find my reading glasses first.",
+        "My grandson usually helps me with this.",
+    ),
+    "naive_student": (
+        "Wait, is this for real?",
+        "I have never won anything before!",
+        "My hostel wifi is slow, give me a minute.",
+    ),
+    "job_seeker": (
+        "I really need this job, so I want to get it right.",
+        "Thank you for considering me for this role.",
+        "I have been looking for work for months.",
+    ),
+    "non_technical_user": (
+        "I am not very good with phones and apps.",
+        "Sorry, I don’t know how to do these computer things.",
+        "My screen is showing something strange.",
+    ),
+    "curious_beginner": (
+        "This sounds interesting, but I am new to investing.",
+        "I have heard about returns like this before.",
+        "I want to understand how this works first.",
+    ),
+    "confused_user": (
+        "I don’t really understand these security codes.",
+        "Sorry, I am confused about all these messages.",
+        "I keep getting these alerts and I don’t know why.",
+    ),
+    "generic_victim": (
+        "Sorry, I am a little confused.",
+        "Okay, please be patient with me.",
+        "I am not sure I follow.",
+    ),
+}
+STYLE_REACTIONS = {
+    "aggressive": (
+        "Please don’t rush me, I am trying.",
+        "Why is this so urgent?",
+        "You are scaring me, please slow down.",
+    ),
+    "authority": (
+        "Yes sir, I understand this is official.",
+        "Sorry sir, I just want to do this properly.",
+    ),
+    "technical": (
+        "I don’t know how to install or download things.",
+        "Which app are you talking about?",
+    ),
+    "friendly": (
+        "Thank you for being patient with me.",
+        "You seem nice, I just want to be careful.",
+    ),
+}
+
+
+def check_phrases(matcher, extra=()):
+    """
+    Raises ValueError if any reaction, or any of the extra phrases (the
+    trap questions), trips the firewall matcher: the reply would be
+    replaced by the firewall's canned string every time it came up.
+    """
+    phrases = [
+        phrase
+        for table in (STAGE_REACTIONS, PERSONA_REACTIONS, STYLE_REACTIONS)
+        for pool in table.values()
+        for phrase in pool
+    ]
+    phrases.extend(extra)
+    tripped = [phrase for phrase in phrases if matcher.scan(phrase)]
+    if tripped:
+        raise ValueError(f"Local reply phrases trip the firewall: {tripped}")
+
+
+# ------------------------ Local Reply Engine ------------------------
+class LocalReplyEngine:
+    """
+    In-process reply generator: one stage, persona or style reaction
+    followed by the turn's trap question, so every reply still asks for
+    verification details. Pure table lookups and a random choice.
+    """
+
+    def __init__(self, rng: random.Random = None):
+        self.rng = rng or random.Random()
+
+    def generate(self, persona_name: str, stage: str, style: str, trap: str) -> str:
+        pools = [
+            STAGE_REACTIONS.get(stage, STAGE_REACTIONS["initial"]),
+            PERSONA_REACTIONS.get(persona_name, PERSONA_REACTIONS["generic_victim"]),
+        ]
+        if style in STYLE_REACTIONS:
+            pools.append(STYLE_REACTIONS[style])
+        reaction = self.rng.choice(self.rng.choice(pools))
+        return f"{reaction} {trap}"
+
+
+# ------------------------ Reply Policy ------------------------
+class ReplyPolicy:
+    """
+    Decides per turn whether the LLM or the local engine answers.
+
+    llm_ratio is the share of turns the LLM answers, kept as a running
+    budget. A turn is hard when the local templates are likely to read
+    wrong: the first turn of a conversation, a long message, a direct
+    question from the scammer, or a message none of the stage/style
+    keywords matched. Hard turns go to the LLM as soon as the budget has
+    any room; easy turns only once a whole turn's worth has built up, so
+    they take what the hard turns leave. The share never exceeds
+    llm_ratio by more than one turn.
+
+    use_llm() reserves the turn for the LLM, so concurrent turns see it
+    spent; llm_done() then says whether the reply really came from the
+    LLM. A reply-cache hit or a fallback to the local engine hands the
+    turn back, so llm_share counts only turns that reached the LLM.
+    """
+
+    def __init__(self, llm_ratio: float = LLM_REPLY_RATIO):
+        self.llm_ratio = llm_ratio
+        self.turns = 0
+        self.llm_turns = 0
+
+    @staticmethod
+    def is_hard(state, message: str, hits: dict) -> bool:
+        return (
+            len(state.memory) <= 1
+            or len(message) > HARD_MESSAGE_CHARS
+            or "?" in message
+            or not (hits.get("stage") or hits.get("style"))
+        )
+
+    def use_llm(self, state, message: str, hits: dict) -> bool:
+        self.turns += 1
+        budget = self.llm_ratio * self.turns - self.llm_turns
+        use = self.llm_ratio >= 1 or budget >= 1 or (budget > 0 and self.is_hard(state, message, hits))
+        self.llm_turns += use
+        if not use:
+            metrics.inc("replies_local")
+        return use
+
+    def llm_done(self, reached: bool):
+        """Settles a turn use_llm() gave the LLM."""
+        if reached:
+            metrics.inc("replies_llm")
+        else:
+            self.llm_turns -= 1
+
+    @property
+    def llm_share(self) -> float:
+        return self.llm_turns / self.turns if self.turns else 0.0
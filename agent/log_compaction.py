@@ -0,0 +1,284 @@
+import glob
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = ds = pq = None
+    PYARROW_AVAILABLE = False
+
+from agent.log_files import FLOW_LOG_FILE, HONEYPOT_LOG_FILE
+
+LOG_ARCHIVE_DIR = os.getenv("HONEYPOT_LOG_ARCHIVE", "log_archive")
+ROW_GROUP_SIZE = 50_000
+UNKNOWN_DATE = "unknown"
+
+
+# ------------------------ Log Schemas ------------------------
+# Low-cardinality columns are dictionary-encoded: each distinct stage,
+# style or decision is stored once per row group and rows hold indices.
+def _schemas():
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return {
+        "honeypot": pa.schema([
+            ("timestamp", pa.timestamp("us")),
+            ("conversation_id", dictionary),
+            ("scammer_message", pa.string()),
+            ("honeypot_reply", pa.string()),
+            ("stage", dictionary),
+            ("score", pa.int32()),
+            ("frustration_level", pa.int32()),
+            ("scammer_style", dictionary),
+            ("scam_attempts", pa.string()),  # JSON; its keys vary per message
+            ("prompt_tokens", pa.int32()),
+            ("completion_tokens", pa.int32()),
+        ]),
+        "flow": pa.schema([
+            ("timestamp", pa.timestamp("us")),
+            ("conversation_id", dictionary),
+            ("scammer_message", pa.string()),
+            ("is_scam", pa.bool_()),
+            ("confidence", pa.float32()),
+            ("decision", dictionary),
+            ("honeypot_reply", pa.string()),
+            ("stage", dictionary),
+            ("scammer_style", dictionary),
+            ("conversation_score", pa.int32()),
+            ("scam_data", pa.string()),
+        ]),
+    }
+
+
+def _timestamp(value):
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def _honeypot_row(record):
+    return {
+        "timestamp": _timestamp(record.get("timestamp")),
+        "conversation_id": record.get("conversation_id"),
+        "scammer_message": record.get("scammer_message"),
+        "honeypot_reply": record.get("honeypot_reply"),
+        "stage": record.get("stage"),
+        "score": record.get("score"),
+        "frustration_level": record.get("frustration_level"),
+        "scammer_style": record.get("scammer_style"),
+        "scam_attempts": json.dumps(record.get("scam_attempts") or {}),
+        "prompt_tokens": record.get("prompt_tokens"),
+        "completion_tokens": record.get("completion_tokens"),
+    }
+
+
+def _flow_row(record):
+    fraud_result = record.get("fraud_result") or {}
+    return {
+        "timestamp": _timestamp(record.get("timestamp")),
+        "conversation_id": record.get("conversation_id"),
+        "scammer_message": record.get("scammer_message"),
+        "is_scam": fraud_result.get("is_scam"),
+        "confidence": fraud_result.get("confidence"),
+        "decision": fraud_result.get("decision"),
+        "honeypot_reply": record.get("honeypot_reply"),
+        "stage": record.get("stage"),
+        "scammer_style": record.get("scammer_style"),
+        "conversation_score": record.get("conversation_score"),
+        "scam_data": json.dumps(record.get("scam_data") or {}),
+    }
+
+
+# Log file -> (dataset name, row builder)
+LOG_KINDS = {
+    HONEYPOT_LOG_FILE: ("honeypot", _honeypot_row),
+    FLOW_LOG_FILE: ("flow", _flow_row),
+}
+LOG_KINDS_BY_NAME = {kind: builder for kind, builder in LOG_KINDS.values()}
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("Log compaction needs pyarrow: pip install pyarrow")
+
+
+# ------------------------ Segments ------------------------
+@contextmanager
+def _sink_lock(path: str):
+    """The flock JsonlLogSink holds while it writes or rotates path."""
+    lock_fd = os.open(f"{path}.lock", os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        if fcntl:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        if fcntl:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+        os.close(lock_fd)
+
+
+def _rotated_segments(path: str) -> list:
+    rotated = [p for p in glob.glob(f"{path}.[0-9]*") if p.rsplit(".", 1)[1].isdigit()]
+    rotated.sort(key=lambda p: int(p.rsplit(".", 1)[1]), reverse=True)
+    return rotated
+
+
+def cut_segment(path: str):
+    """
+    Closes the live log file by renaming it to path.seg-<time>, under the
+    same flock JsonlLogSink writes with. Sinks notice the new inode and
+    start a fresh file. Returns the segment path, or None if there was
+    nothing to cut.
+    """
+    with _sink_lock(path):
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        segment = f"{path}.seg-{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        os.replace(path, segment)
+        return segment
+
+
+def claim_segments(path: str, cut: bool = False) -> list:
+    """
+    Renames the rotated files (path.N ... path.1) and, only with cut=True,
+    the live file to path.seg-<time>-<n>, all under the sink's flock, and
+    returns every path.seg-* segment, oldest first. Once renamed, a
+    segment is ours: a sink rotating during compaction writes a fresh
+    path.1 instead of changing a file being compacted or deleted.
+    """
+    stamp = datetime.now().strftime('%Y%m%d%H%M%S%f')
+    with _sink_lock(path):
+        sources = _rotated_segments(path)
+        if cut and os.path.exists(path) and os.path.getsize(path) > 0:
+            sources.append(path)
+        for n, source in enumerate(sources):
+            os.replace(source, f"{path}.seg-{stamp}-{n:04d}")
+    return closed_segments(path)
+
+
+def closed_segments(path: str) -> list:
+    """Cut or claimed (path.seg-*) segments, oldest first."""
+    return sorted(glob.glob(f"{path}.seg-*"))
+
+
+def _segment_id(segment: str) -> str:
+    # Segments keep their .seg-<time> name until deleted, so a re-run
+    # (after a crash, or with keep=True) overwrites its own output instead
+    # of duplicating it. Inode, size and mtime are not unique enough:
+    # rotated files of one size, written within a second, reuse inodes.
+    return "seg-" + segment.rsplit(".seg-", 1)[1]
+
+
+def _iter_records(segment):
+    with open(segment, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a torn last line from a crash
+
+
+# ------------------------ Compaction ------------------------
+def compact_segment(segment: str, kind: str, archive_dir: str = LOG_ARCHIVE_DIR) -> int:
+    """
+    Writes one closed JSONL segment to
+    <archive_dir>/<kind>/date=YYYY-MM-DD/<segment id>-<n>.parquet
+    and returns the number of rows written.
+    """
+    _require_pyarrow()
+    schema = _schemas()[kind]
+    row_builder = LOG_KINDS_BY_NAME[kind]
+    segment_id = _segment_id(segment)
+
+    # Rows are buffered per date and flushed a row group at a time
+    buffers, parts = {}, {}
+    rows = 0
+
+    def flush(date):
+        table = pa.Table.from_pylist(buffers.pop(date), schema=schema)
+        out_dir = os.path.join(archive_dir, kind, f"date={date}")
+        os.makedirs(out_dir, exist_ok=True)
+        part = parts.get(date, 0)
+        parts[date] = part + 1
+        out = os.path.join(out_dir, f"{segment_id}-{part}.parquet")
+        tmp = f"{out}.tmp"
+        pq.write_table(table, tmp, compression="zstd", use_dictionary=True)
+        os.replace(tmp, out)
+
+    for record in _iter_records(segment):
+        row = row_builder(record)
+        date = row["timestamp"].date().isoformat() if row["timestamp"] else UNKNOWN_DATE
+        buffers.setdefault(date, []).append(row)
+        rows += 1
+        if len(buffers[date]) >= ROW_GROUP_SIZE:
+            flush(date)
+    for date in list(buffers):
+        flush(date)
+    return rows
+
+
+def compact_log(path: str, archive_dir: str = LOG_ARCHIVE_DIR, cut: bool = False, keep: bool = False) -> dict:
+    """
+    Compacts every closed segment of one log. Rotated files are claimed
+    first (see claim_segments()); the live file is left to its writers
+    unless cut=True, which closes it too so everything logged so far is
+    included. Segments are deleted once written unless keep=True.
+    """
+    _require_pyarrow()
+    kind = LOG_KINDS[os.path.basename(path)][0]
+    segments = claim_segments(path, cut=cut)
+
+    stats = {"log": path, "segments": 0, "rows": 0, "bytes_in": 0}
+    start = time.perf_counter()
+    for segment in segments:
+        size = os.path.getsize(segment)
+        stats["rows"] += compact_segment(segment, kind, archive_dir)
+        stats["segments"] += 1
+        stats["bytes_in"] += size
+        if not keep:
+            os.remove(segment)
+    stats["elapsed"] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+# ------------------------ Queries ------------------------
+def query_logs(kind: str, columns=None, start_date: str = None, end_date: str = None,
+               filter=None, archive_dir: str = LOG_ARCHIVE_DIR):
+    """
+    Reads compacted logs as a pyarrow Table. Only the requested columns
+    are decoded, and date partitions outside [start_date, end_date]
+    (inclusive, "YYYY-MM-DD") are never opened. filter is an extra
+    pyarrow.dataset expression, e.g. ds.field("is_scam") == True.
+    """
+    _require_pyarrow()
+    root = os.path.join(archive_dir, kind)
+    schema = _schemas()[kind]
+    if not os.path.isdir(root):
+        return schema.empty_table() if columns is None else schema.empty_table().select(columns)
+
+    partitioning = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+    dataset = ds.dataset(root, format="parquet", partitioning=partitioning, schema=schema.append(
+        pa.field("date", pa.string())
+    ))
+
+    expression = filter
+    for bound in ((ds.field("date") >= start_date) if start_date else None,
+                  (ds.field("date") <= end_date) if end_date else None):
+        if bound is not None:
+            expression = bound if expression is None else expression & bound
+    return dataset.to_table(columns=columns, filter=expression)
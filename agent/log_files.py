@@ -0,0 +1,5 @@
+# The JSONL logs the agents write. Kept apart from the agents so tools
+# that only read or compact the logs don't build an LLM backend or load
+# the fraud model just to learn a filename.
+HONEYPOT_LOG_FILE = "honeypot_logs.json"
+FLOW_LOG_FILE = "scam_flow_logs.json"
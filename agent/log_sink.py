@@ -0,0 +1,171 @@
+import atexit
+import json
+import os
+import threading
+from collections import deque
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+FSYNC_POLICIES = ("never", "flush", "always")
+
+
+# ------------------------ Buffered JSONL Sink ------------------------
+class JsonlLogSink:
+    """
+    Appends JSON records to a .jsonl file in batches.
+
+    Records go into an in-memory buffer and a background thread writes
+    them out when max_buffer records are waiting or every flush_interval
+    seconds, with a single write() per batch. Every write holds an
+    exclusive flock on "<path>.lock", so whole lines from several
+    processes never interleave.
+
+    fsync: "never"  - leave it to the OS
+           "flush"  - fsync after every batch
+           "always" - write and fsync each record before write() returns
+
+    With max_bytes set, the file is rotated to path.1 ... path.N
+    (backup_count) before a batch would push it past that size.
+    """
+
+    def __init__(self, path: str, max_buffer: int = 500, flush_interval: float = 1.0,
+                 fsync: str = "never", max_bytes: int = None, backup_count: int = 5):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+
+        self.path = os.path.abspath(path)
+        self.max_buffer = max_buffer
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        self._buffer = deque()
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._fd = None
+        self._lock_fd = None
+
+        self._thread = threading.Thread(
+            target=self._run, name=f"log-sink:{os.path.basename(path)}", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, record: dict):
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        if self.fsync == "always" or self._closed:
+            self._write_batch([line])
+            return
+
+        with self._buffer_lock:
+            self._buffer.append(line)
+            pending = len(self._buffer)
+        if pending >= self.max_buffer:
+            self._wakeup.set()
+        # Writers outrunning the flush thread write their own batch
+        if pending >= 4 * self.max_buffer:
+            self.flush()
+
+    def flush(self):
+        with self._buffer_lock:
+            if not self._buffer:
+                return
+            batch = list(self._buffer)
+            self._buffer.clear()
+        self._write_batch(batch)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
+        with self._write_lock:
+            for fd in (self._fd, self._lock_fd):
+                if fd is not None:
+                    os.close(fd)
+            self._fd = self._lock_fd = None
+
+    # ------------------------ Background Flush ------------------------
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"[Log sink ERROR] {self.path}: {e}")
+
+    # ------------------------ File Handling ------------------------
+    def _write_batch(self, lines):
+        data = b"".join(lines)
+        with self._write_lock:
+            if self._lock_fd is None:
+                self._lock_fd = os.open(f"{self.path}.lock", os.O_WRONLY | os.O_CREAT, 0o644)
+            if fcntl:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                self._ensure_current_file()
+                if self.max_bytes and os.fstat(self._fd).st_size + len(data) > self.max_bytes:
+                    self._rotate()
+                os.write(self._fd, data)
+                if self.fsync != "never":
+                    os.fsync(self._fd)
+            finally:
+                if fcntl:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _open(self):
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _ensure_current_file(self):
+        # Another process may have rotated the file since we opened it
+        if self._fd is not None:
+            try:
+                if os.stat(self.path).st_ino == os.fstat(self._fd).st_ino:
+                    return
+            except FileNotFoundError:
+                pass
+            os.close(self._fd)
+        self._open()
+
+    def _rotate(self):
+        os.close(self._fd)
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.truncate(self.path, 0)
+        self._open()
+
+
+# ------------------------ Shared Sinks ------------------------
+_sinks = {}
+_sinks_lock = threading.Lock()
+
+
+def get_sink(path: str, **kwargs) -> JsonlLogSink:
+    """One sink per file per process; kwargs only apply when it's first created."""
+    key = os.path.abspath(path)
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None:
+            sink = _sinks[key] = JsonlLogSink(path, **kwargs)
+        return sink
+
+
+@atexit.register
+def close_all():
+    with _sinks_lock:
+        sinks = list(_sinks.values())
+    for sink in sinks:
+        sink.close()
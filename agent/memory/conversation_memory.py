@@ -1,15 +1,143 @@
+import re
+from collections import deque
+from itertools import islice
+
+from agent.prompt_template import CHARS_PER_TOKEN
+
+_FIRST_SENTENCE = re.compile(r"^(.+?[.!?])(?:\s|$)")
+SUMMARY_CLAUSE_CHARS = 80
+
+
+def summarize_turn(role: str, content: str) -> str:
+    """Default rolling summarizer: the first sentence of a scammer turn, clipped."""
+    if role != "scammer":
+        return ""  # our own replies add nothing the scammer's side doesn't
+    match = _FIRST_SENTENCE.match(content.strip())
+    clause = match.group(1) if match else content.strip()
+    if len(clause) > SUMMARY_CLAUSE_CHARS:
+        clause = clause[:SUMMARY_CLAUSE_CHARS - 3].rstrip() + "..."
+    return clause
+
+
+# ------------------------ Conversation Memory ------------------------
 class ConversationMemory:
-    def __init__(self, max_memory=8):
+    """
+    Fixed-capacity ring buffer of (role, content) turns.
+
+    Turns are rendered to "Role: content" once, when added, and append
+    and eviction are O(1). The last `window` lines are also kept joined,
+    so the usual prompt window costs nothing to render when it fits the
+    budget.
+
+    With summary_chars > 0, turns that leave the window are folded into
+    a rolling summary of at most summary_chars, oldest clauses dropped
+    first, so long engagements keep some context without the prompt
+    growing.
+    """
+
+    __slots__ = (
+        "max_memory", "history", "_lines", "window", "_window_lines", "_window_text",
+        "summary_chars", "summarizer", "_summary", "_summary_len",
+    )
+
+    def __init__(self, max_memory=8, window=6, summary_chars=0, summarizer=summarize_turn):
         self.max_memory = max_memory
-        self.history = []
+        self.history = deque(maxlen=max_memory)
+        self._lines = deque(maxlen=max_memory)  # "Role: content", rendered once when the turn is added
+
+        # The last `window` lines, kept joined and updated as turns come and go
+        self.window = min(window, max_memory)
+        self._window_lines = deque(maxlen=self.window)
+        self._window_text = ""
+
+        self.summary_chars = summary_chars
+        self.summarizer = summarizer
+        self._summary = deque()
+        self._summary_len = 0
+
+    def __len__(self):
+        return len(self.history)
 
     def add(self, role, content):
+        line = f"{role.capitalize()}: {content}"
+        if self.window and len(self._window_lines) == self.window:
+            # The oldest turn in the window is about to leave it
+            if self.summary_chars:
+                self._summarize(*self.history[-self.window])
+            self._window_text = self._window_text[len(self._window_lines[0]) + 1:]
+
         self.history.append((role, content))
-        self.history = self.history[-self.max_memory:]
+        self._lines.append(line)
+        if self.window:
+            self._window_lines.append(line)
+            self._window_text = f"{self._window_text}\n{line}" if self._window_text else line
+
+    # ------------------------ Rolling Summary ------------------------
+    def _summarize(self, role, content):
+        clause = self.summarizer(role, content)
+        if not clause or clause in self._summary:
+            return  # scammers repeat themselves; one mention is enough
+        self._summary.append(clause)
+        self._summary_len += len(clause) + 2
+        while self._summary_len > self.summary_chars and len(self._summary) > 1:
+            self._summary_len -= len(self._summary.popleft()) + 2
+
+    @property
+    def summary(self) -> str:
+        return "; ".join(self._summary)
+
+    def summary_clauses(self) -> list:
+        return list(self._summary)
+
+    def restore_summary(self, clauses):
+        """Reloads clauses saved with summary_clauses(), e.g. from a spilled session."""
+        self._summary = deque(clauses)
+        self._summary_len = sum(len(clause) + 2 for clause in self._summary)
+
+    # ------------------------ Rendering ------------------------
+    def render(self, last_n=4, max_chars=None, max_tokens=None, include_summary=False):
+        """
+        The last last_n turns, one per line. With a max_chars or max_tokens
+        budget only the most recent turns that fit are kept (at least one,
+        clipped if it is too long on its own). include_summary prefixes
+        the rolling summary of evicted turns, within the same budget.
+        """
+        if max_tokens is not None:
+            max_chars = max_tokens * CHARS_PER_TOKEN
+        summary = f"Earlier: {self.summary}" if include_summary and self._summary else ""
+
+        if max_chars is None:
+            if last_n == self.window:
+                text = self._window_text
+            else:
+                text = "\n".join(islice(self._lines, max(0, len(self._lines) - last_n), None)) if last_n > 0 else ""
+            return f"{summary}\n{text}" if summary and text else summary or text
 
-    def render(self, last_n=4):
-        items = self.history[-last_n:]
-        return "\n".join(f"{r.capitalize()}: {c}" for r, c in items)
+        if last_n == self.window and len(self._window_text) <= max_chars:
+            # The whole window fits: no need to walk the turns
+            text = self._window_text
+            used = len(text)
+        else:
+            lines = []
+            used = 0
+            for line in islice(reversed(self._lines), max(0, last_n)):
+                cost = len(line) + (1 if lines else 0)
+                if used + cost > max_chars:
+                    if not lines:
+                        lines.append(line[:max_chars])
+                        used = max_chars
+                    break
+                lines.append(line)
+                used += cost
+            text = "\n".join(reversed(lines))
+        if summary and used + len(summary) + 1 <= max_chars:
+            return f"{summary}\n{text}" if text else summary
+        return text
 
     def clear(self):
-        self.history = []
+        self.history.clear()
+        self._lines.clear()
+        self._window_lines.clear()
+        self._window_text = ""
+        self._summary.clear()
+        self._summary_len = 0
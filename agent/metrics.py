@@ -0,0 +1,246 @@
+import bisect
+import json
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# HONEYPOT_METRICS=0 turns every timer and counter into a no-op
+METRICS_ENABLED = os.getenv("HONEYPOT_METRICS", "1") != "0"
+# Optional exporters, started by start_exporters()
+METRICS_PORT = os.getenv("HONEYPOT_METRICS_PORT")
+METRICS_JSON_PATH = os.getenv("HONEYPOT_METRICS_JSON")
+METRICS_DUMP_INTERVAL = float(os.getenv("HONEYPOT_METRICS_DUMP_INTERVAL", "10"))
+
+# Seconds; Prometheus' default latency buckets widened at both ends for
+# sub-millisecond keyword stages and slow LLM calls
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+# ------------------------ Histogram ------------------------
+class Histogram:
+    """Fixed-bucket latency histogram, like a Prometheus histogram."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimated by linear interpolation inside the bucket, as histogram_quantile() does."""
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for i, n in enumerate(counts):
+            if seen + n >= rank and n:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50": round(self.quantile(0.50), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "p99": round(self.quantile(0.99), 6),
+        }
+
+
+# ------------------------ Timers ------------------------
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+# ------------------------ Registry ------------------------
+class MetricsRegistry:
+    """
+    In-process stage timers and counters.
+
+        with metrics.timer("vectorize"):
+            ...
+        metrics.inc("llm_errors")
+
+    Each timer name is one stage of the honeypot_stage_seconds histogram.
+    When disabled, timer() hands back a shared no-op context manager and
+    inc() returns straight away, so instrumented code costs a method call.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED, prefix: str = "honeypot"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage: str) -> Histogram:
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, Histogram())
+        return histogram
+
+    def timer(self, stage: str):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self.histogram(stage))
+
+    def observe(self, stage: str, seconds: float):
+        if self.enabled:
+            self.histogram(stage).observe(seconds)
+
+    def inc(self, name: str, value: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    # ------------------------ Export ------------------------
+    def snapshot(self) -> dict:
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+        return {
+            "timestamp": time.time(),
+            "stages": {stage: h.summary() for stage, h in sorted(histograms.items())},
+            "counters": dict(sorted(counters.items())),
+        }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+
+        name = f"{self.prefix}_stage_seconds"
+        lines = [f"# HELP {name} Time spent in each pipeline stage.", f"# TYPE {name} histogram"]
+        for stage, h in sorted(histograms.items()):
+            with h._lock:
+                counts, total, h_sum = list(h.counts), h.count, h.sum
+            cumulative = 0
+            for bound, n in zip(h.buckets, counts):
+                cumulative += n
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {total}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {h_sum}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {total}')
+
+        for counter, value in sorted(counters.items()):
+            counter_name = f"{self.prefix}_{counter}_total"
+            lines.append(f"# TYPE {counter_name} counter")
+            lines.append(f"{counter_name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def dump_json(self, path: str):
+        # Write-then-rename so readers never see a half-written file
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+
+    def start_json_dumper(self, path: str, interval: float = METRICS_DUMP_INTERVAL) -> threading.Thread:
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.dump_json(path)
+                except OSError as e:
+                    print(f"[Metrics ERROR] {path}: {e}")
+
+        thread = threading.Thread(target=run, name="metrics-json-dump", daemon=True)
+        thread.start()
+        return thread
+
+    def start_http_server(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serves GET /metrics (Prometheus text) and GET /metrics.json."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = registry.render_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = json.dumps(registry.snapshot()), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+
+metrics = MetricsRegistry()
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def start_exporters():
+    """Start the exporters configured through the environment, once per process."""
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started or not metrics.enabled:
+            return
+        _exporters_started = True
+    if METRICS_PORT:
+        metrics.start_http_server(int(METRICS_PORT))
+        print(f"📈 Metrics at http://127.0.0.1:{METRICS_PORT}/metrics")
+    if METRICS_JSON_PATH:
+        metrics.start_json_dumper(METRICS_JSON_PATH)
+        print(f"📈 Metrics dumped to {METRICS_JSON_PATH} every {METRICS_DUMP_INTERVAL:g}s")
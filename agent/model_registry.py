@@ -0,0 +1,53 @@
+import os
+import threading
+
+import joblib
+
+# Resolved from the package location, not the working directory
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.getenv(
+    "FRAUD_MODELS_DIR", os.path.join(os.path.dirname(PACKAGE_DIR), "models")
+)
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of read-only model artifacts.
+    Each artifact is loaded lazily on first use, exactly once, even when
+    several threads ask for it at the same time. Every agent gets the
+    same object back, so they must not mutate it.
+    """
+
+    def __init__(self, models_dir: str = MODELS_DIR):
+        self.models_dir = models_dir
+        self._artifacts = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.models_dir, name)
+
+    def get(self, name: str, loader=joblib.load):
+        artifact = self._artifacts.get(name)
+        if artifact is not None:
+            return artifact
+
+        # One lock per artifact so a slow load doesn't block the others
+        with self._guard:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            artifact = self._artifacts.get(name)
+            if artifact is None:
+                artifact = loader(self.path(name))
+                self._artifacts[name] = artifact
+        return artifact
+
+    def loaded(self) -> list:
+        return list(self._artifacts)
+
+    def clear(self):
+        with self._guard:
+            self._artifacts.clear()
+
+
+registry = ModelRegistry()
@@ -0,0 +1,51 @@
+from string import Formatter
+
+# Rough tokens-per-character ratio for Llama-style BPE on English chat
+# text. Close enough to bound prompt size and budget cost without a
+# tokenizer dependency.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+# ------------------------ Precompiled Prompt Template ------------------------
+class PromptTemplate:
+    """
+    A str.format-style template parsed once into literal chunks and
+    field names. Fields passed as static values are baked into the
+    literals at compile time, so render() only joins the per-turn values
+    between precomputed chunks.
+
+        template = PromptTemplate("Hi {name}, you are {role}.", role="a victim")
+        template.render(name="Sam")
+    """
+
+    def __init__(self, template: str, **static):
+        self.fields = []
+        chunks = [""]
+        for literal, field, spec, conversion in Formatter().parse(template):
+            chunks[-1] += literal
+            if field is None:
+                continue
+            if spec or conversion:
+                raise ValueError(f"Format specs are not supported: {{{field}}}")
+            if field in static:
+                chunks[-1] += str(static[field])
+            else:
+                self.fields.append(field)
+                chunks.append("")
+        self.chunks = chunks
+        self.static_chars = sum(len(chunk) for chunk in chunks)
+
+    def length(self, **values) -> int:
+        """Length render() would produce; fields not given count as empty."""
+        return self.static_chars + sum(len(str(values[field])) for field in self.fields if field in values)
+
+    def render(self, **values) -> str:
+        parts = [self.chunks[0]]
+        for field, chunk in zip(self.fields, self.chunks[1:]):
+            parts.append(str(values[field]))
+            parts.append(chunk)
+        return "".join(parts)
@@ -0,0 +1,177 @@
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from agent.indicators import extract_indicators
+from agent.metrics import metrics
+
+REPLY_CACHE_ENABLED = os.getenv("HONEYPOT_REPLY_CACHE", "1") != "0"
+REPLY_CACHE_SIZE = int(os.getenv("HONEYPOT_REPLY_CACHE_SIZE", "5000"))
+REPLY_CACHE_TTL = float(os.getenv("HONEYPOT_REPLY_CACHE_TTL", "3600"))
+# Chance a cached reply is reused; otherwise the LLM is asked again and
+# the fresh reply replaces it, so repeat scripts don't get canned answers
+REPLY_CACHE_REUSE = float(os.getenv("HONEYPOT_REPLY_CACHE_REUSE", "0.7"))
+# Optional SQLite file shared across restarts and worker processes
+REPLY_CACHE_DB = os.getenv("HONEYPOT_REPLY_CACHE_DB") or None
+
+_WHITESPACE = re.compile(r"\s+")
+_DIGITS = re.compile(r"\d+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS replies (
+    key TEXT PRIMARY KEY,
+    reply TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+
+def normalize_message(message: str, indicators=None) -> str:
+    """
+    Lowercased scammer message with indicators replaced by their type,
+    so the same script with a different UPI id, link or phone number
+    normalizes to the same text.
+    """
+    parts = []
+    last = 0
+    if indicators is None:
+        indicators = extract_indicators(message)
+    for indicator in sorted(indicators, key=lambda i: i.start):
+        if indicator.start < last:
+            continue
+        parts.append(message[last:indicator.start])
+        parts.append(f"<{indicator.type}>")
+        last = indicator.end
+    parts.append(message[last:])
+    text = _DIGITS.sub("#", "".join(parts).lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def fingerprint(persona: str, stage: str, style: str, message: str, trap: str, indicators=None) -> str:
+    """Cache key for a reply; indicators, if given, are the message's already-extracted ones."""
+    key = "\x1f".join((persona or "", stage or "", style or "", normalize_message(message, indicators), trap or ""))
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# ------------------------ Reply Cache ------------------------
+class ReplyCache:
+    """
+    LRU cache of sanitized honeypot replies with a TTL.
+
+    Entries live in an OrderedDict, most recently used last. With a path,
+    entries are also written to SQLite and memory misses fall back to it,
+    so a restarted or sibling process starts warm.
+
+    get() returns None on a miss, an expired entry, or when the reuse
+    draw says to ask the LLM anyway; stats() reports each outcome.
+    """
+
+    def __init__(self, max_entries: int = REPLY_CACHE_SIZE, ttl: float = REPLY_CACHE_TTL,
+                 reuse_probability: float = REPLY_CACHE_REUSE, path: str = REPLY_CACHE_DB,
+                 rng: random.Random = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.reuse_probability = reuse_probability
+        self.path = path
+        self._rng = rng or random.Random()
+        self._entries = OrderedDict()  # key -> (reply, expires)
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.refreshes = 0
+
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, key: str, now: float):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif self._conn is not None:
+            row = self._conn.execute("SELECT reply, expires FROM replies WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                entry = self._store(key, *row)
+        if entry is not None and entry[1] <= now:
+            self._entries.pop(key, None)
+            entry = None
+        return entry
+
+    def _store(self, key: str, reply: str, expires: float):
+        entry = self._entries[key] = (reply, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._lookup(key, time.time())
+            if entry is None:
+                self.misses += 1
+                outcome = "miss"
+            elif self._rng.random() >= self.reuse_probability:
+                self.refreshes += 1
+                entry = None
+                outcome = "refresh"
+            else:
+                self.hits += 1
+                outcome = "hit"
+        metrics.inc(f"reply_cache_{outcome}")
+        return entry[0] if entry else None
+
+    def put(self, key: str, reply: str):
+        expires = time.time() + self.ttl
+        with self._lock:
+            self._store(key, reply, expires)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO replies (key, reply, expires) VALUES (?, ?, ?)",
+                        (key, reply, expires),
+                    )
+
+    def purge_expired(self) -> int:
+        """Drops expired entries from memory and disk; returns how many were in memory."""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (_, expires) in self._entries.items() if expires <= now]
+            for key in expired:
+                del self._entries[key]
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM replies WHERE expires <= ?", (now,))
+        return len(expired)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.refreshes
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.refreshes = 0
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM replies")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
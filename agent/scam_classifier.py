@@ -1,33 +1,38 @@
-import re
+from agent.keyword_matcher import KeywordMatcher
 
 
 class ScamClassifier:
-    def classify(self, message: str) -> str:
-        msg = message.lower()
+    # Checked in order; the first scam type with a keyword hit wins
+    patterns = {
+        "bank_scam": [
+            "bank", "kyc", "account", "upi", "blocked", "verify"
+        ],
+        "prize_scam": [
+            "won", "prize", "lottery", "reward", "gift"
+        ],
+        "job_scam": [
+            "job", "hiring", "salary", "interview"
+        ],
+        "tech_support": [
+            "virus", "support", "technical", "computer"
+        ],
+        "investment_scam": [
+            "investment", "crypto", "profit", "trading"
+        ],
+        "otp_scam": [
+            "otp", "code", "verification"
+        ],
+    }
 
-        patterns = {
-            "bank_scam": [
-                "bank", "kyc", "account", "upi", "blocked", "verify"
-            ],
-            "prize_scam": [
-                "won", "prize", "lottery", "reward", "gift"
-            ],
-            "job_scam": [
-                "job", "hiring", "salary", "interview"
-            ],
-            "tech_support": [
-                "virus", "support", "technical", "computer"
-            ],
-            "investment_scam": [
-                "investment", "crypto", "profit", "trading"
-            ],
-            "otp_scam": [
-                "otp", "code", "verification"
-            ],
-        }
+    matcher = KeywordMatcher(patterns)
 
-        for scam_type, keywords in patterns.items():
-            if any(word in msg for word in keywords):
+    def classify(self, message: str, hits: dict = None) -> str:
+        # hits can be passed in when the message was already scanned
+        if hits is None:
+            hits = self.matcher.scan(message)
+
+        for scam_type in self.patterns:
+            if scam_type in hits:
                 return scam_type
 
         return "unknown"
@@ -1,42 +1,66 @@
 import requests
+import asyncio
 import json
 from datetime import datetime
 from .fraud_agent import FraudDetectionAgent
-from .llm_honeypot_agent import LLMHoneypotAgent
+from .llm_honeypot_agent import HoneypotReply, LLMHoneypotAgent
+from .log_files import FLOW_LOG_FILE
+from .log_sink import get_sink
+from .metrics import metrics, start_exporters
+from .scam_pipeline import ScamFlowPipeline
+from .session_manager import DEFAULT_CONVERSATION_ID
 
 MOCK_SCAMMER_API = "http://localhost:5000/mock_scammer"  # Same as in honeypot
+MOCK_SCAMMER_STREAM_API = "http://localhost:5000/generate_stream"
 
 class ScamFlowController:
     def __init__(self):
         self.fraud_agent = FraudDetectionAgent()
         self.honeypot_agent = LLMHoneypotAgent()
+        self.log_sink = get_sink(FLOW_LOG_FILE)
+        start_exporters()
         print("🚦 Scam Flow Controller Initialized\n")
 
-    def process_message(self, message: str):
+    def process_message(self, message: str, conversation_id: str = DEFAULT_CONVERSATION_ID):
         # ----------------------
         # Step 1: Fraud detection
         # ----------------------
-        fraud_result = self.fraud_agent.analyze(message)
+        with metrics.timer("fraud_check"):
+            fraud_result = self.fraud_agent.analyze(message)
         print(f"[Fraud Check] Scam: {fraud_result['is_scam']} | Confidence: {fraud_result['confidence']}")
 
+        # ----------------------
+        # Step 2: Engage honeypot
+        # ----------------------
+        reply = None
         if fraud_result["is_scam"]:
-            # ----------------------
-            # Step 2: Engage honeypot
-            # ----------------------
-            honeypot_reply_str = self.honeypot_agent.reply(message)  # Returns string
+            reply = self.honeypot_agent.reply(message, conversation_id)  # Returns HoneypotReply
+
+        result_json = self.build_result(message, conversation_id, fraud_result, reply)
+
+        # Save to unified log file (buffered, flushed in batches)
+        with metrics.timer("log_write"):
+            self.log_sink.write(result_json)
+        metrics.inc("messages_processed")
+
+        return result_json
 
-            # Wrap string reply in dict to match expected keys
+    def build_result(self, message: str, conversation_id: str, fraud_result: dict, reply: HoneypotReply = None):
+        if fraud_result["is_scam"]:
+            # Stage, style and score come from the reply's own snapshot; the
+            # live session may already be on the conversation's next turn
             honeypot_result = {
-                "reply": honeypot_reply_str,
+                "reply": str(reply) if reply is not None else None,
                 "scam_data": {},  # Optional: honeypot can extract scam data here if needed
-                "stage": self.honeypot_agent.stage,
-                "scammer_style": self.honeypot_agent.scammer_style,
-                "conversation_score": self.honeypot_agent.conversation_score
+                "stage": getattr(reply, "stage", None),
+                "scammer_style": getattr(reply, "scammer_style", None),
+                "conversation_score": getattr(reply, "conversation_score", 0)
             }
 
             # Combine everything into one JSON
-            result_json = {
+            return {
                 "timestamp": datetime.now().isoformat(),
+                "conversation_id": conversation_id,
                 "scammer_message": message,
                 "fraud_result": fraud_result,
                 "honeypot_reply": honeypot_result["reply"],
@@ -45,47 +69,98 @@ class ScamFlowController:
                 "scammer_style": honeypot_result["scammer_style"],
                 "conversation_score": honeypot_result["conversation_score"]
             }
-        else:
-            # Non-scam message
-            result_json = {
-                "timestamp": datetime.now().isoformat(),
-                "scammer_message": message,
-                "fraud_result": fraud_result,
-                "honeypot_reply": None,
-                "scam_data": {},
-                "stage": None,
-                "scammer_style": None,
-                "conversation_score": 0
-            }
 
-        # Save to unified log file
-        with open("scam_flow_logs.json", "a", encoding="utf-8") as f:
-            f.write(json.dumps(result_json) + "\n")
-
-        return result_json
+        # Non-scam message
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "conversation_id": conversation_id,
+            "scammer_message": message,
+            "fraud_result": fraud_result,
+            "honeypot_reply": None,
+            "scam_data": {},
+            "stage": None,
+            "scammer_style": None,
+            "conversation_score": 0
+        }
 
     # ------------------------
-    # Autonomous loop fetching messages
+    # Mock scammer ingest
     # ------------------------
-    def run_autonomous(self):
-        print("🤖 Starting autonomous scam monitoring...\n")
-        while True:
+    def fetch_message(self):
+        """One (conversation_id, message) from the mock scammer API; None when it runs dry."""
+        resp = requests.get(MOCK_SCAMMER_API, timeout=10)
+        resp.raise_for_status()
+        data = resp.json()
+        msg = data.get("message", "")
+        if not msg:
+            return None
+        return data.get("conversation_id", DEFAULT_CONVERSATION_ID), msg
+
+    def stream_messages(self, count: int, seed: int = None, conversations: int = 1):
+        """
+        Yields (conversation_id, message) from the mock scammer's NDJSON
+        stream as lines arrive, instead of one GET per message.
+        """
+        params = {"count": count, "conversations": conversations}
+        if seed is not None:
+            params["seed"] = seed
+        with requests.get(MOCK_SCAMMER_STREAM_API, params=params, stream=True, timeout=10) as resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                yield data.get("conversation_id", DEFAULT_CONVERSATION_ID), data["message"]
+
+    def stream_ingest(self, count: int, seed: int = None, conversations: int = 1):
+        """
+        Ingest callable for run_autonomous() backed by stream_messages().
+
+        A stream that breaks mid-way raises, so the pipeline backs off and
+        retries; the next call opens a new stream for the messages still
+        owed. A seeded stream is replayed past the ones already delivered
+        (same messages, same order); an unseeded one asks for the rest.
+        """
+        delivered = 0
+        stream = None
+        skip = 0
+
+        def ingest():
+            nonlocal delivered, stream, skip
+            if delivered >= count:
+                return None
+            if stream is None:
+                if seed is not None:
+                    stream = self.stream_messages(count, seed=seed, conversations=conversations)
+                    skip = delivered
+                else:
+                    stream = self.stream_messages(count - delivered, conversations=conversations)
             try:
-                # Fetch a message from the mock scammer API
-                resp = requests.get(MOCK_SCAMMER_API, timeout=10)
-                msg = resp.json().get("message", "")
+                item = next(stream, None)
+                while skip and item is not None:
+                    skip -= 1
+                    item = next(stream, None)
             except Exception:
-                print("[!] Error fetching message. Retrying...")
-                continue
+                stream = None
+                raise
+            if item is not None:
+                delivered += 1
+            return item
 
-            if not msg:
-                # No more messages
-                break
+        return ingest
 
-            print("Scammer:", msg)
-            result = self.process_message(msg)
-            print("Honeypot Reply:", result.get("honeypot_reply"))
-            print("-" * 60)
+    # ------------------------
+    # Autonomous pipeline fetching messages
+    # ------------------------
+    def run_autonomous(self, ingest=None, **pipeline_options):
+        """
+        Runs the staged pipeline (ingest -> fraud scoring -> LLM reply -> log)
+        until the ingest source runs dry. pipeline_options are passed to
+        ScamFlowPipeline (queue depths, worker counts, backoff).
+        """
+        print("🤖 Starting autonomous scam monitoring...\n")
+        pipeline = ScamFlowPipeline(self, ingest or self.fetch_message, **pipeline_options)
+        return asyncio.run(pipeline.run())
 
 # ------------------------
 # Run controller
@@ -0,0 +1,147 @@
+import asyncio
+import random
+import time
+
+from .metrics import metrics
+
+_STOP = object()
+
+
+# ------------------------ Staged Scam-Flow Pipeline ------------------------
+class ScamFlowPipeline:
+    """
+    Streaming version of ScamFlowController.process_message:
+
+      ingest -> fraud scoring -> LLM reply -> log
+
+    Stages are connected by bounded queues, so a slow stage pushes back
+    on the ones before it instead of buffering without limit.
+
+    - ingest: calls ingest() in a thread; it returns (conversation_id,
+      message), or None when the source is exhausted. Failures are
+      retried with jittered exponential backoff.
+    - scoring: takes whatever is queued (up to score_batch) and scores it
+      with one FraudDetectionAgent.analyze_many() call.
+    - reply: reply_workers concurrent LLMHoneypotAgent.areply() calls, so
+      the LLM is kept busy instead of waited on one message at a time.
+    - log: writes the result JSON to the controller's log sink.
+    """
+
+    def __init__(self, controller, ingest, queue_depth: int = 100,
+                 score_workers: int = 1, score_batch: int = 64,
+                 reply_workers: int = 8, log_workers: int = 1,
+                 backoff_initial: float = 0.5, backoff_max: float = 30.0,
+                 max_ingest_failures: int = None, verbose: bool = True):
+        self.controller = controller
+        self.ingest = ingest
+        self.queue_depth = queue_depth
+        self.score_workers = score_workers
+        self.score_batch = score_batch
+        self.reply_workers = reply_workers
+        self.log_workers = log_workers
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.max_ingest_failures = max_ingest_failures
+        self.verbose = verbose
+
+        self.stats = {"ingested": 0, "scored": 0, "replied": 0, "logged": 0, "ingest_errors": 0}
+
+    async def run(self) -> dict:
+        started = time.perf_counter()
+        score_q = asyncio.Queue(self.queue_depth)
+        reply_q = asyncio.Queue(self.queue_depth)
+        log_q = asyncio.Queue(self.queue_depth)
+
+        # Each stage sends one stop marker per downstream worker when it is done
+        async def stage(workers, count, next_q, next_count):
+            await asyncio.gather(*(workers() for _ in range(count)))
+            if next_q is not None:
+                for _ in range(next_count):
+                    await next_q.put(_STOP)
+
+        await asyncio.gather(
+            stage(lambda: self._ingest_worker(score_q), 1, score_q, self.score_workers),
+            stage(lambda: self._score_worker(score_q, reply_q, log_q), self.score_workers,
+                  reply_q, self.reply_workers),
+            stage(lambda: self._reply_worker(reply_q, log_q), self.reply_workers,
+                  log_q, self.log_workers),
+            stage(lambda: self._log_worker(log_q), self.log_workers, None, 0),
+        )
+
+        self.stats["elapsed"] = round(time.perf_counter() - started, 3)
+        return self.stats
+
+    # ------------------------ Stages ------------------------
+    async def _ingest_worker(self, out_q):
+        failures = 0
+        delay = self.backoff_initial
+        while True:
+            try:
+                item = await asyncio.to_thread(self.ingest)
+            except Exception as e:
+                failures += 1
+                self.stats["ingest_errors"] += 1
+                if self.max_ingest_failures is not None and failures >= self.max_ingest_failures:
+                    print(f"[!] Ingest failed {failures} times in a row, stopping: {e}")
+                    return
+                wait = random.uniform(0, delay)
+                print(f"[!] Error fetching message ({e}). Retrying in {wait:.1f}s...")
+                await asyncio.sleep(wait)
+                delay = min(delay * 2, self.backoff_max)
+                continue
+
+            failures = 0
+            delay = self.backoff_initial
+            if item is None:
+                return
+            self.stats["ingested"] += 1
+            await out_q.put(item)
+
+    async def _score_worker(self, in_q, reply_q, log_q):
+        while True:
+            # Whatever is already queued, without waiting for a full batch
+            batch = [await in_q.get()]
+            while batch[-1] is not _STOP and len(batch) < self.score_batch and not in_q.empty():
+                batch.append(in_q.get_nowait())
+
+            stop = batch[-1] is _STOP
+            if stop:
+                batch.pop()
+            if batch:
+                messages = [message for _, message in batch]
+                results = await asyncio.to_thread(
+                    lambda: list(self.controller.fraud_agent.analyze_many(messages))
+                )
+                self.stats["scored"] += len(results)
+                for (conversation_id, message), fraud_result in zip(batch, results):
+                    if fraud_result["is_scam"]:
+                        await reply_q.put((conversation_id, message, fraud_result))
+                    else:
+                        await log_q.put(self.controller.build_result(message, conversation_id, fraud_result))
+            if stop:
+                return
+
+    async def _reply_worker(self, in_q, log_q):
+        agent = self.controller.honeypot_agent
+        while True:
+            item = await in_q.get()
+            if item is _STOP:
+                return
+            conversation_id, message, fraud_result = item
+            reply = await agent.areply(message, conversation_id)
+            self.stats["replied"] += 1
+            await log_q.put(self.controller.build_result(message, conversation_id, fraud_result, reply))
+
+    async def _log_worker(self, in_q):
+        while True:
+            result = await in_q.get()
+            if result is _STOP:
+                return
+            with metrics.timer("log_write"):
+                self.controller.log_sink.write(result)
+            self.stats["logged"] += 1
+            metrics.inc("messages_processed")
+            if self.verbose:
+                print("Scammer:", result["scammer_message"])
+                print("Honeypot Reply:", result["honeypot_reply"])
+                print("-" * 60)
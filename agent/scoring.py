@@ -0,0 +1,40 @@
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.5
+
+
+class LinearScorer:
+    """
+    Scores vectors straight from a binary linear model's coefficients.
+    One decision value per message gives both the label and the
+    probability, so the model is only evaluated once.
+    """
+
+    def __init__(self, coef, intercept, threshold: float = DEFAULT_THRESHOLD):
+        if not 0.0 < threshold < 1.0:
+            raise ValueError("threshold must be between 0 and 1")
+
+        self.coef = np.asarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(np.asarray(intercept).ravel()[0])
+        self.threshold = threshold
+        # Compare in decision space: p > t  <=>  d > logit(t)
+        self.decision_threshold = float(np.log(threshold / (1.0 - threshold)))
+
+    @classmethod
+    def from_model(cls, model, threshold: float = DEFAULT_THRESHOLD):
+        if len(model.classes_) != 2 or list(model.classes_) != [0, 1]:
+            raise ValueError("LinearScorer expects a binary model with classes [0, 1]")
+        return cls(model.coef_, model.intercept_, threshold=threshold)
+
+    def decision_function(self, vectors):
+        return np.asarray(vectors @ self.coef).ravel() + self.intercept
+
+    def score_decisions(self, decisions):
+        """Return (predictions, probabilities) for raw decision values."""
+        decisions = np.asarray(decisions, dtype=np.float64)
+        probabilities = 1.0 / (1.0 + np.exp(-decisions))
+        predictions = (decisions > self.decision_threshold).astype(np.int64)
+        return predictions, probabilities
+
+    def score(self, vectors):
+        return self.score_decisions(self.decision_function(vectors))
@@ -0,0 +1,220 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+from agent.memory.conversation_memory import ConversationMemory
+
+DEFAULT_CONVERSATION_ID = "default"
+# Where the agent's default session manager spills evicted conversations,
+# so they resume after eviction; empty keeps everything in memory only
+SESSION_SPILL_DIR = os.getenv("HONEYPOT_SESSION_SPILL_DIR", "sessions")
+# Size of the rolling summary of turns evicted from memory; 0 disables it
+MEMORY_SUMMARY_CHARS = int(os.getenv("HONEYPOT_MEMORY_SUMMARY_CHARS", "240"))
+
+
+# ------------------------ Per-Conversation State ------------------------
+class ConversationState:
+    """Everything the honeypot remembers about one scammer conversation."""
+
+    __slots__ = (
+        "conversation_id", "stage", "memory", "persona_name", "persona_prompt",
+        "scammer_style", "conversation_score", "dynamic_memory", "last_active",
+        "prompt_tokens", "completion_tokens"
+    )
+
+    def __init__(self, conversation_id: str, max_memory: int = 12):
+        self.conversation_id = conversation_id
+        self.stage = "initial"
+        self.memory = ConversationMemory(max_memory=max_memory, summary_chars=MEMORY_SUMMARY_CHARS)
+        self.persona_name = None
+        self.persona_prompt = None
+        self.scammer_style = "unknown"
+        self.conversation_score = 0
+        self.dynamic_memory = {
+            "otp_requests": 0,
+            "payment_requests": 0,
+            "trust_attempts": 0,
+            "last_traps_used": [],
+            "scammer_style_history": [],
+            "frustration_level": 0
+        }
+        self.last_active = time.time()
+        # Estimated LLM tokens spent on this conversation so far
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "conversation_id": self.conversation_id,
+            "stage": self.stage,
+            "memory": {
+                "max_memory": self.memory.max_memory,
+                "history": [list(item) for item in self.memory.history],
+                "summary": self.memory.summary_clauses(),
+            },
+            "persona_name": self.persona_name,
+            "persona_prompt": self.persona_prompt,
+            "scammer_style": self.scammer_style,
+            "conversation_score": self.conversation_score,
+            "dynamic_memory": self.dynamic_memory,
+            "last_active": self.last_active,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        state = cls(data["conversation_id"], max_memory=data["memory"]["max_memory"])
+        for role, content in data["memory"]["history"]:
+            state.memory.add(role, content)
+        state.memory.restore_summary(data["memory"].get("summary", ()))
+        state.stage = data["stage"]
+        state.persona_name = data["persona_name"]
+        state.persona_prompt = data["persona_prompt"]
+        state.scammer_style = data["scammer_style"]
+        state.conversation_score = data["conversation_score"]
+        state.dynamic_memory = data["dynamic_memory"]
+        state.last_active = data["last_active"]
+        state.prompt_tokens = data.get("prompt_tokens", 0)
+        state.completion_tokens = data.get("completion_tokens", 0)
+        return state
+
+
+# ------------------------ Session Manager ------------------------
+class SessionManager:
+    """
+    Live conversation states keyed by conversation/sender ID.
+
+    At most max_sessions states are kept in memory. Sessions idle for
+    longer than idle_ttl seconds, and the least recently used ones beyond
+    the cap, are evicted. With a spill_dir they are written there as JSON
+    and restored on the next get(); without one they are dropped.
+    Sessions with a turn in progress are never evicted.
+    """
+
+    def __init__(self, max_sessions: int = 10000, idle_ttl: float = 1800,
+                 spill_dir: str = None, max_memory: int = 12):
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.spill_dir = spill_dir
+        self.max_memory = max_memory
+
+        self._sessions = OrderedDict()  # least recently used first
+        # asyncio locks are bound to one event loop: loop -> {conversation_id: Lock}
+        self._locks = weakref.WeakKeyDictionary()
+        self._active = {}  # conversation_id -> turns in progress or waiting
+        self._guard = threading.RLock()
+
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, conversation_id):
+        return conversation_id in self._sessions
+
+    def get(self, conversation_id: str = DEFAULT_CONVERSATION_ID) -> ConversationState:
+        with self._guard:
+            state = self._sessions.get(conversation_id)
+            if state is None:
+                state = self._restore(conversation_id) or ConversationState(
+                    conversation_id, max_memory=self.max_memory
+                )
+                self._sessions[conversation_id] = state
+            else:
+                self._sessions.move_to_end(conversation_id)
+            state.last_active = time.time()
+            self._evict()
+            return state
+
+    @asynccontextmanager
+    async def session(self, conversation_id: str = DEFAULT_CONVERSATION_ID):
+        """
+        Holds one conversation's state for a turn. Turns of the same
+        conversation run one at a time, and the state can't be evicted
+        while a turn is running or waiting. Locks are kept per event loop
+        and dropped once no turn of the conversation is in progress.
+        """
+        loop = asyncio.get_running_loop()
+        with self._guard:
+            self._active[conversation_id] = self._active.get(conversation_id, 0) + 1
+            locks = self._locks.get(loop)
+            if locks is None:
+                locks = self._locks[loop] = {}
+            lock = locks.setdefault(conversation_id, asyncio.Lock())
+        try:
+            async with lock:
+                yield self.get(conversation_id)
+        finally:
+            with self._guard:
+                self._active[conversation_id] -= 1
+                if not self._active[conversation_id]:
+                    del self._active[conversation_id]
+                    for locks in self._locks.values():
+                        locks.pop(conversation_id, None)
+                self._evict()
+
+    def evict_idle(self):
+        with self._guard:
+            self._evict()
+
+    def flush(self):
+        """Spill every idle session, e.g. on shutdown."""
+        with self._guard:
+            for conversation_id in list(self._sessions):
+                if not self._busy(conversation_id):
+                    self._drop(conversation_id)
+
+    # ------------------------ Eviction ------------------------
+    def _busy(self, conversation_id) -> bool:
+        return conversation_id in self._active
+
+    def _evict(self):
+        now = time.time()
+        overflow = len(self._sessions) - self.max_sessions
+        for conversation_id, state in list(self._sessions.items()):
+            idle = now - state.last_active > self.idle_ttl
+            if not idle and overflow <= 0:
+                break
+            if self._busy(conversation_id):
+                continue
+            self._drop(conversation_id)
+            overflow -= 1
+
+    def _drop(self, conversation_id):
+        state = self._sessions.pop(conversation_id)
+        if self.spill_dir:
+            self._spill(state)
+
+    # ------------------------ Disk Spill ------------------------
+    def _spill_path(self, conversation_id: str) -> str:
+        name = hashlib.sha1(conversation_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.spill_dir, f"{name}.json")
+
+    def _spill(self, state: ConversationState):
+        path = self._spill_path(state.conversation_id)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state.to_dict(), f)
+        os.replace(tmp, path)
+
+    def _restore(self, conversation_id: str):
+        if not self.spill_dir:
+            return None
+        path = self._spill_path(conversation_id)
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = ConversationState.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        os.remove(path)
+        return state
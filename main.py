@@ -1,14 +1,16 @@
 import streamlit as st
 from datetime import datetime
+import html
 import json
 import os
+import pandas as pd
 from dotenv import load_dotenv
 import random
 # Load environment variables
 load_dotenv()
 
-# Check if API key is set
-if not os.getenv("GROQ_API_KEY"):
+# Check if API key is set (only the Groq backend needs one)
+if os.getenv("HONEYPOT_LLM_BACKEND", "groq") == "groq" and not os.getenv("GROQ_API_KEY"):
     st.error("⚠️ Missing GROQ_API_KEY environment variable!")
     st.info("Please set GROQ_API_KEY in your environment or .env file")
     st.stop()
@@ -27,6 +29,11 @@ if user_key != MY_API_KEY:
 # Import your existing agents
 from agent.fraud_agent import FraudDetectionAgent
 from agent.llm_honeypot_agent import LLMHoneypotAgent
+from agent.analytics import AnalyticsStore
+from agent.log_files import FLOW_LOG_FILE
+from agent.log_compaction import LOG_ARCHIVE_DIR, PYARROW_AVAILABLE
+
+HISTORY_PAGE_SIZES = [25, 50, 100, 200]
 
 # Advanced Custom CSS for Professional Design
 st.markdown("""
@@ -323,15 +330,12 @@ st.markdown("""
 if "controller_initialized" not in st.session_state:
     st.session_state.fraud_agent = FraudDetectionAgent()
     st.session_state.honeypot_agent = LLMHoneypotAgent()
-    st.session_state.conversation_history = []
-    st.session_state.analysis_results = []
     st.session_state.controller_initialized = True
 
-# Ensure conversation_history exists
-if "conversation_history" not in st.session_state:
-    st.session_state.conversation_history = []
-if "analysis_results" not in st.session_state:
-    st.session_state.analysis_results = []
+# Ensure the analytics store exists (history + running aggregates)
+if "analytics" not in st.session_state:
+    st.session_state.analytics = AnalyticsStore()
+analytics = st.session_state.analytics
 
 # Sidebar with Premium Design
 with st.sidebar:
@@ -348,14 +352,14 @@ with st.sidebar:
         st.markdown(f"""
         <div class="metric-box">
             <div class="metric-label">Total Messages</div>
-            <div class="metric-value">{len(st.session_state.conversation_history)}</div>
+            <div class="metric-value">{analytics.total}</div>
         </div>
         """, unsafe_allow_html=True)
     with col2:
         st.markdown(f"""
         <div class="metric-box">
             <div class="metric-label">Scams Detected</div>
-            <div class="metric-value">{len([r for r in st.session_state.analysis_results if r.get('is_scam')])}</div>
+            <div class="metric-value">{analytics.scams}</div>
         </div>
         """, unsafe_allow_html=True)
     
@@ -388,10 +392,38 @@ with st.sidebar:
     st.markdown("<div class='divider-line'></div>", unsafe_allow_html=True)
     
     if st.button("🗑️ Clear History", use_container_width=True):
-        st.session_state.conversation_history = []
-        st.session_state.analysis_results = []
+        analytics.clear()
+        st.session_state.flow_logs_loaded = False
         st.rerun()
 
+    if st.button("📂 Load Flow Logs", use_container_width=True):
+        if st.session_state.get("flow_logs_loaded"):
+            st.info(f"{FLOW_LOG_FILE} is already loaded")
+        elif os.path.exists(FLOW_LOG_FILE) or os.path.isdir(LOG_ARCHIVE_DIR):
+            with st.spinner(f"Loading {FLOW_LOG_FILE}..."):
+                loaded = 0
+                # Compacted history first (older), then the live file
+                if os.path.isdir(LOG_ARCHIVE_DIR) and PYARROW_AVAILABLE:
+                    loaded += analytics.load_compacted(LOG_ARCHIVE_DIR)
+                if os.path.exists(FLOW_LOG_FILE):
+                    loaded += analytics.load_jsonl(FLOW_LOG_FILE)
+            st.session_state.flow_logs_loaded = True
+            st.success(f"Loaded {loaded} messages")
+            st.rerun()
+        else:
+            st.warning(f"⚠️ {FLOW_LOG_FILE} not found")
+
+def record_analysis(message, fraud_result, category, reply=None):
+    """Adds one analysed message to the analytics store; stage/style come from the honeypot reply for scams."""
+    analytics.add(
+        message,
+        fraud_result,
+        category=category,
+        stage=reply.stage if reply else None,
+        style=reply.scammer_style if reply else None,
+        reply=reply,
+    )
+
 # Main tabs
 tab1, tab2, tab3, tab4 = st.tabs(["🚀 Auto Generate", "✍️ Manual Input", "💬 Conversations", "📈 Analytics"])
 
@@ -431,7 +463,6 @@ with tab1:
         if st.button("🔄 GENERATE & ANALYZE", key="mock_fetch", use_container_width=True):
             # Generate message
             scammer_msg, category = MockScammerGenerator.generate()
-            st.session_state.conversation_history.append(scammer_msg)
             
             # Display scammer message
             st.markdown("""
@@ -446,7 +477,6 @@ with tab1:
             with st.spinner("🔍 Analyzing with AI..."):
                 # Fraud detection
                 fraud_result = st.session_state.fraud_agent.analyze(scammer_msg)
-                st.session_state.analysis_results.append(fraud_result)
                 
                 # Display results in premium boxes
                 col_a, col_b, col_c = st.columns(3)
@@ -492,6 +522,7 @@ with tab1:
                 st.markdown("<div class='divider-line'></div>", unsafe_allow_html=True)
                 
                 # Honeypot reply
+                honeypot_reply = None
                 if fraud_result["is_scam"]:
                     honeypot_reply = st.session_state.honeypot_agent.reply(scammer_msg)
                     st.markdown("""
@@ -502,6 +533,7 @@ with tab1:
                         """</p>
                     </div>
                     """, unsafe_allow_html=True)
+                record_analysis(scammer_msg, fraud_result, category, honeypot_reply)
                 
                 # Detailed analysis
                 with st.expander("📊 DETAILED ANALYSIS"):
@@ -550,11 +582,8 @@ with tab2:
         
         if st.button("🔍 ANALYZE MESSAGE", use_container_width=True):
             if user_message.strip():
-                st.session_state.conversation_history.append(user_message)
-                
                 with st.spinner("Processing analysis..."):
                     fraud_result = st.session_state.fraud_agent.analyze(user_message)
-                    st.session_state.analysis_results.append(fraud_result)
                     
                     # Results
                     col1, col2, col3 = st.columns(3)
@@ -596,6 +625,7 @@ with tab2:
                     
                     st.markdown("<div class='divider-line'></div>", unsafe_allow_html=True)
                     
+                    honeypot_reply = None
                     if fraud_result["is_scam"]:
                         honeypot_reply = st.session_state.honeypot_agent.reply(user_message)
                         st.markdown(f"""
@@ -604,6 +634,7 @@ with tab2:
                             <p style="color: #355c3d; font-style: italic; margin: 0;">"{honeypot_reply}"</p>
                         </div>
                         """, unsafe_allow_html=True)
+                    record_analysis(user_message, fraud_result, None, honeypot_reply)  # classified by the store
                     
                     with st.expander("📋 Full Results"):
                         st.json(fraud_result)
@@ -615,31 +646,45 @@ with tab2:
 # Tab 3: Conversations History
 with tab3:
     st.markdown("### 💬 CONVERSATION HISTORY")
-    st.write(f"Total: {len(st.session_state.conversation_history)} messages | Scams: {len([r for r in st.session_state.analysis_results if r.get('is_scam')])}")
-    
-    if st.session_state.conversation_history:
-        for i, (msg, result) in enumerate(zip(st.session_state.conversation_history, st.session_state.analysis_results), 1):
-            is_scam = result.get("is_scam", False)
-            confidence = result.get("confidence", 0)
+    st.write(f"Total: {analytics.total} messages | Scams: {analytics.scams}")
+    
+    if analytics.total:
+        # Only the selected page is rendered, in one markdown block
+        col_size, col_page = st.columns(2)
+        with col_size:
+            page_size = st.selectbox("Messages per page", HISTORY_PAGE_SIZES, index=1)
+        with col_page:
+            page = st.number_input(
+                f"Page (of {analytics.page_count(page_size)})",
+                min_value=1, max_value=analytics.page_count(page_size), value=1, step=1
+            )
+        
+        items_html = []
+        for i, item in analytics.page(int(page), page_size):
+            is_scam = item["is_scam"]
+            confidence = item["confidence"]
             
             badge_color = "🔴" if is_scam else "🟢"
             badge_text = "SCAM" if is_scam else "SAFE"
+            badge_background = "linear-gradient(135deg, #ef4444, #dc2626)" if is_scam else "linear-gradient(135deg, #48bb78, #38a169)"
+            msg = html.escape(item["message"][:120])
             
-            st.markdown(f"""
+            items_html.append(f"""
             <div class="conversation-item">
                 <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
                     <span style="font-weight: 700; color: #2d3748;">Message #{i}</span>
                     <span style="font-size: 0.9em; color: #718096;">Confidence: {confidence:.1%}</span>
                 </div>
-                <p style="margin: 8px 0; color: #4a5568; font-size: 0.95em;">{msg[:120]}...</p>
+                <p style="margin: 8px 0; color: #4a5568; font-size: 0.95em;">{msg}...</p>
                 <div style="display: flex; gap: 10px; margin-top: 10px;">
-                    <span style="background: linear-gradient(135deg, #ef4444, #dc2626) if {is_scam} else linear-gradient(135deg, #48bb78, #38a169); 
+                    <span style="background: {badge_background}; 
                                  padding: 4px 12px; border-radius: 20px; color: white; font-size: 0.85em; font-weight: 600;">
                         {badge_color} {badge_text}
                     </span>
                 </div>
             </div>
-            """, unsafe_allow_html=True)
+            """)
+        st.markdown("".join(items_html), unsafe_allow_html=True)
     else:
         st.markdown("""
         <div style="text-align: center; padding: 60px 20px;">
@@ -653,12 +698,12 @@ with tab3:
 with tab4:
     st.markdown("### 📈 ADVANCED ANALYTICS")
     
-    if st.session_state.conversation_history:
-        # Stats
-        total_msgs = len(st.session_state.conversation_history)
-        scam_count = len([r for r in st.session_state.analysis_results if r.get('is_scam')])
-        safe_count = total_msgs - scam_count
-        avg_confidence = sum([r.get('confidence', 0) for r in st.session_state.analysis_results]) / len(st.session_state.analysis_results) if st.session_state.analysis_results else 0
+    if analytics.total:
+        # Stats (running aggregates, nothing is recomputed here)
+        total_msgs = analytics.total
+        scam_count = analytics.scams
+        safe_count = analytics.safe
+        avg_confidence = analytics.avg_confidence
         
         col1, col2, col3, col4 = st.columns(4)
         
@@ -719,9 +764,9 @@ with tab4:
         
         with col_right:
             st.write("**Confidence Metrics:**")
-            high_conf = len([r for r in st.session_state.analysis_results if r.get('confidence', 0) > 0.8])
-            med_conf = len([r for r in st.session_state.analysis_results if 0.5 <= r.get('confidence', 0) <= 0.8])
-            low_conf = len([r for r in st.session_state.analysis_results if r.get('confidence', 0) < 0.5])
+            high_conf = analytics.confidence_bands["high"]
+            med_conf = analytics.confidence_bands["medium"]
+            low_conf = analytics.confidence_bands["low"]
             
             st.markdown(f"""
             <div class="premium-card">
@@ -739,6 +784,42 @@ with tab4:
                 </div>
             </div>
             """, unsafe_allow_html=True)
+        
+        st.markdown("<div class='divider-line'></div>", unsafe_allow_html=True)
+        
+        # Breakdowns and distributions
+        col_cat, col_stage, col_style = st.columns(3)
+        with col_cat:
+            st.write("**By Category:**")
+            st.bar_chart(pd.Series(dict(analytics.by_category.most_common())))
+        with col_stage:
+            st.write("**By Stage:**")
+            if analytics.by_stage:
+                st.bar_chart(pd.Series(dict(analytics.by_stage.most_common())))
+            else:
+                st.caption("No honeypot conversations yet")
+        with col_style:
+            st.write("**By Scammer Style:**")
+            if analytics.by_style:
+                st.bar_chart(pd.Series(dict(analytics.by_style.most_common())))
+            else:
+                st.caption("No honeypot conversations yet")
+        
+        col_hist, col_time = st.columns(2)
+        with col_hist:
+            st.write("**Confidence Distribution:**")
+            st.bar_chart(pd.Series({
+                f"{i * 10}-{i * 10 + 10}%": count
+                for i, count in enumerate(analytics.confidence_histogram)
+            }))
+        with col_time:
+            st.write("**Messages per Hour:**")
+            hourly = analytics.hourly()
+            st.line_chart(pd.DataFrame(
+                [(total, scams) for _, total, scams in hourly],
+                index=[hour for hour, _, _ in hourly],
+                columns=["messages", "scams"],
+            ))
     else:
         st.markdown("""
         <div style="text-align: center; padding: 80px 20px;">
@@ -1,9 +1,9 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 import random
+import json
 import pandas as pd
 import os
 from faker import Faker
-import uuid
 
 app = Flask(__name__)
 fake = Faker()
@@ -15,10 +15,14 @@ fake = Faker()
 BASE_DIR = os.getcwd()
 DATA_PATH = os.path.join(BASE_DIR, "data", "processed", "master_fraud_dataset.csv")
 
-df = pd.read_csv(DATA_PATH)
-scam_texts = df[df["label"] == 1]["text"].dropna().tolist()
-
-print(f"✅ Loaded {len(scam_texts)} real scam samples")
+if os.path.exists(DATA_PATH):
+    df = pd.read_csv(DATA_PATH)
+    scam_texts = df[df["label"] == 1]["text"].dropna().tolist()
+    print(f"✅ Loaded {len(scam_texts)} real scam samples")
+else:
+    # e.g. a checkout without the LFS dataset: synthetic scams only
+    scam_texts = []
+    print(f"⚠️ {DATA_PATH} not found, using synthetic scams only")
 
 # ----------------------------
 # Personas
@@ -52,10 +56,10 @@ PERSONAS = {
 # Phishing URL Generator
 # ----------------------------
 
-def generate_phishing_url():
+def generate_phishing_url(rng=random):
     brands = ["paypal", "amazon", "banksecure", "google", "microsoft"]
-    brand = random.choice(brands)
-    domain = f"{brand}-verify-{uuid.uuid4().hex[:6]}.com"
+    brand = rng.choice(brands)
+    domain = f"{brand}-verify-{rng.getrandbits(24):06x}.com"
     return f"http://{domain}/login"
 
 # ----------------------------
@@ -81,7 +85,7 @@ def format_by_channel(message, channel):
 # Synthetic Scam Generator
 # ----------------------------
 
-def generate_synthetic_scam():
+def generate_synthetic_scam(rng=random):
 
     templates = [
         "Your {brand} account is locked. Verify at {url}",
@@ -89,10 +93,10 @@ def generate_synthetic_scam():
         "Payment failed. Update details here: {url}",
     ]
 
-    brand = random.choice(["Bank", "PayPal", "Amazon", "Google"])
-    url = generate_phishing_url()
+    brand = rng.choice(["Bank", "PayPal", "Amazon", "Google"])
+    url = generate_phishing_url(rng)
 
-    template = random.choice(templates)
+    template = rng.choice(templates)
 
     return template.format(brand=brand, url=url)
 
@@ -119,24 +123,24 @@ def escalate(user_reply):
 # Message Generator
 # ----------------------------
 
-def generate_message(user_reply=""):
+def generate_message(user_reply="", rng=random, persona=None):
 
     escalation = escalate(user_reply)
     if escalation:
         return escalation
 
-    persona = PERSONAS[conversation_state["persona"]]
+    persona = PERSONAS[persona or conversation_state["persona"]]
 
-    if random.random() < 0.5:
-        message = random.choice(scam_texts)
+    if scam_texts and rng.random() < 0.5:
+        message = rng.choice(scam_texts)
     else:
-        message = generate_synthetic_scam()
+        message = generate_synthetic_scam(rng)
 
-    opener = random.choice(persona["openers"])
+    opener = rng.choice(persona["openers"])
 
     final_message = f"{opener}. {message}"
 
-    channel = random.choice(CHANNELS)
+    channel = rng.choice(CHANNELS)
 
     return format_by_channel(final_message, channel)
 
@@ -147,6 +151,28 @@ def generate_message(user_reply=""):
 def generate_stream(count=10):
     return [generate_message() for _ in range(count)]
 
+MAX_STREAM_COUNT = 1_000_000
+STREAM_CHUNK_LINES = 100
+
+def iter_ndjson(count, seed=None, conversations=1):
+    # Local RNG so a seeded stream is reproducible and doesn't touch the global one
+    rng = random.Random(seed)
+    personas = {}
+    lines = []
+    for i in range(count):
+        conversation_id = f"mock-{i % conversations}"
+        if conversation_id not in personas:
+            personas[conversation_id] = rng.choice(list(PERSONAS.keys()))
+        lines.append(json.dumps({
+            "conversation_id": conversation_id,
+            "message": generate_message(rng=rng, persona=personas[conversation_id])
+        }) + "\n")
+        if len(lines) >= STREAM_CHUNK_LINES:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
 # ----------------------------
 # API Endpoints
 # ----------------------------
@@ -173,6 +199,28 @@ def generate_bulk():
 
     return jsonify({"messages": bulk_messages})
 
+@app.route("/generate_stream", methods=["GET"])
+def generate_stream_ndjson():
+
+    try:
+        count = int(request.args.get("count", 1000))
+        conversations = int(request.args.get("conversations", 1))
+        seed = request.args.get("seed")
+        seed = int(seed) if seed is not None else None
+    except ValueError:
+        return jsonify({"error": "count, conversations and seed must be integers"}), 400
+
+    if not 0 <= count <= MAX_STREAM_COUNT:
+        return jsonify({"error": f"count must be between 0 and {MAX_STREAM_COUNT}"}), 400
+    if conversations < 1:
+        return jsonify({"error": "conversations must be at least 1"}), 400
+
+    # No Content-Length, so the response goes out with chunked transfer encoding
+    return Response(
+        stream_with_context(iter_ndjson(count, seed, conversations)),
+        mimetype="application/x-ndjson"
+    )
+
 # ----------------------------
 # Run Server
 # ----------------------------
@@ -181,4 +229,5 @@ if __name__ == "__main__":
     print("🚨 Ultimate Mock Scammer Engine running:")
     print("👉 http://localhost:5000/mock_scammer")
     print("👉 http://localhost:5000/generate_bulk?count=10000")
+    print("👉 http://localhost:5000/generate_stream?count=100000&seed=42")
     app.run(port=5000)
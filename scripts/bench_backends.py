@@ -0,0 +1,83 @@
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from agent.llm_backends import BACKENDS, create_backend
+from agent.llm_honeypot_agent import SYSTEM_PROMPT_TEMPLATE
+from agent.persona import get_persona
+from agent.prompt_template import PromptTemplate
+from scripts.fake_groq_server import start_fake_groq
+
+# LLM backends side by side on the same honeypot prompts: warm-up time,
+# per-call latency and throughput at a given concurrency. Backends that
+# can't run here (no API key, no llama-cpp-python or GGUF file, server
+# down) are reported and skipped.
+#   python -m scripts.bench_backends --backends groq,openai,llamacpp --calls 50
+#   python -m scripts.bench_backends --fake   # openai backend against the local stand-in
+
+
+def honeypot_prompt(i):
+    _, persona = get_persona(("bank_scam", "prize_scam", "tech_support")[i % 3])
+    return PromptTemplate(SYSTEM_PROMPT_TEMPLATE, persona=persona).render(
+        strategy="verification",
+        trap="Which branch are you calling from?",
+        stage="payment",
+        emotion="worried and confused",
+        scammer_style="aggressive",
+        frustration=0,
+        memory=f"Scammer: Your account {i} is blocked, verify now or it will be closed",
+    )
+
+
+async def run(backend, calls, concurrency):
+    warm_up = await backend.warm_up()
+    latencies = []
+    queue = asyncio.Queue()
+    for i in range(calls):
+        queue.put_nowait(honeypot_prompt(i))
+
+    async def worker():
+        while not queue.empty():
+            prompt = queue.get_nowait()
+            start = time.perf_counter()
+            await backend.complete(prompt)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await backend.aclose()
+    return warm_up, latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--fake", action="store_true", help="point the openai backend at a local stand-in")
+    args = parser.parse_args()
+
+    options = {}
+    if args.fake:
+        server = start_fake_groq(latency=0.15, jitter=0.03, token_latency=0.005, max_concurrency=8)
+        options["openai"] = {"url": server.url}
+
+    print(f"📊 {args.calls} calls per backend, concurrency {args.concurrency}")
+    print(f"   {'backend':<10}{'warm-up s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'calls/s':>9}")
+    for name in args.backends.split(","):
+        backend = create_backend(name, **options.get(name, {}))
+        try:
+            warm_up, latencies, elapsed = asyncio.run(run(backend, args.calls, args.concurrency))
+        except Exception as e:
+            print(f"   {name:<10}skipped: {type(e).__name__}: {e}")
+            continue
+        ms = np.array(latencies) * 1000
+        print(f"   {name:<10}{warm_up:>10.2f}{np.percentile(ms, 50):>9.0f}{np.percentile(ms, 95):>9.0f}"
+              f"{np.percentile(ms, 99):>9.0f}{len(latencies) / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
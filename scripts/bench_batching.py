@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from agent.llm_batcher import LLMBatcher
+from agent.llm_client import GroqClient
+from agent.metrics import metrics
+from scripts.fake_groq_server import start_fake_groq
+
+# Micro-batching against the local stand-in configured like a small GPU
+# server (a few sequences at a time, batched decode on /v1/completions).
+# Every conversation sends its turns back to back; compares single
+# requests with the batcher at several windows.
+#   python -m scripts.bench_batching --conversations 64 --turns 5 --windows 0.005,0.02,0.05
+
+PROMPT = "You are a real human scam victim talking to a scammer.\nScammer: Your account is blocked.\nVictim:"
+
+
+async def drive(client, conversations, turns):
+    latencies = []
+
+    async def conversation():
+        for _ in range(turns):
+            start = time.perf_counter()
+            try:
+                await client.complete(PROMPT)
+            except Exception:
+                pass
+            latencies.append(time.perf_counter() - start)
+
+    # Warm-up: the first call builds the connection pool (and its SSL
+    # context), which would stall the loop inside the measurement
+    await client.complete(PROMPT)
+    metrics.reset()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(conversation() for _ in range(conversations)))
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+    return latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--conversations", type=int, default=64)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--windows", default="0.005,0.02,0.05")
+    parser.add_argument("--max-batch", type=int, default=16)
+    parser.add_argument("--max-concurrency", type=int, default=4, help="sequences the fake server runs at once")
+    parser.add_argument("--latency", type=float, default=0.1, help="fake prefill time (s)")
+    parser.add_argument("--token-latency", type=float, default=0.005, help="fake seconds per decode step")
+    args = parser.parse_args()
+
+    server = start_fake_groq(latency=args.latency, jitter=0.01, token_latency=args.token_latency,
+                             max_concurrency=args.max_concurrency)
+    runs = [("single", None)] + [(f"window {w}s", float(w)) for w in args.windows.split(",")]
+
+    print(f"📊 {args.conversations} conversations x {args.turns} turns, "
+          f"server runs {args.max_concurrency} requests at a time")
+    print(f"   {'mode':<16}{'prompts/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'wait p95 ms':>13}{'batch':>7}")
+    for name, window in runs:
+        client = GroqClient("bench", server.url, "fake-model", batch_url=server.batch_url)
+        if window is not None:
+            client = LLMBatcher(client, window=window, max_batch=args.max_batch)
+        latencies, elapsed = asyncio.run(drive(client, args.conversations, args.turns))
+
+        ms = np.array(latencies) * 1000
+        snapshot = metrics.snapshot()
+        wait = snapshot["stages"].get("llm_batch_wait", {}).get("p95", 0.0) * 1000
+        counters = snapshot["counters"]
+        batch = counters.get("llm_batched_prompts", 0) / counters["llm_batches"] if counters.get("llm_batches") else 1
+        print(f"   {name:<16}{len(latencies) / elapsed:>10.1f}{np.percentile(ms, 50):>9.0f}"
+              f"{np.percentile(ms, 95):>9.0f}{wait:>13.1f}{batch:>7.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import sklearn.feature_extraction.text  # noqa: F401 - keep import cost out of the load timings
+from sklearn.model_selection import train_test_split
+
+from agent.fraud_agent import FraudDetectionAgent
+from agent.model_registry import registry
+
+# Throughput, memory and accuracy of each feature pipeline on the held-out
+# split of the master dataset (same split as scripts/train_model.py).
+#   python -m scripts.bench_feature_pipelines [pickle compact hashing]
+
+BASE_DIR = os.getcwd()
+DATA_PATH = os.path.join(BASE_DIR, "data", "processed", "master_fraud_dataset.csv")
+CHUNK_SIZE = 1000
+
+formats = sys.argv[1:] or ["pickle", "compact", "hashing"]
+
+df = pd.read_csv(DATA_PATH)
+_, X_test, _, y_test = train_test_split(
+    df["text"], df["label"], test_size=0.2, random_state=42, stratify=df["label"]
+)
+messages = X_test.fillna("").astype(str).tolist()
+labels = y_test.to_numpy()
+print(f"Test messages: {len(messages)}\n")
+
+print(f"{'format':<10}{'load ms':>10}{'load MB':>10}{'msg/s':>12}{'score MB':>10}{'accuracy':>10}")
+for model_format in formats:
+    registry.clear()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        agent = FraudDetectionAgent(model_format=model_format)
+    except (OSError, ValueError) as e:
+        tracemalloc.stop()
+        print(f"{model_format:<10} skipped: {e}")
+        continue
+    load_ms = (time.perf_counter() - start) * 1000
+    load_mb = tracemalloc.get_traced_memory()[0] / 1024 ** 2
+    tracemalloc.reset_peak()
+
+    # Raw model output, without keyword boosting, so accuracy compares the features
+    start = time.perf_counter()
+    predictions = []
+    for i in range(0, len(messages), CHUNK_SIZE):
+        decisions = agent._decisions(messages[i:i + CHUNK_SIZE])
+        predictions.append(agent.scorer.score_decisions(decisions)[0])
+    elapsed = time.perf_counter() - start
+    score_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    tracemalloc.stop()
+
+    accuracy = float((np.concatenate(predictions) == labels).mean())
+    print(
+        f"{model_format:<10}{load_ms:>10.1f}{load_mb:>10.1f}"
+        f"{len(messages) / elapsed:>12.0f}{score_mb:>10.1f}{accuracy:>10.4f}"
+    )
@@ -0,0 +1,62 @@
+import json
+import re
+import sys
+import time
+from collections import Counter
+
+from agent.indicators import extract_indicators
+
+# Indicator extraction throughput on the messages in honeypot_logs.json:
+# the old one-findall-per-type extraction vs the single-pass extractor.
+#   python -m scripts.bench_indicators [path/to/logs.json]
+
+LOG_FILE = sys.argv[1] if len(sys.argv) > 1 else "honeypot_logs.json"
+MIN_MESSAGES = 50000  # the corpus is repeated up to at least this many
+
+
+def old_extract(text):
+    data = {}
+    upi_match = re.findall(r"\b[\w.-]+@[\w]+\b", text)
+    if upi_match:
+        data["upi_ids"] = upi_match
+    links = re.findall(r"(https?://\S+)", text)
+    if links:
+        data["links"] = links
+    numbers = re.findall(r"\b\d{4,}\b", text)
+    if numbers:
+        data["numbers"] = numbers
+    return data
+
+
+def load_messages(path):
+    messages = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            for key in ("scammer_message", "honeypot_reply"):
+                if record.get(key):
+                    messages.append(record[key])
+    return messages
+
+
+def bench(name, fn, messages):
+    start = time.perf_counter()
+    for message in messages:
+        fn(message)
+    elapsed = time.perf_counter() - start
+    mb = sum(len(m) for m in messages) / 2**20
+    print(f"{name:<24}{len(messages) / elapsed:>14,.0f} msgs/s{mb / elapsed:>10,.1f} MB/s")
+
+
+corpus = load_messages(LOG_FILE)
+messages = corpus * max(1, -(-MIN_MESSAGES // len(corpus)))
+print(f"{len(corpus)} messages from {LOG_FILE}, benchmarked as {len(messages)}\n")
+
+bench("per-type findall", old_extract, messages)
+bench("single-pass extractor", extract_indicators, messages)
+
+found = Counter(i.type for message in corpus for i in extract_indicators(message))
+print("\nIndicators in the corpus:", dict(found.most_common()))
@@ -0,0 +1,57 @@
+import json
+import os
+import time
+
+from agent.llm_honeypot_agent import (
+    MESSAGE_MATCHER, STAGE_KEYWORDS, SCORE_KEYWORDS, ScammerProfiler
+)
+from agent.scam_classifier import ScamClassifier
+
+# Per-message cost of the old any()-loops vs one MatcherGroup scan,
+# over the scammer messages in the local logs.
+
+BASE_DIR = os.getcwd()
+ROUNDS = 200
+
+messages = []
+for name in ["honeypot_logs.json", "scam_flow_logs.json"]:
+    path = os.path.join(BASE_DIR, name)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            messages += [json.loads(line)["scammer_message"] for line in f if line.strip()]
+
+
+def loop_scan(message):
+    # What classify/profile/_update_stage/_update_score did per message
+    text = message.lower()
+    for keywords in ScamClassifier.patterns.values():
+        if any(k in text for k in keywords):
+            break
+    for keywords in ScammerProfiler.styles.values():
+        if any(k in message.lower() for k in keywords):
+            break
+    for keywords in STAGE_KEYWORDS.values():
+        if any(k in message.lower() for k in keywords):
+            break
+    any(k in message.lower() for k in SCORE_KEYWORDS["high_value"])
+
+
+def matcher_scan(message):
+    MESSAGE_MATCHER.scan(message)
+
+
+def bench(fn):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for message in messages:
+            fn(message)
+    elapsed = time.perf_counter() - start
+    return elapsed / (ROUNDS * len(messages)) * 1e6
+
+
+print(f"Messages: {len(messages)} x {ROUNDS} rounds")
+loop_us = bench(loop_scan)
+matcher_us = bench(matcher_scan)
+print(f"any() loops:   {loop_us:.2f} µs/message")
+print(f"MatcherGroup:  {matcher_us:.2f} µs/message")
+print(f"Speedup:       {loop_us / matcher_us:.2f}x")
@@ -0,0 +1,108 @@
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import tempfile
+import time
+
+from agent.indicator_index import IndicatorIndex
+from agent.llm_honeypot_agent import LLMHoneypotAgent
+from agent.local_replies import ReplyPolicy
+from agent.log_sink import JsonlLogSink
+from agent.prompt_template import estimate_tokens
+from agent.session_manager import SessionManager
+from mock_scammer import generate_message
+
+# Local reply engine throughput, and what the reply policy saves on mock
+# scammer conversations at several LLM-call ratios. The LLM is a stub
+# that answers instantly; cost and latency saved use the rates below.
+#   python -m scripts.bench_local_replies --conversations 200 --turns 8
+
+
+class CountingClient:
+    """Stand-in LLM that counts calls and tokens."""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    async def complete(self, prompt, temperature=0.7):
+        reply = "Sorry, who is calling? Can you tell me your employee ID?"
+        self.calls += 1
+        self.prompt_tokens += estimate_tokens(prompt)
+        self.completion_tokens += estimate_tokens(reply)
+        return reply
+
+
+def make_agent(tmp, client, ratio):
+    agent = LLMHoneypotAgent(
+        llm_client=client,
+        humanize_delay=None,
+        sessions=SessionManager(max_memory=12),
+        log_sink=JsonlLogSink(os.path.join(tmp, f"honeypot-{ratio}.jsonl")),
+        indicator_index=IndicatorIndex(os.path.join(tmp, f"indicators-{ratio}.db")),
+        reply_cache=False,  # measure the policy alone
+        reply_policy=ReplyPolicy(llm_ratio=ratio),
+    )
+    return agent
+
+
+async def run_policy(agent, conversations, turns, seed):
+    rng = random.Random(seed)
+    for c in range(conversations):
+        persona = rng.choice(["bank_officer", "tech_support", "lottery_agent"])
+        for _ in range(turns):
+            await agent.areply(generate_message(rng=rng, persona=persona), conversation_id=f"bench-{c}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=8)
+    parser.add_argument("--ratios", default="1,0.6,0.4,0.2")
+    parser.add_argument("--llm-latency", type=float, default=0.35, help="assumed seconds per LLM call")
+    parser.add_argument("--input-price", type=float, default=0.05, help="$ per 1M prompt tokens")
+    parser.add_argument("--output-price", type=float, default=0.08, help="$ per 1M completion tokens")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        # ------------------------ Engine Throughput ------------------------
+        agent = make_agent(tmp, CountingClient(), 0)
+        with contextlib.redirect_stdout(devnull):
+            state = agent.sessions.get("engine")
+            state.persona_name = "elderly_person"
+        n = 200_000
+        start = time.perf_counter()
+        for i in range(n):
+            state.stage = ("otp", "payment", "trust", "initial")[i % 4]
+            agent._local_reply(state, agent._generate_bait_hint(state))
+        elapsed = time.perf_counter() - start
+        print(f"⚡ Local replies: {n / elapsed:,.0f} replies/s ({elapsed / n * 1e6:.1f} µs each)")
+
+        # ------------------------ Policy Savings ------------------------
+        messages = args.conversations * args.turns
+        print(f"\n📊 {args.conversations} conversations x {args.turns} turns ({messages} replies)")
+        print(f"   {'ratio':>6}{'LLM calls':>11}{'share':>8}{'tokens':>10}{'cost $':>10}{'LLM s':>9}")
+        baseline = None
+        for ratio in (float(r) for r in args.ratios.split(",")):
+            client = CountingClient()
+            agent = make_agent(tmp, client, ratio)
+            with contextlib.redirect_stdout(devnull):
+                asyncio.run(run_policy(agent, args.conversations, args.turns, seed=7))
+            agent.log_sink.close()
+            agent.indicator_index.close()
+            cost = (client.prompt_tokens * args.input_price + client.completion_tokens * args.output_price) / 1e6
+            llm_seconds = client.calls * args.llm_latency
+            print(f"   {ratio:>6.2f}{client.calls:>11}{client.calls / messages:>8.0%}"
+                  f"{client.prompt_tokens + client.completion_tokens:>10}{cost:>10.4f}{llm_seconds:>9.1f}")
+            if baseline is None:
+                baseline = (cost, llm_seconds)
+            elif baseline[0]:
+                print(f"          saves {1 - cost / baseline[0]:.0%} of LLM cost, "
+                      f"{baseline[1] - llm_seconds:.1f}s of LLM wait")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from agent.log_compaction import compact_log, query_logs
+from agent.log_files import FLOW_LOG_FILE
+
+# Loading a dashboard's worth of columns from JSONL vs compacted Parquet.
+# Writes RECORDS synthetic flow-log lines spread over DAYS days, compacts
+# them, then reads stage/style/confidence/is_scam for the last 30 days.
+# Each read runs in a fresh process so peak RSS is comparable.
+#   python -m scripts.bench_log_compaction [records]
+
+RECORDS = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 300_000
+DAYS = 90
+COLUMNS = ["stage", "scammer_style", "confidence", "is_scam"]
+
+
+def write_logs(path):
+    rng = random.Random(0)
+    start = datetime(2026, 1, 1)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(RECORDS):
+            is_scam = rng.random() < 0.7
+            message = f"Your account is blocked, verify at http://bank-verify-{rng.getrandbits(24):06x}.com/login"
+            f.write(json.dumps({
+                "timestamp": (start + timedelta(seconds=i * DAYS * 86400 / RECORDS)).isoformat(),
+                "conversation_id": f"mock-{rng.randrange(5000)}",
+                "scammer_message": message,
+                "fraud_result": {"message": message, "is_scam": is_scam,
+                                 "confidence": round(rng.random(), 3),
+                                 "decision": "ENGAGE_SCAMMER" if is_scam else "IGNORE"},
+                "honeypot_reply": "Can I verify this with my bank first?" if is_scam else None,
+                "scam_data": {},
+                "stage": rng.choice(["trust", "payment", "otp"]) if is_scam else None,
+                "scammer_style": rng.choice(["aggressive", "friendly", "neutral"]) if is_scam else None,
+                "conversation_score": rng.randrange(10),
+            }) + "\n")
+
+
+def read_jsonl(path, since):
+    df = pd.read_json(path, lines=True)
+    df = df[df["timestamp"] >= since]
+    df["confidence"] = df["fraud_result"].map(lambda r: r["confidence"])
+    df["is_scam"] = df["fraud_result"].map(lambda r: r["is_scam"])
+    return len(df[["stage", "scammer_style", "confidence", "is_scam"]])
+
+
+def read_parquet(archive_dir, since):
+    return query_logs("flow", columns=COLUMNS, start_date=since, archive_dir=archive_dir).num_rows
+
+
+def timed(fn, *args):
+    # Fork so each reader starts from the same baseline
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        start = time.perf_counter()
+        rows = fn(*args)
+        elapsed = time.perf_counter() - start
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        os.write(write_fd, json.dumps([rows, elapsed, peak]).encode())
+        os._exit(0)
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+    with os.fdopen(read_fd) as f:
+        return json.loads(f.read())
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, FLOW_LOG_FILE)
+    write_logs(path)
+    jsonl_bytes = os.path.getsize(path)
+    jsonl_copy = os.path.join(tmp, "copy.jsonl")
+    os.link(path, jsonl_copy)
+
+    archive = os.path.join(tmp, "archive")
+    stats = compact_log(path, archive, cut=True, keep=False)
+    parquet_bytes = sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(archive) for name in names
+    )
+    print(f"{RECORDS:,} records over {DAYS} days: JSONL {jsonl_bytes / 2**20:.1f} MB -> "
+          f"Parquet {parquet_bytes / 2**20:.1f} MB in {stats['elapsed']:.1f}s\n")
+
+    since = (datetime(2026, 1, 1) + timedelta(days=DAYS - 30)).date().isoformat()
+    for name, fn, arg in (("JSONL (pandas)", read_jsonl, jsonl_copy),
+                          ("Parquet query", read_parquet, archive)):
+        rows, elapsed, peak = timed(fn, arg, since)
+        print(f"{name:<16}{rows:>10,} rows{elapsed:>8.2f}s  peak RSS {peak:>7.0f} MB")
+
+    scams = query_logs("flow", columns=["stage"], archive_dir=archive,
+                       filter=ds.field("is_scam") == True)  # noqa: E712
+    print("\nScams by stage:", scams.column("stage").value_counts().to_pylist())
@@ -0,0 +1,74 @@
+import json
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Process
+
+from agent.log_sink import JsonlLogSink
+
+# Records/s of the old open-append-close pattern vs the buffered sink,
+# plus a multi-process run checking that no lines get interleaved.
+
+RECORDS = 20000
+PROCESSES = 4
+
+record = {
+    "timestamp": "2026-02-05T15:25:31.274455",
+    "scammer_message": "We need to verify your identity immediately",
+    "honeypot_reply": "Can I confirm this with customer service?",
+    "stage": "trust",
+    "score": 1,
+    "scammer_style": "aggressive",
+    "scam_attempts": {}
+}
+
+
+def open_append_close(path, n):
+    for _ in range(n):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def sink_writes(path, n, **kwargs):
+    sink = JsonlLogSink(path, **kwargs)
+    for _ in range(n):
+        sink.write(record)
+    sink.close()
+
+
+def bench(name, fn, path, **kwargs):
+    start = time.perf_counter()
+    fn(path, RECORDS, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28}{RECORDS / elapsed:>12,.0f} records/s")
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    bench("open-append-close", open_append_close, os.path.join(tmp, "a.jsonl"))
+    bench("sink, fsync=never", sink_writes, os.path.join(tmp, "b.jsonl"))
+    bench("sink, fsync=flush", sink_writes, os.path.join(tmp, "c.jsonl"), fsync="flush")
+    if "--all" in sys.argv:
+        bench("sink, fsync=always", sink_writes, os.path.join(tmp, "d.jsonl"), fsync="always")
+
+    # Several processes appending to one rotating file
+    path = os.path.join(tmp, "shared.jsonl")
+    workers = [
+        Process(target=sink_writes, args=(path, RECORDS),
+                kwargs={"max_buffer": 64, "max_bytes": 2_000_000, "backup_count": 20})
+        for _ in range(PROCESSES)
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    lines = 0
+    for name in os.listdir(tmp):
+        if name.startswith("shared.jsonl") and not name.endswith(".lock"):
+            with open(os.path.join(tmp, name), encoding="utf-8") as f:
+                for line in f:
+                    assert json.loads(line) == record
+                    lines += 1
+    assert lines == RECORDS * PROCESSES, f"expected {RECORDS * PROCESSES} lines, found {lines}"
+    print(f"✅ {PROCESSES} processes, {lines} lines, none torn or lost across rotations")
@@ -0,0 +1,49 @@
+import os
+import resource
+import sys
+import time
+
+start_process = time.perf_counter()
+
+import joblib
+
+from agent.fraud_agent import FraudDetectionAgent, MODEL_PATH, VECTORIZER_PATH
+
+# Startup time and resident memory: per-agent joblib.load vs the shared
+# model registry. Run each mode in a fresh process:
+#   python -m scripts.bench_model_loading            (registry, pickles)
+#   python -m scripts.bench_model_loading --compact  (registry, compact export)
+#   python -m scripts.bench_model_loading --direct   (old behaviour)
+
+AGENTS = 5
+
+
+def rss_mb():
+    # Current RSS from /proc when available, else the peak from getrusage
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_direct():
+    return joblib.load(MODEL_PATH), joblib.load(VECTORIZER_PATH)
+
+
+direct = "--direct" in sys.argv
+model_format = "compact" if "--compact" in sys.argv else "pickle"
+baseline = rss_mb()
+timings = []
+agents = []
+for _ in range(AGENTS):
+    start = time.perf_counter()
+    agents.append(load_direct() if direct else FraudDetectionAgent(model_format=model_format))
+    timings.append(time.perf_counter() - start)
+
+print(f"Mode:              {'direct joblib.load' if direct else 'model registry, ' + model_format}")
+print(f"Cold start:        {(time.perf_counter() - start_process) * 1000:.1f} ms incl. imports")
+print(f"First agent:       {timings[0] * 1000:.1f} ms")
+print(f"Next {AGENTS - 1} agents:     {sum(timings[1:]) * 1000:.1f} ms total")
+print(f"RSS added:         {rss_mb() - baseline:.1f} MB for {AGENTS} agents")
@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import contextlib
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from agent.indicator_index import IndicatorIndex
+from agent.llm_client import GroqClient
+from agent.llm_honeypot_agent import LLMHoneypotAgent, reply_settled
+from agent.local_replies import ReplyPolicy
+from agent.log_sink import JsonlLogSink
+from agent.session_manager import SessionManager
+from scripts.fake_groq_server import RAMBLES, REPLIES, start_fake_groq
+
+# Streaming vs whole completions against the local SSE stand-in: reply
+# latency and words generated per turn. Also checks that cutting the
+# stream at reply_settled() never changes the sanitized reply.
+#   python -m scripts.bench_streaming --turns 200 --token-latency 0.02
+
+SCAMS = [
+    "Your bank account is blocked. Verify now at http://banksecure-verify.com/login",
+    "Sir this is the official customer desk, confirm your details",
+    "Install the support app from this link to fix your device",
+    "Congratulations, you won a prize! Pay the processing fee by UPI",
+]
+
+
+def check_parity(agent):
+    """Feeds every stand-in completion word by word, as the stream would."""
+    for reply in REPLIES:
+        for ramble in RAMBLES:
+            full = f"{reply} {ramble}"
+            words = full.split(" ")
+            text = ""
+            for i, word in enumerate(words):
+                text += word if i == 0 else f" {word}"
+                if reply_settled(text):
+                    break
+            expected = agent._behavior_firewall(agent._sanitize_reply(full))
+            got = agent._behavior_firewall(agent._sanitize_reply(text.strip()))
+            assert got == expected, (full, got, expected)
+    return len(REPLIES) * len(RAMBLES)
+
+
+async def run(agent, turns, concurrency):
+    latencies = []
+
+    async def conversation(index):
+        for turn in range(turns // concurrency):
+            start = time.perf_counter()
+            await agent.areply(SCAMS[turn % len(SCAMS)], conversation_id=f"stream-{index}")
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(conversation(i) for i in range(concurrency)))
+    await agent.llm_client.aclose()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.15, help="fake time to first token (s)")
+    parser.add_argument("--token-latency", type=float, default=0.02, help="fake seconds per word")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        for stream in (False, True):
+            server = start_fake_groq(latency=args.latency, jitter=0.02, token_latency=args.token_latency)
+            agent = LLMHoneypotAgent(
+                llm_client=GroqClient("bench", server.url, "fake-model"),
+                humanize_delay=None,
+                sessions=SessionManager(max_memory=12),
+                log_sink=JsonlLogSink(os.path.join(tmp, f"honeypot-{stream}.jsonl")),
+                indicator_index=IndicatorIndex(os.path.join(tmp, f"indicators-{stream}.db")),
+                reply_policy=ReplyPolicy(llm_ratio=1),
+                stream=stream,
+            )
+            agent.reply_cache = None
+            if stream:
+                print(f"✅ Parity: {check_parity(agent)} completions sanitize the same when cut early")
+
+            with contextlib.redirect_stdout(devnull):
+                latencies = asyncio.run(run(agent, args.turns, args.concurrency))
+            server.shutdown()
+            agent.log_sink.close()
+            agent.indicator_index.close()
+
+            stats = server.RequestHandlerClass.config.stats
+            ms = np.array(latencies) * 1000
+            print(f"{'📡 streaming' if stream else '📦 whole'}: reply p50 {np.percentile(ms, 50):.0f} ms, "
+                  f"p95 {np.percentile(ms, 95):.0f} ms, "
+                  f"{stats['tokens'] / max(stats['requests'], 1):.1f} words generated per call "
+                  f"({stats['streams_cut']} streams cut)")
+
+
+if __name__ == "__main__":
+    main()
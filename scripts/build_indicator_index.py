@@ -0,0 +1,74 @@
+import argparse
+import glob
+import json
+import time
+
+from agent.indicator_index import INDICATOR_DB, IndicatorIndex
+from agent.indicators import extract_indicators
+from agent.session_manager import DEFAULT_CONVERSATION_ID
+
+# Backfills the indicator index from existing honeypot logs (including
+# rotated segments), then answers lookups against it. Safe to re-run, and
+# to run over turns the live agent already indexed: those are skipped.
+#   python -m scripts.build_indicator_index --logs honeypot_logs.json
+#   python -m scripts.build_indicator_index --lookup upi fraud@ybl
+#   python -m scripts.build_indicator_index --repeats 2
+
+BATCH_SIZE = 5000
+
+
+def iter_turns(paths):
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                indicators = extract_indicators(record.get("scammer_message") or "")
+                if indicators:
+                    # Lines from before per-conversation logging have no conversation_id
+                    yield (indicators, record.get("conversation_id", DEFAULT_CONVERSATION_ID),
+                           record.get("timestamp", ""))
+
+
+def backfill(index, paths):
+    start = time.perf_counter()
+    turns, new, batch = 0, 0, []
+    for turn in iter_turns(paths):
+        batch.append(turn)
+        if len(batch) >= BATCH_SIZE:
+            new += len(index.add_many(batch))
+            turns += len(batch)
+            batch = []
+    if batch:
+        new += len(index.add_many(batch))
+        turns += len(batch)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Indexed {turns} turns from {len(paths)} file(s) in {elapsed:.2f}s, "
+          f"{new} new indicators ({len(index)} total)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build and query the indicator index")
+    parser.add_argument("--db", default=INDICATOR_DB)
+    parser.add_argument("--logs", nargs="*", default=None,
+                        help="JSONL logs to backfill from (default: honeypot_logs.json and its rotations)")
+    parser.add_argument("--lookup", nargs=2, metavar=("TYPE", "VALUE"))
+    parser.add_argument("--repeats", type=int, metavar="MIN_CONVERSATIONS",
+                        help="list indicators seen in at least this many conversations")
+    args = parser.parse_args()
+
+    index = IndicatorIndex(args.db)
+    if args.lookup:
+        print(json.dumps(index.lookup(*args.lookup), indent=2))
+    elif args.repeats:
+        for row in index.repeat_indicators(args.repeats):
+            print(f"{row['type']:<14}{row['value']:<45}{row['conversations']:>6} conversations{row['hits']:>7} hits")
+    else:
+        paths = args.logs or sorted(glob.glob("honeypot_logs.json*"))
+        backfill(index, [p for p in paths if not p.endswith(".lock")])
+    index.close()
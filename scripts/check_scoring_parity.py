@@ -0,0 +1,77 @@
+import json
+import os
+
+import numpy as np
+
+from agent.fraud_agent import FraudDetectionAgent
+
+# Checks the single-pass scorer against the original predict()/predict_proba()
+# path on the shipped models/*.pkl artifacts, and the compact export against
+# the pickles.
+
+BASE_DIR = os.getcwd()
+LOG_FILES = ["honeypot_logs.json", "scam_flow_logs.json"]
+
+messages = [
+    "Congratulations! You won a lottery. Send your UPI ID to claim.",
+    "Hey bro, are we meeting tomorrow?",
+    "Your bank account is blocked. Click this link to verify.",
+    "Please pay the processing fee to release your reward",
+    "",
+]
+for name in LOG_FILES:
+    path = os.path.join(BASE_DIR, name)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            messages += [json.loads(line)["scammer_message"] for line in f if line.strip()]
+
+
+def reference_analyze(agent, message):
+    # Original analyze() logic: predict and predict_proba called separately
+    vector = agent.vectorizer.transform([message])
+    prediction = agent.model.predict(vector)[0]
+    probability = agent.model.predict_proba(vector)[0][1]
+    matches = sum(k in message.lower() for k in agent.high_risk_keywords)
+    if matches > 0:
+        probability = min(probability + 0.1 * matches, 0.95)
+        if matches >= 2:
+            prediction = 1
+    return {
+        "message": message,
+        "is_scam": bool(prediction),
+        "confidence": round(float(probability), 3),
+        "decision": "ENGAGE_SCAMMER" if prediction == 1 else "IGNORE"
+    }
+
+
+agent = FraudDetectionAgent()
+
+mismatches = [
+    (expected, actual)
+    for expected, actual in zip(
+        (reference_analyze(agent, m) for m in messages),
+        agent.analyze_many(messages)
+    )
+    if expected != actual
+]
+for expected, actual in mismatches[:10]:
+    print("Expected:", expected)
+    print("Actual:  ", actual)
+
+# Raw model outputs, including non-default thresholds
+vectors = agent.vectorizer.transform(messages)
+sk_probabilities = agent.model.predict_proba(vectors)[:, 1]
+assert (agent.scorer.score(vectors)[0] == agent.model.predict(vectors)).all()
+assert np.allclose(agent.scorer.score(vectors)[1], sk_probabilities, rtol=0, atol=1e-12)
+for threshold in (0.3, 0.7, 0.9):
+    scorer = FraudDetectionAgent(threshold=threshold).scorer
+    assert (scorer.score(vectors)[0] == (sk_probabilities > threshold)).all()
+
+assert not mismatches, f"{len(mismatches)} of {len(messages)} results differ"
+print(f"✅ Scoring parity OK on {len(messages)} messages")
+
+# Compact export (models/compact) against the pickles
+compact = FraudDetectionAgent(model_format="compact")
+assert np.allclose(compact._decisions(messages), agent._decisions(messages), rtol=0, atol=1e-9)
+assert list(compact.analyze_many(messages)) == list(agent.analyze_many(messages))
+print(f"✅ Compact model parity OK on {len(messages)} messages")
@@ -0,0 +1,24 @@
+import argparse
+import json
+
+from agent.log_compaction import LOG_ARCHIVE_DIR, compact_log
+from agent.log_files import FLOW_LOG_FILE, HONEYPOT_LOG_FILE
+
+# Rolls closed JSONL log segments into date-partitioned Parquet under
+# log_archive/ (see agent/log_compaction.py). Safe to run from cron while
+# the agents are writing. Only rotated segments are compacted unless --cut
+# also closes the live file.
+#   python -m scripts.compact_logs [--keep] [--cut] [--archive-dir DIR]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact JSONL logs into Parquet")
+    parser.add_argument("logs", nargs="*", default=[HONEYPOT_LOG_FILE, FLOW_LOG_FILE])
+    parser.add_argument("--archive-dir", default=LOG_ARCHIVE_DIR)
+    parser.add_argument("--cut", action="store_true",
+                        help="also close the live file, so everything logged so far is compacted")
+    parser.add_argument("--keep", action="store_true", help="keep the JSONL segments after compaction")
+    args = parser.parse_args()
+
+    for log in args.logs:
+        stats = compact_log(log, args.archive_dir, cut=args.cut, keep=args.keep)
+        print(f"🗜️ {json.dumps(stats)}")
@@ -0,0 +1,232 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Local stand-in for Groq's /openai/v1/chat/completions, for load tests.
+# Latency, per-token generation time, error rate, a requests-per-second
+# limit (429 + retry-after) and a concurrency limit (like one GPU serving
+# a few sequences at a time) are configurable. Requests with "stream": true
+# get SSE chunks, one word per event, like the real API. /v1/completions
+# takes a list of prompts and decodes them together, like vLLM or the
+# llama.cpp server.
+#   python -m scripts.fake_groq_server --port 8001 --latency 0.3 --error-rate 0.05
+
+REPLIES = [
+    "Oh no, I am really worried now. Which branch are you calling from?",
+    "I don't understand what is happening. Can I verify this with my bank first?",
+    "This is confusing for me. Do you have an official reference number?",
+    "Please slow down, I am scared. What is your official work number?",
+]
+# Models rarely stop at two sentences; one of these follows every reply
+RAMBLES = [
+    "My husband used to handle all of these things before he passed. I am really not sure what to do now.",
+    "I have been getting so many strange messages this week. My neighbour said I should be careful.",
+    "Let me just get a pen and some paper to write this down. It will take me a minute, I am slow with these things.",
+    "My phone battery is low and I can never find the charger. Please bear with me for a moment.",
+]
+
+
+class FakeGroqConfig:
+    def __init__(self, latency: float = 0.2, jitter: float = 0.05,
+                 error_rate: float = 0.0, rate_limit: float = 0.0, token_latency: float = 0.0,
+                 max_concurrency: int = 0):
+        self.latency = latency  # time to first token
+        self.token_latency = token_latency  # per generated word
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit  # requests per second, 0 = unlimited
+
+        self._lock = threading.Lock()
+        # Requests beyond max_concurrency queue for a slot; 0 = unlimited
+        self.slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "tokens": 0, "streams_cut": 0, "prompts": 0}
+
+    def count(self, stat: str, value: int = 1):
+        with self._lock:
+            self.stats[stat] += value
+
+    def admit(self) -> bool:
+        """Fixed one-second window limiter."""
+        with self._lock:
+            self.stats["requests"] += 1
+            if not self.rate_limit:
+                return True
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            if self._window_count >= self.rate_limit:
+                self.stats["rate_limited"] += 1
+                return False
+            self._window_count += 1
+            return True
+
+
+class FakeGroqServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default of 5 drops connects under load
+
+
+class FakeGroqHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = FakeGroqConfig()
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        config = self.config
+
+        if not config.admit():
+            self._send_json(429, {"error": {"message": "Rate limit reached"}}, {"retry-after": "1"})
+            return
+
+        if config.slots:
+            config.slots.acquire()
+        try:
+            if self.path.endswith("/completions") and "/chat/" not in self.path:
+                self._complete_batch(request)
+            else:
+                self._chat(request)
+        finally:
+            if config.slots:
+                config.slots.release()
+
+    def _reply_words(self, request):
+        words = f"{random.choice(REPLIES)} {random.choice(RAMBLES)}".split(" ")
+        return words[:request.get("max_tokens") or len(words)]
+
+    def _chat(self, request):
+        config = self.config
+        config.count("prompts")
+        time.sleep(max(0.0, random.gauss(config.latency, config.jitter)))
+
+        if random.random() < config.error_rate:
+            config.count("errors")
+            self._send_json(500, {"error": {"message": "Internal server error"}})
+            return
+
+        words = self._reply_words(request)
+        if request.get("stream"):
+            self._stream(request, words)
+            return
+
+        time.sleep(config.token_latency * len(words))
+        config.count("tokens", len(words))
+        content = " ".join(words)
+        self._send_json(200, {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "model": request.get("model", "fake"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(str(request)) // 4, "completion_tokens": len(content) // 4},
+        })
+
+    def _complete_batch(self, request):
+        # Sequences in a batch are decoded together: one prefill latency,
+        # then as many steps as the longest reply
+        config = self.config
+        prompts = request.get("prompt") or []
+        if isinstance(prompts, str):
+            prompts = [prompts]
+        config.count("prompts", len(prompts))
+        time.sleep(max(0.0, random.gauss(config.latency, config.jitter)))
+
+        if random.random() < config.error_rate:
+            config.count("errors")
+            self._send_json(500, {"error": {"message": "Internal server error"}})
+            return
+
+        texts = [self._reply_words(request) for _ in prompts]
+        steps = max((len(words) for words in texts), default=0)
+        time.sleep(config.token_latency * steps)
+        config.count("tokens", sum(len(words) for words in texts))
+        self._send_json(200, {
+            "id": "cmpl-fake",
+            "object": "text_completion",
+            "model": request.get("model", "fake"),
+            "choices": [{"index": i, "text": " " + " ".join(words), "finish_reason": "stop"}
+                        for i, words in enumerate(texts)],
+        })
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _stream(self, request, words):
+        config = self.config
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for i, word in enumerate(words):
+                time.sleep(config.token_latency)
+                event = {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion.chunk",
+                    "model": request.get("model", "fake"),
+                    "choices": [{"index": 0, "delta": {"content": word if i == 0 else f" {word}"},
+                                 "finish_reason": None}],
+                }
+                self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                config.count("tokens")
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client had what it needed and hung up: stop generating
+            config.count("streams_cut")
+            self.close_connection = True
+
+
+def start_fake_groq(port: int = 0, **config) -> FakeGroqServer:
+    """Start the stand-in on a daemon thread; the URL is server.url."""
+    handler = type("ConfiguredFakeGroqHandler", (FakeGroqHandler,), {"config": FakeGroqConfig(**config)})
+    server = FakeGroqServer(("127.0.0.1", port), handler)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    server.url = f"{base}/openai/v1/chat/completions"
+    server.batch_url = f"{base}/v1/completions"
+    threading.Thread(target=server.serve_forever, name="fake-groq", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Groq chat-completions stand-in")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--token-latency", type=float, default=0.0)
+    parser.add_argument("--max-concurrency", type=int, default=0)
+    args = parser.parse_args()
+
+    server = start_fake_groq(
+        args.port, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, rate_limit=args.rate_limit, token_latency=args.token_latency,
+        max_concurrency=args.max_concurrency
+    )
+    print(f"🧪 Fake Groq endpoint: {server.url} (batch: {server.batch_url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,303 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from multiprocessing import Process
+
+import httpx
+import numpy as np
+
+from agent.indicator_index import IndicatorIndex
+from agent.llm_client import GroqClient
+from agent.llm_dispatcher import LLMDispatcher
+from agent.llm_honeypot_agent import HUMANIZE_DELAY, LLMHoneypotAgent
+from agent.local_replies import ReplyPolicy
+from agent.log_sink import JsonlLogSink
+from agent.metrics import metrics
+from agent.reply_cache import ReplyCache
+from agent.scam_flow_controller import ScamFlowController
+from agent.session_manager import SessionManager
+
+# End-to-end load test: mock_scammer.app and a Groq stand-in run in their
+# own processes (so CPU/RSS below belong to the pipeline only), then N
+# concurrent conversations each run ingest -> fraud score -> reply -> log.
+#
+#   python -m scripts.load_test --conversations 50 --turns 10 --latency 0.3 \
+#       --error-rate 0.02 --output load_test.json [--baseline previous.json]
+
+STAGES = ["ingest", "score", "llm", "reply", "log", "total"]
+
+
+# ------------------------ Local Servers ------------------------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve_mock_scammer(port):
+    import logging
+    from werkzeug.serving import make_server
+    from mock_scammer import app
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    make_server("127.0.0.1", port, app, threaded=True).serve_forever()
+
+
+def serve_fake_groq(port, config):
+    from scripts.fake_groq_server import start_fake_groq
+    start_fake_groq(port, **config)
+    while True:
+        time.sleep(3600)
+
+
+def wait_for_port(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not come up")
+
+
+# ------------------------ Instrumented LLM Client ------------------------
+class TimedClient(GroqClient):
+    """GroqClient that records the latency and outcome of every call."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+        self.errors = 0
+
+    async def complete(self, prompt, temperature=0.7):
+        start = time.perf_counter()
+        try:
+            return await super().complete(prompt, temperature)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+    async def stream_complete(self, prompt, temperature=0.7, until=None):
+        start = time.perf_counter()
+        try:
+            return await super().stream_complete(prompt, temperature, until)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+# ------------------------ Load Driver ------------------------
+async def conversation(index, turns, scammer_url, http, controller, timings, counters):
+    conversation_id = f"load-{index}"
+    reply = ""
+    for _ in range(turns):
+        started = time.perf_counter()
+        try:
+            resp = await http.post(scammer_url, json={"reply": reply or ""})
+            resp.raise_for_status()
+            message = resp.json()["message"]
+        except Exception:
+            counters["ingest_errors"] += 1
+            continue
+        t_ingest = time.perf_counter()
+
+        fraud_result = await asyncio.to_thread(controller.fraud_agent.analyze, message)
+        t_score = time.perf_counter()
+
+        reply = None
+        if fraud_result["is_scam"]:
+            reply = await controller.honeypot_agent.areply(message, conversation_id)
+            counters["replies"] += 1
+        t_reply = time.perf_counter()
+
+        controller.log_sink.write(controller.build_result(message, conversation_id, fraud_result, reply))
+        t_log = time.perf_counter()
+
+        timings["ingest"].append(t_ingest - started)
+        timings["score"].append(t_score - t_ingest)
+        if fraud_result["is_scam"]:
+            timings["reply"].append(t_reply - t_score)
+        timings["log"].append(t_log - t_reply)
+        timings["total"].append(t_log - started)
+        counters["messages"] += 1
+
+
+async def drive(args, scammer_url, controller):
+    timings = {stage: [] for stage in STAGES}
+    counters = {"messages": 0, "replies": 0, "ingest_errors": 0}
+    limits = httpx.Limits(max_connections=args.conversations)
+    async with httpx.AsyncClient(timeout=30.0, limits=limits) as http:
+        await asyncio.gather(*(
+            conversation(i, args.turns, scammer_url, http, controller, timings, counters)
+            for i in range(args.conversations)
+        ))
+    await controller.honeypot_agent.llm_client.aclose()
+    return timings, counters
+
+
+def percentiles(samples):
+    if not samples:
+        return None
+    p50, p95, p99 = np.percentile(np.asarray(samples) * 1000, [50, 95, 99])
+    return {"count": len(samples), "p50_ms": round(p50, 2), "p95_ms": round(p95, 2),
+            "p99_ms": round(p99, 2), "max_ms": round(max(samples) * 1000, 2)}
+
+
+def current_rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\n📊 Against {baseline_path} ({baseline.get('commit')}):")
+    for stage in STAGES:
+        old, new = baseline["stages"].get(stage), results["stages"].get(stage)
+        if old and new:
+            change = (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+            print(f"  {stage:<8} p95 {old['p95_ms']:>9.2f} -> {new['p95_ms']:>9.2f} ms ({change:+.1f}%)")
+    old, new = baseline["messages_per_s"], results["messages_per_s"]
+    print(f"  throughput {old:.1f} -> {new:.1f} msgs/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end scam-flow load test")
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake LLM latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--token-latency", type=float, default=0.0, help="fake LLM seconds per generated word")
+    parser.add_argument("--no-stream", action="store_true", help="wait for whole completions instead of streaming")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="fake LLM requests/s, 0 = unlimited")
+    parser.add_argument("--rpm", type=float, default=0, help="dispatcher requests/min limit, 0 = unlimited")
+    parser.add_argument("--tpm", type=float, default=0, help="dispatcher tokens/min limit, 0 = unlimited")
+    parser.add_argument("--hedge-after", type=float, default=0, help="hedge LLM calls slower than this (s)")
+    parser.add_argument("--no-dispatcher", action="store_true", help="call the LLM client directly")
+    parser.add_argument("--llm-ratio", type=float, default=1.0,
+                        help="share of turns the LLM answers, the rest get local replies")
+    parser.add_argument("--no-reply-cache", action="store_true",
+                        help="don't reuse replies for repeated turns; the LLM answers each of its turns")
+    parser.add_argument("--humanize", action="store_true", help="keep the reply humanize delay")
+    parser.add_argument("--verbose", action="store_true", help="keep the agents' per-message prints")
+    parser.add_argument("--output", default=None, help="write results JSON here")
+    parser.add_argument("--baseline", default=None, help="previous results JSON to compare with")
+    args = parser.parse_args()
+
+    scammer_port, groq_port = free_port(), free_port()
+    groq_config = {"latency": args.latency, "jitter": args.jitter, "token_latency": args.token_latency,
+                   "error_rate": args.error_rate, "rate_limit": args.rate_limit}
+    servers = [
+        Process(target=serve_mock_scammer, args=(scammer_port,), daemon=True),
+        Process(target=serve_fake_groq, args=(groq_port, groq_config), daemon=True),
+    ]
+    for server in servers:
+        server.start()
+    wait_for_port(scammer_port)
+    wait_for_port(groq_port)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        controller = ScamFlowController()
+        llm_client = TimedClient("load-test", f"http://127.0.0.1:{groq_port}/openai/v1/chat/completions",
+                                 "fake-model")
+        controller.honeypot_agent = LLMHoneypotAgent(
+            llm_client=llm_client if args.no_dispatcher else LLMDispatcher(
+                llm_client, rpm=args.rpm, tpm=args.tpm, hedge_after=args.hedge_after
+            ),
+            humanize_delay=HUMANIZE_DELAY if args.humanize else None,
+            sessions=SessionManager(max_memory=12),
+            log_sink=JsonlLogSink(os.path.join(tmp, "honeypot.jsonl")),
+            indicator_index=IndicatorIndex(os.path.join(tmp, "indicators.db")),
+            reply_cache=False if args.no_reply_cache else ReplyCache(),
+            reply_policy=ReplyPolicy(llm_ratio=args.llm_ratio),
+            stream=not args.no_stream,
+        )
+        controller.log_sink = JsonlLogSink(os.path.join(tmp, "flow.jsonl"))
+
+        rss_before = current_rss_mb()
+        usage_before = resource.getrusage(resource.RUSAGE_SELF)
+        started = time.perf_counter()
+        with open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+            timings, counters = asyncio.run(drive(args, f"http://127.0.0.1:{scammer_port}/mock_scammer", controller))
+        elapsed = time.perf_counter() - started
+        usage_after = resource.getrusage(resource.RUSAGE_SELF)
+
+        controller.log_sink.close()
+        controller.honeypot_agent.log_sink.close()
+        controller.honeypot_agent.indicator_index.close()
+        reply_cache = controller.honeypot_agent.reply_cache
+        reply_policy = controller.honeypot_agent.reply_policy
+
+    for server in servers:
+        server.terminate()
+
+    timings["llm"] = llm_client.latencies
+    cpu = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "commit": git_commit(),
+        "config": vars(args),
+        "elapsed_s": round(elapsed, 3),
+        "messages": counters["messages"],
+        "replies": counters["replies"],
+        "ingest_errors": counters["ingest_errors"],
+        "llm_errors": llm_client.errors,
+        "messages_per_s": round(counters["messages"] / elapsed, 2),
+        "cpu_s": round(cpu, 3),
+        "cpu_ms_per_message": round(cpu * 1000 / max(counters["messages"], 1), 3),
+        "rss_mb": round(current_rss_mb(), 1),
+        "rss_growth_mb": round(current_rss_mb() - rss_before, 1),
+        "peak_rss_mb": round(usage_after.ru_maxrss / 1024, 1),
+        "reply_cache": reply_cache.stats() if reply_cache else None,
+        "llm_ratio": args.llm_ratio,
+        "llm_share": round(reply_policy.llm_share, 3),
+        "stages": {stage: percentiles(timings[stage]) for stage in STAGES},
+        # In-process stage histograms (agent.metrics), e.g. vectorize / prompt_build
+        "metrics": metrics.snapshot(),
+    }
+
+    print(f"\n🏁 {results['messages']} messages in {results['elapsed_s']}s "
+          f"({results['messages_per_s']} msgs/s), {results['llm_errors']} LLM errors")
+    print(f"   CPU {results['cpu_s']}s ({results['cpu_ms_per_message']} ms/msg), "
+          f"RSS {results['rss_mb']} MB (peak {results['peak_rss_mb']} MB)")
+    print(f"   LLM answered {results['llm_share']:.0%} of turns (ratio {results['llm_ratio']})")
+    if reply_cache:
+        print(f"   reply cache: {results['reply_cache']}")
+    print(f"   {'stage':<8}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, stats in results["stages"].items():
+        if stats:
+            print(f"   {stage:<8}{stats['count']:>7}{stats['p50_ms']:>10.2f}"
+                  f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
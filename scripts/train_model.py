@@ -1,11 +1,19 @@
 import pandas as pd
 import os
+import sys
+import json
 import joblib
+import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer, TfidfTransformer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report
 
+from agent.fraud_agent import (
+    COMPACT_DIR, COMPACT_FORMAT, COMPACT_VERSION,
+    HASHING_DIR, HASHING_FORMAT, HASHING_VERSION
+)
+
 BASE_DIR = os.getcwd()
 
 data_path = os.path.join(
@@ -15,6 +23,88 @@ data_path = os.path.join(
 model_dir = os.path.join(BASE_DIR, "models")
 os.makedirs(model_dir, exist_ok=True)
 
+# --features tfidf (default): 5000-term bigram TfidfVectorizer + pickles
+# --features hashing: stateless HashingVectorizer + IDF array
+features = sys.argv[sys.argv.index("--features") + 1] if "--features" in sys.argv else "tfidf"
+if features not in ("tfidf", "hashing"):
+    raise SystemExit(f"Unknown feature pipeline: {features}")
+
+HASHING_N_FEATURES = 2 ** 18
+
+
+def export_compact_model(vectorizer, model, out_dir):
+    """
+    Write the compact artifact read by agent.fraud_agent.CompactFraudModel:
+    the vocabulary as a sorted string table, IDF weights and coefficients
+    as .npy arrays in the same order, and the tokenizer config as JSON.
+    """
+    if vectorizer.analyzer != "word" or vectorizer.tokenizer or vectorizer.preprocessor:
+        raise ValueError("Compact export only supports the default word analyzer")
+    if vectorizer.norm != "l2" or vectorizer.sublinear_tf or not vectorizer.use_idf:
+        raise ValueError("Compact export only supports l2-normalized, non-sublinear tf-idf")
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    terms = sorted(vectorizer.vocabulary_)
+    columns = np.array([vectorizer.vocabulary_[t] for t in terms])
+
+    np.save(os.path.join(out_dir, "terms.npy"), np.array(terms))
+    np.save(os.path.join(out_dir, "idf.npy"), vectorizer.idf_[columns].astype(np.float64))
+    np.save(os.path.join(out_dir, "coef.npy"), model.coef_.ravel()[columns].astype(np.float64))
+
+    config = {
+        "format": COMPACT_FORMAT,
+        "version": COMPACT_VERSION,
+        "intercept": float(model.intercept_[0]),
+        "classes": [int(c) for c in model.classes_],
+        "lowercase": vectorizer.lowercase,
+        "token_pattern": vectorizer.token_pattern,
+        "ngram_range": list(vectorizer.ngram_range),
+        "stop_words": sorted(vectorizer.get_stop_words() or []),
+    }
+    with open(os.path.join(out_dir, "config.json"), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+
+    print(f"✅ Compact model exported to {out_dir}")
+
+
+def export_hashing_model(hasher, tfidf, model, out_dir):
+    """
+    Write the artifact read by agent.fraud_agent.HashingFraudModel: IDF
+    weights and coefficients per hash bucket as .npy arrays, and the
+    HashingVectorizer settings as JSON.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    np.save(os.path.join(out_dir, "idf.npy"), tfidf.idf_.astype(np.float64))
+    np.save(os.path.join(out_dir, "coef.npy"), model.coef_.ravel().astype(np.float64))
+
+    config = {
+        "format": HASHING_FORMAT,
+        "version": HASHING_VERSION,
+        "intercept": float(model.intercept_[0]),
+        "classes": [int(c) for c in model.classes_],
+        "n_features": hasher.n_features,
+        "lowercase": hasher.lowercase,
+        "token_pattern": hasher.token_pattern,
+        "ngram_range": list(hasher.ngram_range),
+        "stop_words": sorted(hasher.get_stop_words() or []),
+    }
+    with open(os.path.join(out_dir, "config.json"), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+
+    print(f"✅ Hashing model exported to {out_dir}")
+
+
+# Re-export the compact artifact from the existing pickles, without retraining
+if "--export-only" in sys.argv:
+    export_compact_model(
+        joblib.load(os.path.join(model_dir, "vectorizer.pkl")),
+        joblib.load(os.path.join(model_dir, "fraud_model.pkl")),
+        os.path.join(model_dir, COMPACT_DIR)
+    )
+    sys.exit(0)
+
 # Load data
 df = pd.read_csv(data_path)
 
@@ -29,6 +119,29 @@ X_train, X_test, y_train, y_test = train_test_split(
     X, y, test_size=0.2, random_state=42, stratify=y
 )
 
+if features == "hashing":
+    # Stateless hashing + IDF; raw counts so the IDF can be applied at inference
+    hasher = HashingVectorizer(
+        n_features=HASHING_N_FEATURES,
+        ngram_range=(1, 2),
+        stop_words="english",
+        alternate_sign=False,
+        norm=None
+    )
+    tfidf = TfidfTransformer()
+    X_train_vec = tfidf.fit_transform(hasher.transform(X_train))
+    X_test_vec = tfidf.transform(hasher.transform(X_test))
+
+    model = LogisticRegression(max_iter=1000)
+    model.fit(X_train_vec, y_train)
+
+    y_pred = model.predict(X_test_vec)
+    print("\nClassification Report (hashing):\n")
+    print(classification_report(y_test, y_pred))
+
+    export_hashing_model(hasher, tfidf, model, os.path.join(model_dir, HASHING_DIR))
+    sys.exit(0)
+
 # Vectorizer
 vectorizer = TfidfVectorizer(
     max_features=5000,
@@ -53,3 +166,5 @@ joblib.dump(model, os.path.join(model_dir, "fraud_model.pkl"))
 joblib.dump(vectorizer, os.path.join(model_dir, "vectorizer.pkl"))
 
 print("✅ Model & vectorizer saved in /models")
+
+export_compact_model(vectorizer, model, os.path.join(model_dir, COMPACT_DIR))
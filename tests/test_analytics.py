@@ -0,0 +1,35 @@
+import json
+
+from agent.analytics import UNCATEGORIZED, AnalyticsStore
+
+SCAM = {"is_scam": True, "confidence": 0.9}
+SAFE = {"is_scam": False, "confidence": 0.1}
+
+
+def test_live_and_loaded_entries_share_categories(tmp_path):
+    log = tmp_path / "scam_flow_logs.json"
+    with open(log, "w", encoding="utf-8") as f:
+        for message, fraud_result in [
+            ("Your bank account is blocked, verify now", SCAM),
+            ("You won a lottery prize, claim it today", SCAM),
+            ("Are we still meeting for lunch?", SAFE),
+        ]:
+            f.write(json.dumps({"scammer_message": message, "fraud_result": fraud_result,
+                                "timestamp": "2026-02-05T15:00:00"}) + "\n")
+
+    store = AnalyticsStore()
+    # Live dashboard entries: generator labels, and the manual tab's unlabelled messages
+    store.add("Suspicious activity on your bank account", SCAM, category="bank")
+    store.add("Payment failed! Update your UPI details", SCAM, category="payment")
+    store.add("Congratulations! You won $5000!", SCAM, category="prize")
+    store.add("Guaranteed crypto profit, join now", SCAM, category=None)
+    store.add("See you tomorrow", SAFE, category="bank")
+    assert store.load_jsonl(str(log)) == 3
+
+    assert store.by_category == {
+        "bank_scam": 3,
+        "prize_scam": 2,
+        "investment_scam": 1,
+        UNCATEGORIZED: 2,
+    }
+    assert sum(store.by_category.values()) == store.total
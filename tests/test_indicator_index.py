@@ -0,0 +1,44 @@
+from agent.indicator_index import IndicatorIndex
+from agent.indicators import extract_indicators
+
+TURNS = [
+    (extract_indicators("Pay to fraud@ybl or call +91 98765 43210"), "conv-1", "2024-01-01T10:00:00"),
+    (extract_indicators("Send it to fraud@ybl now"), "conv-2", "2024-01-01T11:00:00"),
+]
+
+
+def test_reindexing_the_same_turns_changes_nothing(tmp_path):
+    index = IndicatorIndex(str(tmp_path / "indicators.db"))
+    try:
+        assert len(index.add_many(TURNS)) == 2
+        first = index.lookup("upi", "fraud@ybl")
+
+        # A backfill re-run, or one over turns the live agent already indexed
+        assert index.add_many(TURNS) == []
+        index.add(*TURNS[0])
+
+        again = index.lookup("upi", "fraud@ybl")
+        assert again == first
+        assert again["hits"] == 2
+        assert again["conversations"] == 2
+    finally:
+        index.close()
+
+
+def test_older_database_is_deduplicated(tmp_path):
+    path = str(tmp_path / "indicators.db")
+    index = IndicatorIndex(path)
+    index.add_many(TURNS)
+    # What a re-run used to leave behind: every sighting twice, hits doubled
+    with index._conn:
+        index._conn.execute("DROP INDEX sightings_unique")
+        index._conn.execute("INSERT INTO sightings SELECT * FROM sightings")
+        index._conn.execute("UPDATE indicators SET hits = hits * 2")
+    index.close()
+
+    index = IndicatorIndex(path)
+    try:
+        assert index.lookup("upi", "fraud@ybl")["hits"] == 2
+        assert len(index.lookup("upi", "fraud@ybl")["sightings"]) == 2
+    finally:
+        index.close()
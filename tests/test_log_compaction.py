@@ -0,0 +1,47 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from agent.log_compaction import PYARROW_AVAILABLE, claim_segments, compact_log
+from agent.log_files import FLOW_LOG_FILE
+
+
+def write_log(path, n, day="2026-02-05"):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(json.dumps({"timestamp": f"{day}T10:00:{i:02d}", "scammer_message": f"m{i}",
+                                "fraud_result": {"is_scam": True, "confidence": 0.9}}) + "\n")
+
+
+def test_import_stays_light():
+    # Only the log filenames are needed, not the agents that write them
+    code = ("import sys, agent.log_compaction; "
+            "print(any(m in sys.modules for m in ('agent.llm_honeypot_agent', 'agent.scam_flow_controller')))")
+    assert subprocess.check_output([sys.executable, "-c", code], text=True).strip() == "False"
+
+
+def test_live_file_is_left_alone_unless_cut(tmp_path):
+    log = tmp_path / FLOW_LOG_FILE
+    write_log(log, 3)
+    write_log(f"{log}.1", 2)
+
+    segments = claim_segments(str(log))
+    assert len(segments) == 1
+    assert log.exists() and len(log.read_text().splitlines()) == 3
+
+    segments = claim_segments(str(log), cut=True)
+    assert len(segments) == 2
+    assert not log.exists()
+
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="needs pyarrow")
+def test_keep_compacts_rotated_segments_only(tmp_path):
+    log = tmp_path / FLOW_LOG_FILE
+    write_log(log, 3)
+    write_log(f"{log}.1", 2)
+
+    stats = compact_log(str(log), str(tmp_path / "archive"), keep=True)
+    assert stats["rows"] == 2
+    assert len(log.read_text().splitlines()) == 3
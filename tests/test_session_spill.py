@@ -0,0 +1,50 @@
+import asyncio
+import os
+
+import agent.llm_honeypot_agent as honeypot
+from agent.indicator_index import IndicatorIndex
+from agent.local_replies import ReplyPolicy
+from agent.log_sink import JsonlLogSink
+
+
+class NoLLM:
+    async def complete(self, prompt, temperature=0.7):
+        raise AssertionError("local replies only")
+
+
+def test_default_agent_restores_evicted_conversation(tmp_path, monkeypatch):
+    spill_dir = tmp_path / "sessions"
+    monkeypatch.setattr(honeypot, "SESSION_SPILL_DIR", str(spill_dir))
+    agent = honeypot.LLMHoneypotAgent(
+        llm_client=NoLLM(),
+        humanize_delay=None,
+        log_sink=JsonlLogSink(str(tmp_path / "honeypot.jsonl")),
+        indicator_index=IndicatorIndex(str(tmp_path / "indicators.db")),
+        reply_cache=False,
+        reply_policy=ReplyPolicy(llm_ratio=0),
+    )
+    assert agent.sessions.spill_dir == str(spill_dir)
+
+    async def talk():
+        await agent.areply("Your bank account is blocked, share the OTP now", "scammer-a")
+        await agent.areply("Send the OTP immediately or the account is closed", "scammer-a")
+        before = agent.sessions.get("scammer-a").to_dict()
+
+        agent.sessions.max_sessions = 1
+        await agent.areply("Congratulations, you won a lottery prize", "scammer-b")
+        assert "scammer-a" not in agent.sessions
+        assert os.listdir(spill_dir)
+
+        await agent.areply("Why are you not answering? Send the code", "scammer-a")
+        return before, agent.sessions.get("scammer-a")
+
+    try:
+        before, restored = asyncio.run(talk())
+    finally:
+        agent.log_sink.close()
+        agent.indicator_index.close()
+
+    assert restored.persona_name == before["persona_name"]
+    assert restored.dynamic_memory["otp_requests"] >= before["dynamic_memory"]["otp_requests"]
+    assert [list(item) for item in restored.memory.history][:4] == before["memory"]["history"]
+    assert len(restored.memory.history) == 6
@@ -0,0 +1,61 @@
+import asyncio
+
+import requests
+
+from agent.scam_flow_controller import ScamFlowController
+from agent.scam_pipeline import ScamFlowPipeline
+
+
+def flaky_controller(fail_after):
+    """A controller whose stream breaks after fail_after messages, on the first connection only."""
+    controller = ScamFlowController.__new__(ScamFlowController)
+    controller.connections = []
+
+    def stream_messages(count, seed=None, conversations=1):
+        controller.connections.append((count, seed))
+        first = len(controller.connections) == 1
+        start = 0 if seed is not None else 100 * (len(controller.connections) - 1)
+        for i in range(count):
+            if first and i == fail_after:
+                raise requests.exceptions.ChunkedEncodingError("connection broken")
+            yield f"mock-{i % conversations}", f"message {start + i}"
+
+    controller.stream_messages = stream_messages
+    return controller
+
+
+def drain(ingest):
+    pipeline = ScamFlowPipeline(None, ingest, backoff_initial=0, verbose=False)
+    queue = asyncio.Queue()
+    asyncio.run(pipeline._ingest_worker(queue))
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items, pipeline.stats
+
+
+def test_seeded_stream_resumes_where_it_broke():
+    controller = flaky_controller(fail_after=3)
+    items, stats = drain(controller.stream_ingest(10, seed=7))
+
+    assert [message for _, message in items] == [f"message {i}" for i in range(10)]
+    assert stats["ingest_errors"] == 1
+    assert controller.connections == [(10, 7), (10, 7)]
+
+
+def test_unseeded_stream_asks_for_the_rest():
+    controller = flaky_controller(fail_after=3)
+    items, stats = drain(controller.stream_ingest(10))
+
+    assert len(items) == 10
+    assert stats["ingest_errors"] == 1
+    assert controller.connections == [(10, None), (7, None)]
+
+
+def test_stream_ending_early_exhausts_the_source():
+    controller = ScamFlowController.__new__(ScamFlowController)
+    controller.stream_messages = lambda count, seed=None, conversations=1: iter([("mock-0", "only one")])
+    items, stats = drain(controller.stream_ingest(5))
+
+    assert items == [("mock-0", "only one")]
+    assert stats["ingest_errors"] == 0